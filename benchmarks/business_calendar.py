@@ -0,0 +1,60 @@
+"""DATA LIMITE (7 dias úteis): ``CustomBusinessDay`` (antigo) x ``add_business_days``.
+
+Uso: ``python -m benchmarks.business_calendar [linhas]``
+
+O código antigo aplica o deslocamento elemento a elemento; ele roda só sobre as
+primeiras ``LEGACY_ROWS`` linhas e a vazão é comparada por linha.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import legacy_calendar
+from services.business_calendar import add_business_days, business_calendar
+
+LEGACY_ROWS = 20_000
+
+
+def synthetic_dates(rows: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    dates = pd.Series(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"))
+    return dates.where(rng.random(rows) > 0.02)
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int = 1_000_000) -> None:
+    dates = synthetic_dates(rows)
+    legacy = dates.head(LEGACY_ROWS)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        old = _best(lambda: legacy_calendar.data_limite(legacy), repeat=1)
+    business_calendar.cache_clear()
+    start = time.perf_counter()
+    add_business_days(dates, 7)
+    first = time.perf_counter() - start
+    new = _best(lambda: add_business_days(dates, 7))
+    print("DATA LIMITE, 7 dias úteis")
+    timings = (
+        ("CustomBusinessDay (antigo)", len(legacy), old),
+        ("add_business_days (1a chamada)", rows, first),
+        ("add_business_days (calendário)", rows, new),
+    )
+    for name, n, seconds in timings:
+        print(f"  {name:<30} {n:>9} linhas {seconds * 1000:9.1f} ms  {n / seconds:14,.0f} linhas/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,51 @@
+"""Memória da prévia com texto repetido como object (antigo) x ``category``.
+
+Uso: ``python -m benchmarks.category_memory [linhas]``
+
+Mede ``memory_usage(deep=True)`` dos frames sintéticos dos fluxos 167 e 171,
+antes e depois de ``compact_text_columns`` com as colunas de cada fluxo, e o
+tempo da conversão.
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.order_readers import synthetic_171
+from benchmarks.pending_normalize import synthetic_167
+from services.frame_io import compact_text_columns
+from services.senha167_service import AdicionarOrdensNovas2
+from services.senha171_service import AdicionarOrdensNovas
+
+
+def _as_object_text(df: pd.DataFrame, columns) -> pd.DataFrame:
+    # Como a leitura entrega: as colunas de texto do contrato chegam como str, também "Nro Ordem" e "Carga".
+    return df.assign(**{col: df[col].astype(str) for col in columns if col in df.columns})
+
+
+def main(rows: int = 100_000) -> None:
+    flows = {
+        "Senha 167": (synthetic_167(rows), AdicionarOrdensNovas2.CATEGORY_COLUMNS),
+        "Senha 171": (
+            _as_object_text(synthetic_171(rows), AdicionarOrdensNovas("").contract.text_columns),
+            AdicionarOrdensNovas.CATEGORY_COLUMNS,
+        ),
+    }
+    print(f"{rows} linhas, memory_usage(deep=True)")
+    for name, (df, columns) in flows.items():
+        before = df.memory_usage(deep=True).sum()
+        start = time.perf_counter()
+        compact = compact_text_columns(df.copy(), columns)
+        seconds = time.perf_counter() - start
+        after = compact.memory_usage(deep=True).sum()
+        converted = compact.select_dtypes("category").columns.tolist()
+        print(
+            f"  {name}: {before / 1e6:7.1f} MB -> {after / 1e6:7.1f} MB  "
+            f"({after / before:.0%}, conversão {seconds * 1000:.0f} ms)  category: {', '.join(converted)}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,41 @@
+"""Prazo em dias úteis com ``CustomBusinessDay``, como era antes de ``add_business_days``.
+
+Cópia fiel do trecho removido de ``AdicionarOrdensNovas2.calcular_prazos``; serve
+só de referência para os testes de equivalência e para o benchmark.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Tuple
+
+import pandas as pd
+from pandas.tseries.offsets import CustomBusinessDay
+
+FERIADOS_FIXOS_MD: Tuple[Tuple[int, int], ...] = (
+    (1, 1),
+    (4, 15),
+    (4, 21),
+    (5, 1),
+    (9, 7),
+    (10, 12),
+    (11, 2),
+    (11, 15),
+    (12, 25),
+    (12, 31),
+)
+
+
+def data_limite(dt2: pd.Series, n: int = 7) -> pd.Series:
+    """O código antigo: só feriados fixos, do menor ano das datas ao maior + 1."""
+    if dt2.notna().any():
+        min_y = int(dt2.dt.year.min())
+        max_y = int(dt2.dt.year.max()) + 1
+        holidays = [pd.Timestamp(y, m, d) for y in range(min_y, max_y + 1) for (m, d) in FERIADOS_FIXOS_MD]
+    else:
+        holidays = []
+    cbd = CustomBusinessDay(holidays=holidays)
+    return dt2 + n * cbd
+
+
+def with_holidays(dt2: pd.Series, n: int, holidays: Iterable) -> pd.Series:
+    """Mesma soma do código antigo, com a lista de feriados dada (ex.: fixos + móveis)."""
+    return dt2 + n * CustomBusinessDay(holidays=list(holidays))
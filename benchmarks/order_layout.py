@@ -0,0 +1,106 @@
+"""Layout das tabelas de ordens: rowid + índice da chave (antes) x WITHOUT ROWID (agora).
+
+Uso: ``python -m benchmarks.order_layout [ordens]``
+
+Para cada layout, cria orders_171 e order_171_pending num SQLite temporário com o
+DDL dos modelos e mede: inserção em lote das ordens, buscas pontuais pela chave
+e o join do staging (metade das chaves já aprovadas) contra a tabela de ordens.
+Roda com chaves em ordem e embaralhadas (o caso de planilhas por filial).
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateTable
+
+from db.order_models import Order171, Order171Pending
+
+LOOKUPS = 20_000
+
+
+def _ddl(table, without_rowid: bool) -> str:
+    ddl = str(CreateTable(table).compile(dialect=sqlite.dialect())).strip()
+    return ddl if without_rowid else ddl.replace("WITHOUT ROWID", "").rstrip()
+
+
+def _rows(keys: np.ndarray, rng: np.random.Generator) -> list:
+    n = len(keys)
+    status = rng.choice(["FINALIZADO", "PENDENTE"], n)
+    cliente = np.char.add("CLIENTE ", rng.integers(1, 3000, n).astype(str))
+    valor = rng.uniform(0, 1000, n).round(2).astype(str)
+    return [
+        (key, status[i], cliente[i], valor[i], "2025-03-26 00:00:00", f"v2:{i:016x}", "2025-03-26 00:00:00")
+        for i, key in enumerate(keys.tolist())
+    ]
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: list, request_id: int | None = None) -> None:
+    cols = '"Nro Ordem", "Status", "Cliente", "Valor", "Data Ordem", "Hash Linha", created_at'
+    marks = "?, ?, ?, ?, ?, ?, ?"
+    if request_id is not None:
+        cols, marks = cols + ", request_id", marks + ", ?"
+        rows = [row + (request_id,) for row in rows]
+    with conn:
+        conn.executemany(f'INSERT OR IGNORE INTO "{table}" ({cols}) VALUES ({marks})', rows)
+
+
+def _measure(orders: int, without_rowid: bool, shuffled: bool) -> dict:
+    rng = np.random.default_rng(0)
+    keys = np.arange(10_000_000, 10_000_000 + orders).astype(str)
+    if shuffled:
+        rng.shuffle(keys)
+    order_rows = _rows(keys, rng)
+    # Staging: metade já aprovada, metade nova.
+    staged = np.concatenate([keys[: orders // 4], np.arange(90_000_000, 90_000_000 + orders // 4).astype(str)])
+    staging_rows = _rows(staged, rng)
+    lookups = rng.choice(keys, min(LOOKUPS, orders)).tolist()
+    orders_table, pending_table = Order171.__tablename__, Order171Pending.__tablename__
+
+    with tempfile.TemporaryDirectory(prefix="bench-layout-") as folder:
+        path = os.path.join(folder, "ordens.db")
+        conn = sqlite3.connect(path)
+        conn.execute(_ddl(Order171.__table__, without_rowid))
+        conn.execute(_ddl(Order171Pending.__table__, without_rowid))
+
+        start = time.perf_counter()
+        _insert(conn, orders_table, order_rows)
+        insert_s = time.perf_counter() - start
+        _insert(conn, pending_table, staging_rows, request_id=1)
+
+        start = time.perf_counter()
+        query = f'SELECT * FROM "{orders_table}" WHERE "Nro Ordem" = ?'
+        for key in lookups:
+            conn.execute(query, (key,)).fetchone()
+        lookup_us = (time.perf_counter() - start) / len(lookups) * 1e6
+
+        start = time.perf_counter()
+        new = conn.execute(
+            f'SELECT count(*) FROM "{pending_table}" AS p WHERE p.request_id = 1 AND NOT EXISTS '
+            f'(SELECT 1 FROM "{orders_table}" AS o WHERE o."Nro Ordem" = p."Nro Ordem")'
+        ).fetchone()[0]
+        join_ms = (time.perf_counter() - start) * 1000
+        conn.close()
+        size = os.path.getsize(path) / 1e6
+    return {"insert_s": insert_s, "lookup_us": lookup_us, "join_ms": join_ms, "new": new, "size": size}
+
+
+def main(orders: int = 200_000) -> None:
+    print(f"{orders} ordens, {LOOKUPS} buscas pontuais, staging de {orders // 2} linhas")
+    for shuffled in (False, True):
+        print("chaves embaralhadas" if shuffled else "chaves em ordem")
+        for label, without_rowid in (("rowid", False), ("WITHOUT ROWID", True)):
+            r = _measure(orders, without_rowid, shuffled)
+            print(
+                f"  {label:<14} inserção {r['insert_s']:6.2f} s  busca {r['lookup_us']:6.1f} us  "
+                f"join staging {r['join_ms']:7.1f} ms ({r['new']} novas)  arquivo {r['size']:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
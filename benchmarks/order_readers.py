@@ -0,0 +1,98 @@
+"""Leitura por formato (XLSX, CSV, Parquet, ODS): tempo, vazão e pico de memória Python.
+
+Uso: ``python -m benchmarks.order_readers [linhas]``
+
+Os arquivos são gerados numa pasta temporária a partir do mesmo DataFrame
+sintético do fluxo 171. O ODS usa um décimo das linhas (o odfpy é lento para gravar).
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from services.order_readers import CHUNK_SIZE, iter_chunks
+from services.senha171_service import AdicionarOrdensNovas
+
+
+def synthetic_171(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    return pd.DataFrame(
+        {
+            "Nro Ordem": rng.integers(10_000_000, 99_999_999, rows),
+            "Status": rng.choice(["FINALIZADO", "PENDENTE"], rows),
+            "Tratativa": rng.choice(["CANCELADO", "FINALIZADO", "REENVIO"], rows),
+            "Nome": rng.choice(["Ana", "Bruno", "Carla", "Diego"], rows),
+            "Data Tratativa": (dates + pd.Timedelta(days=20)).strftime("%d/%m/%Y"),
+            "Cliente": np.char.add("CLIENTE ", rng.integers(1, 3000, rows).astype(str)),
+            "Cód. Cli": rng.integers(1_000_000, 9_999_999, rows),
+            "Tipo Devol.": rng.choice(["Devolução CORTE", "Bonificação CORTE", "Outros"], rows),
+            "Carga": rng.integers(100_000, 999_999, rows),
+            "Valor": rng.uniform(0, 1000, rows).round(2),
+            "Data Ordem": dates,
+            # Coluna fora do contrato: não deveria custar memória na leitura.
+            "Observação": np.char.add("texto livre ", rng.integers(0, 10**6, rows).astype(str)),
+        }
+    )
+
+
+def _write(df: pd.DataFrame, folder: Path) -> dict:
+    paths = {
+        "xlsx": folder / "ordens.xlsx",
+        "csv": folder / "ordens.csv",
+        "parquet": folder / "ordens.parquet",
+    }
+    df.to_excel(paths["xlsx"], index=False)
+    df.to_csv(paths["csv"], index=False, sep=";")
+    df.to_parquet(paths["parquet"], index=False)
+    try:
+        paths["ods"] = folder / "ordens.ods"
+        df.head(max(1, len(df.index) // 10)).to_excel(paths["ods"], index=False, engine="odf")
+    except ImportError:
+        print("odfpy ausente: ODS fora da medição")
+        del paths["ods"]
+    return paths
+
+
+def _read(path: Path, contract) -> tuple:
+    rows = chunks = 0
+    for chunk in iter_chunks(str(path), CHUNK_SIZE, contract):
+        rows += len(chunk.index)
+        chunks += 1
+    return rows, chunks
+
+
+def _measure(path: Path, contract) -> tuple:
+    # Tempo e memória em passadas separadas: o tracemalloc deixa o openpyxl várias vezes mais lento.
+    start = time.perf_counter()
+    rows, chunks = _read(path, contract)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    _read(path, contract)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, chunks, seconds, peak
+
+
+def main(rows: int = 50_000) -> None:
+    contract = AdicionarOrdensNovas("").contract
+    with tempfile.TemporaryDirectory(prefix="bench-leitura-") as folder:
+        paths = _write(synthetic_171(rows), Path(folder))
+        print(f"blocos de {CHUNK_SIZE} linhas")
+        for name, path in paths.items():
+            n, chunks, seconds, peak = _measure(path, contract)
+            size = path.stat().st_size / 1e6
+            print(
+                f"  {name:<8} {n:>7} linhas  {chunks:>3} blocos  {seconds:7.2f} s  "
+                f"{n / seconds:10,.0f} linhas/s  pico {peak / 1e6:6.1f} MB  arquivo {size:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
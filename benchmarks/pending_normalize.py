@@ -0,0 +1,65 @@
+"""Vazão da normalização do staging pendente: linha a linha (antiga) x por coluna.
+
+Uso: ``python -m benchmarks.pending_normalize [linhas]``
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from repositories import order_pending_repository
+from benchmarks import legacy_pending
+
+
+def synthetic_167(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Frame com os tipos que o fluxo 167 entrega: textos, floats com NaN, datas com NaT."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    valor = rng.uniform(0, 500, rows).round(2)
+    valor[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "Nro Ordem": rng.integers(10_000_000, 99_999_999, rows).astype(str),
+            "STATUS": rng.choice(["ABERTO", "FINALIZADO", None], rows),
+            "TRATATIVA": rng.choice(["CANCELADO", "FINALIZADO", ""], rows),
+            "Filial Contábil": rng.integers(100, 999, rows).astype(str),
+            "Tipo Devol.": rng.choice(["Devolução CORTE", "Bonificação CORTE"], rows),
+            "Valor": valor,
+            "Falta": rng.choice(["1", "2,5", ""], rows),
+            "MÊS": dates.month.astype("float64"),
+            "Semana": dates.isocalendar().week.to_numpy(dtype="int64"),
+            "Data Ordem": dates.where(rng.random(rows) > 0.02),
+            "DATA LIMITE": dates + pd.Timedelta(days=10),
+            "ANO": dates.year.astype("float64"),
+            "STT": rng.choice(["COM EVIDENCIA", "SEM EVIDENCIA"], rows),
+            "Dias a Vencer": rng.integers(-30, 30, rows),
+        }
+    )
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int = 50_000) -> None:
+    df = synthetic_167(rows)
+    timings = {
+        "linha a linha (antiga)": _best(lambda: legacy_pending.normalize_frame("Senha 167", 1, df)),
+        "normalize_frame": _best(lambda: order_pending_repository.normalize_frame("Senha 167", 1, df)),
+        "normalize_columns": _best(lambda: order_pending_repository.normalize_columns("Senha 167", 1, df)),
+    }
+    print(f"{rows} linhas (Senha 167)")
+    for name, seconds in timings.items():
+        print(f"  {name:<24} {seconds * 1000:8.1f} ms  {rows / seconds:12,.0f} linhas/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,67 @@
+"""Planilha larga: ``pd.read_excel`` inteiro (antigo) x leitura projetada pelo ``ColumnContract``.
+
+Uso: ``python -m benchmarks.projected_reads [linhas] [colunas extras]``
+
+Gera um XLSX com as colunas do fluxo 171 mais ``extras`` colunas que nenhum
+fluxo lê. Mede tempo e pico de memória Python da leitura inteira, do streaming
+sem contrato e do streaming projetado, e o tamanho em memória do resultado.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.order_readers import synthetic_171
+from services.order_readers import CHUNK_SIZE, iter_chunks
+from services.senha171_service import AdicionarOrdensNovas
+
+
+def wide_171(rows: int, extras: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = synthetic_171(rows, seed)
+    for i in range(extras):
+        df[f"Extra {i}"] = rng.integers(0, 10**6, rows) if i % 2 else rng.choice(["A", "B", "C"], rows)
+    return df
+
+
+def _measure(read) -> tuple:
+    # Tempo e memória em passadas separadas: o tracemalloc deixa o openpyxl várias vezes mais lento.
+    start = time.perf_counter()
+    df = read()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, df.memory_usage(deep=True).sum(), df.shape[1]
+
+
+def main(rows: int = 20_000, extras: int = 52) -> None:
+    contract = AdicionarOrdensNovas("").contract
+    with tempfile.TemporaryDirectory(prefix="bench-projecao-") as folder:
+        path = str(Path(folder) / "larga.xlsx")
+        df = wide_171(rows, extras)
+        df.to_excel(path, index=False)
+        used = len(contract.select(list(df.columns)))
+        reads = {
+            "read_excel (antigo)": lambda: pd.read_excel(path),
+            "streaming, sem contrato": lambda: pd.concat(iter_chunks(path, CHUNK_SIZE)),
+            "streaming, com contrato": lambda: pd.concat(iter_chunks(path, CHUNK_SIZE, contract)),
+        }
+        print(f"{rows} linhas x {df.shape[1]} colunas (o fluxo 171 lê {used})")
+        for name, read in reads.items():
+            seconds, peak, size, width = _measure(read)
+            print(
+                f"  {name:<24} {seconds:7.2f} s  pico {peak / 1e6:7.1f} MB  "
+                f"resultado {size / 1e6:6.1f} MB ({width} colunas)"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -6,6 +6,9 @@ from typing import Generator
 
 from sqlmodel import SQLModel, create_engine, Session
 
+from .models import PasswordRequest, PopRequest, RegistrationRequest, User
+from .schema import ensure_schema
+
 def _base_dir() -> Path:
     if getattr(sys, "frozen", False):
         return Path(sys.executable).resolve().parent
@@ -15,6 +18,7 @@ def _base_dir() -> Path:
 BASE_DIR = _base_dir()
 DB_PATH = BASE_DIR / "data" / "app.db"
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+SCHEMA_VERSION = 1
 
 engine = create_engine(
     DATABASE_URL,
@@ -28,6 +32,12 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
+def _migrate() -> None:
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[User.__table__, PasswordRequest.__table__, RegistrationRequest.__table__, PopRequest.__table__],
+    )
+
+
 def init_db() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SQLModel.metadata.create_all(engine)
+    ensure_schema(engine, DB_PATH, SCHEMA_VERSION, _migrate)
@@ -8,11 +8,17 @@ from sqlmodel import SQLModel, create_engine
 
 from .order_models import (
     OrderRequest,
+    OrderRequestBlob,
+    OrderImportFingerprint,
+    OrderRequestKey,
+    OrderRegionMapping,
     Order167Pending,
     Order171Pending,
     Order167,
     Order171,
 )
+from .order_migrations import ORDER_TABLES, PENDING_TABLES, migrate_tables
+from .schema import ensure_schema
 
 def _base_dir() -> Path:
     if getattr(sys, "frozen", False):
@@ -23,6 +29,8 @@ def _base_dir() -> Path:
 BASE_DIR = _base_dir()
 ORDER_REQUEST_DB_PATH = BASE_DIR / "data" / "order_requests.db"
 ORDER_DATA_DB_PATH = BASE_DIR / "data" / "orders.db"
+ORDER_REQUEST_SCHEMA_VERSION = 3
+ORDER_DATA_SCHEMA_VERSION = 3
 
 order_request_engine = create_engine(
     f"sqlite:///{ORDER_REQUEST_DB_PATH}", echo=False, connect_args={"check_same_thread": False}
@@ -37,11 +45,29 @@ def _create_tables(engine, tables: Iterable) -> None:
     SQLModel.metadata.create_all(engine, tables=list(tables))
 
 
+def _migrate_order_request_db() -> None:
+    _create_tables(
+        order_request_engine,
+        [
+            OrderRequest.__table__,
+            OrderRequestBlob.__table__,
+            OrderImportFingerprint.__table__,
+            OrderRequestKey.__table__,
+            Order167Pending.__table__,
+            Order171Pending.__table__,
+        ],
+    )
+    migrate_tables(order_request_engine, PENDING_TABLES)
+
+
+def _migrate_order_data_db() -> None:
+    _create_tables(order_data_engine, [Order167.__table__, Order171.__table__, OrderRegionMapping.__table__])
+    migrate_tables(order_data_engine, ORDER_TABLES)
+
+
 def init_order_request_db() -> None:
-    ORDER_REQUEST_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    _create_tables(order_request_engine, [OrderRequest.__table__, Order167Pending.__table__, Order171Pending.__table__])
+    ensure_schema(order_request_engine, ORDER_REQUEST_DB_PATH, ORDER_REQUEST_SCHEMA_VERSION, _migrate_order_request_db)
 
 
 def init_order_data_db() -> None:
-    ORDER_DATA_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    _create_tables(order_data_engine, [Order167.__table__, Order171.__table__])
+    ensure_schema(order_data_engine, ORDER_DATA_DB_PATH, ORDER_DATA_SCHEMA_VERSION, _migrate_order_data_db)
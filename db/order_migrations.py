@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.engine import Connection, Engine
+
+from .order_models import Order167, Order167Pending, Order171, Order171Pending
+
+PENDING_TABLES = (Order167Pending.__table__, Order171Pending.__table__)
+ORDER_TABLES = (Order167.__table__, Order171.__table__)
+
+
+def _rebuild_table(conn: Connection, table: Table) -> int:
+    """Recria ``table`` com o layout atual do modelo, copiando as linhas existentes.
+
+    Linhas com a chave nula não cabem na tabela nova (WITHOUT ROWID exige chave);
+    elas vão para ``<tabela>_sem_chave`` em vez de impedir a abertura do app.
+    Devolve quantas linhas foram separadas.
+    """
+    name = table.name
+    old_name = f"{name}_old"
+    for index in inspect(conn).get_indexes(name):
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index["name"]}"')
+    conn.exec_driver_sql(f'ALTER TABLE "{name}" RENAME TO "{old_name}"')
+    table.create(conn)
+    cols = ", ".join(f'"{col.name}"' for col in table.columns)
+    null_key = " OR ".join(f'"{col.name}" IS NULL' for col in table.primary_key.columns)
+    orphans = conn.exec_driver_sql(f'SELECT COUNT(*) FROM "{old_name}" WHERE {null_key}').scalar() or 0
+    if orphans:
+        conn.exec_driver_sql(f'CREATE TABLE IF NOT EXISTS "{name}_sem_chave" AS SELECT * FROM "{old_name}" WHERE 0')
+        conn.exec_driver_sql(f'INSERT INTO "{name}_sem_chave" SELECT * FROM "{old_name}" WHERE {null_key}')
+    conn.exec_driver_sql(
+        f'INSERT OR REPLACE INTO "{name}" ({cols}) SELECT {cols} FROM "{old_name}" WHERE NOT ({null_key})'
+    )
+    conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+    return int(orphans)
+
+
+def _add_missing_columns(conn: Connection, table: Table) -> List[str]:
+    """Acrescenta com ALTER TABLE as colunas novas do modelo (sempre anuláveis, sem default)."""
+    insp = inspect(conn)
+    if not insp.has_table(table.name):
+        return []
+    existing = {col["name"] for col in insp.get_columns(table.name)}
+    added = []
+    for col in table.columns:
+        if col.name in existing:
+            continue
+        col_type = col.type.compile(dialect=conn.dialect)
+        conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {col_type}')
+        added.append(col.name)
+    return added
+
+
+def _needs_rebuild(conn: Connection, table: Table) -> bool:
+    insp = inspect(conn)
+    if not insp.has_table(table.name):
+        return False
+    pk_cols = insp.get_pk_constraint(table.name).get("constrained_columns") or []
+    if sorted(pk_cols) != sorted(col.name for col in table.primary_key.columns):
+        return True
+    ddl = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+    ).scalar() or ""
+    want_without_rowid = table.dialect_options["sqlite"].get("with_rowid") is False
+    return want_without_rowid != ("WITHOUT ROWID" in ddl.upper())
+
+
+def migrate_tables(engine: Engine, tables: Iterable[Table]) -> List[str]:
+    """Acrescenta colunas novas e reconstrói as tabelas cuja chave ou layout (WITHOUT ROWID) diverge do modelo.
+
+    Devolve uma descrição por tabela reconstruída, citando as linhas separadas por falta de chave.
+    """
+    rebuilt = []
+    for table in tables:
+        with engine.begin() as conn:
+            # Antes da reconstrução, que copia todas as colunas do modelo a partir da tabela antiga.
+            _add_missing_columns(conn, table)
+            if _needs_rebuild(conn, table):
+                orphans = _rebuild_table(conn, table)
+                note = f" ({orphans} linha(s) sem chave em {table.name}_sem_chave)" if orphans else ""
+                rebuilt.append(table.name + note)
+    if rebuilt:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+    return rebuilt
+
+
+def main() -> None:
+    from .order_config import ORDER_DATA_DB_PATH, ORDER_REQUEST_DB_PATH, order_data_engine, order_request_engine
+
+    for path, engine, tables in (
+        (ORDER_REQUEST_DB_PATH, order_request_engine, PENDING_TABLES),
+        (ORDER_DATA_DB_PATH, order_data_engine, ORDER_TABLES),
+    ):
+        if not path.exists():
+            continue
+        rebuilt = migrate_tables(engine, tables)
+        status = ", ".join(rebuilt) if rebuilt else "nada a migrar"
+        print(f"{path.name}: {status}")
+
+
+if __name__ == "__main__":
+    main()
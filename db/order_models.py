@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, LargeBinary, String, Text
 from sqlmodel import Field, SQLModel
 
 
@@ -16,8 +16,58 @@ class OrderRequest(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
+class OrderRequestBlob(SQLModel, table=True):
+    __tablename__ = "order_request_blobs"
+
+    request_id: int = Field(primary_key=True)
+    format: str = Field(default="parquet", nullable=False, max_length=16)
+    row_count: int = Field(default=0, nullable=False)
+    payload: bytes = Field(sa_column=Column("payload", LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class OrderImportFingerprint(SQLModel, table=True):
+    """Um registro por arquivo que entrou em uma solicitação."""
+
+    __tablename__ = "order_import_fingerprints"
+
+    id: int | None = Field(default=None, primary_key=True)
+    request_id: int = Field(nullable=False, index=True)
+    origin: str = Field(nullable=False, max_length=64)
+    file_name: str = Field(nullable=False, max_length=512)
+    content_hash: str = Field(nullable=False, max_length=64, index=True)
+    row_count: int = Field(default=0, nullable=False)
+    key_digest: str = Field(nullable=False, max_length=64, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class OrderRequestKey(SQLModel, table=True):
+    """Chaves ("Nro Ordem") de cada solicitação pendente, para achar reenvios parciais."""
+
+    __tablename__ = "order_request_keys"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    nro_ordem: str = Field(sa_column=Column("Nro Ordem", String, primary_key=True))
+    request_id: int = Field(primary_key=True)
+
+
+class OrderRegionMapping(SQLModel, table=True):
+    """Filial -> região, gerência e e-mail, usado para completar as ordens 167 na importação."""
+
+    __tablename__ = "order_region_mappings"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    filial_contabil: str = Field(sa_column=Column("Filial Contábil", String, primary_key=True))
+    cod_regiao: str | None = Field(default=None, sa_column=Column("Cód. Região", String))
+    regiao2: str | None = Field(default=None, sa_column=Column("Região - 2", String))
+    gerencia: str | None = Field(default=None, sa_column=Column("Gerencia", String))
+    email: str | None = Field(default=None, sa_column=Column("Email", String))
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
 class Order167Pending(SQLModel, table=True):
     __tablename__ = "order_167_pending"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     nro_ordem: str = Field(
         sa_column=Column("Nro Ordem", String, primary_key=True),
@@ -49,12 +99,14 @@ class Order167Pending(SQLModel, table=True):
     stt: str | None = Field(default=None, sa_column=Column("STT", String))
     email: str | None = Field(default=None, sa_column=Column("Email", String))
     dias_vencer: int | None = Field(default=None, sa_column=Column("Dias a Vencer", String))
+    row_hash: str | None = Field(default=None, sa_column=Column("Hash Linha", String))
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    request_id: int = Field(nullable=False, index=True)
+    request_id: int = Field(primary_key=True, index=True)
 
 
 class Order171Pending(SQLModel, table=True):
     __tablename__ = "order_171_pending"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     nro_ordem: str = Field(
         sa_column=Column("Nro Ordem", String, primary_key=True),
@@ -73,12 +125,14 @@ class Order171Pending(SQLModel, table=True):
     ano: int | None = Field(default=None, sa_column=Column("ANO", String))
     semana: int | None = Field(default=None, sa_column=Column("Semana", String))
     data_ordem: datetime | None = Field(default=None, sa_column=Column("Data Ordem", String))
+    row_hash: str | None = Field(default=None, sa_column=Column("Hash Linha", String))
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    request_id: int = Field(nullable=False, index=True)
+    request_id: int = Field(primary_key=True, index=True)
 
 
 class Order167(SQLModel, table=True):
     __tablename__ = "orders_167"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     nro_ordem: str = Field(
         sa_column=Column("Nro Ordem", String, primary_key=True),
@@ -110,11 +164,13 @@ class Order167(SQLModel, table=True):
     stt: str | None = Field(default=None, sa_column=Column("STT", String))
     email: str | None = Field(default=None, sa_column=Column("Email", String))
     dias_vencer: int | None = Field(default=None, sa_column=Column("Dias a Vencer", String))
+    row_hash: str | None = Field(default=None, sa_column=Column("Hash Linha", String))
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
 class Order171(SQLModel, table=True):
     __tablename__ = "orders_171"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     nro_ordem: str = Field(
         sa_column=Column("Nro Ordem", String, primary_key=True),
@@ -133,4 +189,5 @@ class Order171(SQLModel, table=True):
     ano: int | None = Field(default=None, sa_column=Column("ANO", String))
     semana: int | None = Field(default=None, sa_column=Column("Semana", String))
     data_ordem: datetime | None = Field(default=None, sa_column=Column("Data Ordem", String))
+    row_hash: str | None = Field(default=None, sa_column=Column("Hash Linha", String))
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
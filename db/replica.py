@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, select
+
+from .config import DB_PATH, engine
+from .models import PopRequest, User
+from .report_config import REPORT_DB_PATH, report_engine
+from .report_models import ReportRequest
+
+
+class DataVersionWatcher:
+    """Lê ``PRAGMA data_version`` numa conexão dedicada ao arquivo SQLite.
+
+    O valor muda sempre que outra conexão (deste ou de outro processo) confirma
+    uma escrita no arquivo, o que permite invalidar réplicas sem consultar as tabelas.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class TableReplica:
+    """Cópia em memória de uma tabela pequena, indexada por chave primária e colunas extras.
+
+    Leituras verificam o ``data_version`` do arquivo e recarregam a tabela inteira quando
+    alguma conexão escreveu nela; como os repositórios gravam por outra conexão, isso vale
+    também para as escritas deste processo. As leituras devolvem cópias: alterar o objeto
+    recebido não mexe na réplica.
+    """
+
+    def __init__(self, engine: Engine, model: type[SQLModel], watcher: DataVersionWatcher, indexes: Iterable[str] = ()) -> None:
+        self.engine = engine
+        self.model = model
+        self.watcher = watcher
+        self._index_fields = tuple(indexes)
+        self._rows: Dict[Any, SQLModel] = {}
+        self._indexes: Dict[str, Dict[Any, List[Any]]] = {name: {} for name in self._index_fields}
+        self._version: int | None = None
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        with self._lock:
+            # Lê a versão antes da consulta: um commit concorrente força nova recarga.
+            version = self.watcher.current()
+            with Session(self.engine) as session:
+                rows = list(session.exec(select(self.model)).all())
+                session.expunge_all()
+            self._rows = {}
+            self._indexes = {name: {} for name in self._index_fields}
+            for row in rows:
+                self._store(row)
+            self._version = version
+
+    def _ensure_fresh(self) -> None:
+        if self._version is None or self.watcher.current() != self._version:
+            self.load()
+
+    def _store(self, row: SQLModel) -> None:
+        pk = row.id
+        self._rows[pk] = row
+        for name in self._index_fields:
+            self._indexes[name].setdefault(getattr(row, name), []).append(pk)
+
+    def _copy(self, row: SQLModel) -> SQLModel:
+        return self.model(**row.model_dump())
+
+    def get(self, pk: Any) -> Optional[SQLModel]:
+        with self._lock:
+            self._ensure_fresh()
+            row = self._rows.get(pk)
+            return self._copy(row) if row is not None else None
+
+    def get_by(self, field: str, value: Any) -> Optional[SQLModel]:
+        with self._lock:
+            self._ensure_fresh()
+            bucket = self._indexes[field].get(value)
+            return self._copy(self._rows[bucket[0]]) if bucket else None
+
+    def filter_by(self, field: str, value: Any) -> List[SQLModel]:
+        with self._lock:
+            self._ensure_fresh()
+            return [self._copy(self._rows[pk]) for pk in self._indexes[field].get(value, ())]
+
+    def all(self) -> List[SQLModel]:
+        with self._lock:
+            self._ensure_fresh()
+            return [self._copy(row) for row in self._rows.values()]
+
+
+
+app_db_watcher = DataVersionWatcher(DB_PATH)
+report_db_watcher = DataVersionWatcher(REPORT_DB_PATH)
+
+users_replica = TableReplica(engine, User, app_db_watcher, indexes=("email", "name"))
+pop_requests_replica = TableReplica(engine, PopRequest, app_db_watcher, indexes=("status",))
+report_requests_replica = TableReplica(report_engine, ReportRequest, report_db_watcher, indexes=("status",))
+
+
+def warm_replicas() -> None:
+    for replica in (users_replica, pop_requests_replica, report_requests_replica):
+        replica.load()
@@ -5,6 +5,7 @@ from pathlib import Path
 from sqlmodel import SQLModel, create_engine
 
 from db.report_models import ReportRequest
+from db.schema import ensure_schema
 
 def _base_dir() -> Path:
     if getattr(sys, "frozen", False):
@@ -15,6 +16,7 @@ def _base_dir() -> Path:
 BASE_DIR = _base_dir()
 REPORT_DB_PATH = BASE_DIR / "data" / "reports.db"
 REPORT_DATABASE_URL = f"sqlite:///{REPORT_DB_PATH}"
+REPORT_SCHEMA_VERSION = 1
 
 report_engine = create_engine(
     REPORT_DATABASE_URL,
@@ -23,6 +25,9 @@ report_engine = create_engine(
 )
 
 
-def init_report_db() -> None:
-    REPORT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+def _migrate() -> None:
     SQLModel.metadata.create_all(report_engine, tables=[ReportRequest.__table__])
+
+
+def init_report_db() -> None:
+    ensure_schema(report_engine, REPORT_DB_PATH, REPORT_SCHEMA_VERSION, _migrate)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+
+
+def schema_version(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+
+def ensure_schema(engine: Engine, db_path: Path, version: int, migrate: Callable[[], None]) -> None:
+    """Roda ``migrate`` só quando o arquivo não existe ou o ``PRAGMA user_version`` difere de ``version``.
+
+    Com o banco em dia, a abertura do app faz uma única consulta de pragma em vez de
+    inspecionar todas as tabelas.
+    """
+    if db_path.exists() and schema_version(engine) == version:
+        return
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    migrate()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
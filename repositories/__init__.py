@@ -6,6 +6,9 @@ from . import (
 	report_request_repository,
 	order_request_repository,
 	order_pending_repository,
+	order_blob_repository,
+	order_fingerprint_repository,
+	order_mapping_repository,
 	order_repository,
 )
 
@@ -19,5 +22,8 @@ __all__ = [
 	"report_request_repository",
 	"order_request_repository",
 	"order_pending_repository",
+	"order_blob_repository",
+	"order_fingerprint_repository",
+	"order_mapping_repository",
 	"order_repository",
 ]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlmodel import Session, delete
+
+from db.order_models import OrderRequestBlob
+
+
+def save_blob(
+    session: Session, request_id: int, payload: bytes, row_count: int, fmt: str = "parquet", *, commit: bool = True
+) -> OrderRequestBlob:
+    blob = OrderRequestBlob(request_id=request_id, format=fmt, row_count=row_count, payload=payload)
+    session.add(blob)
+    if commit:
+        session.commit()
+    else:
+        session.flush()
+    return blob
+
+
+def get_by_request(session: Session, request_id: int) -> Optional[OrderRequestBlob]:
+    return session.get(OrderRequestBlob, request_id)
+
+
+def delete_by_request(session: Session, request_id: int) -> None:
+    session.exec(delete(OrderRequestBlob).where(OrderRequestBlob.request_id == request_id))
+    session.commit()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlmodel import Session, delete, select
+
+from db.order_models import OrderImportFingerprint, OrderRequest, OrderRequestKey
+
+# Reenvio de arquivo de uma solicitação recusada é permitido.
+ACTIVE_STATUSES = ("pendente", "aprovado")
+
+
+def find_by_hashes(session: Session, origin: str, hashes: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+    """Mapeia hash do arquivo -> (id, status) da solicitação mais recente que já o recebeu."""
+    hashes = [h for h in set(hashes) if h]
+    if not hashes:
+        return {}
+    stmt = (
+        select(OrderImportFingerprint.content_hash, OrderRequest.id, OrderRequest.status)
+        .join(OrderRequest, OrderRequest.id == OrderImportFingerprint.request_id)
+        .where(
+            OrderImportFingerprint.origin == origin,
+            OrderImportFingerprint.content_hash.in_(hashes),
+            OrderRequest.status.in_(ACTIVE_STATUSES),
+        )
+        .order_by(OrderRequest.id)
+    )
+    return {content_hash: (request_id, status) for content_hash, request_id, status in session.exec(stmt)}
+
+
+def find_by_key_digests(session: Session, origin: str, digests: Iterable[str]) -> Dict[str, int]:
+    """Mapeia digest do conjunto de chaves -> solicitação pendente mais recente com um arquivo de mesmas chaves."""
+    digests = [d for d in set(digests) if d]
+    if not digests:
+        return {}
+    stmt = (
+        select(OrderImportFingerprint.key_digest, OrderRequest.id)
+        .join(OrderRequest, OrderRequest.id == OrderImportFingerprint.request_id)
+        .where(
+            OrderImportFingerprint.origin == origin,
+            OrderImportFingerprint.key_digest.in_(digests),
+            OrderRequest.status == "pendente",
+        )
+        .order_by(OrderRequest.id)
+    )
+    return {digest: request_id for digest, request_id in session.exec(stmt)}
+
+
+def save_fingerprints(session: Session, request_id: int, origin: str, files: Iterable, *, commit: bool = True) -> None:
+    for report in files:
+        if not report.content_hash:
+            continue
+        session.add(
+            OrderImportFingerprint(
+                request_id=request_id,
+                origin=origin,
+                file_name=str(report.file_path)[-512:],
+                content_hash=report.content_hash,
+                row_count=report.rows,
+                key_digest=report.key_digest,
+            )
+        )
+    if commit:
+        session.commit()
+    else:
+        session.flush()
+
+
+def save_keys(session: Session, request_id: int, keys: Iterable[str], *, commit: bool = True) -> None:
+    params = [(key, request_id) for key in keys]
+    if params:
+        session.connection().exec_driver_sql(
+            'INSERT OR IGNORE INTO order_request_keys ("Nro Ordem", request_id) VALUES (?, ?)', params
+        )
+    if commit:
+        session.commit()
+
+
+def delete_keys(session: Session, request_id: int) -> None:
+    session.exec(delete(OrderRequestKey).where(OrderRequestKey.request_id == request_id))
+    session.commit()
+
+
+def find_covering_request(session: Session, origin: str, keys: Iterable[str]) -> Optional[int]:
+    """Solicitação pendente que já contém todas as ``keys``, se houver.
+
+    As chaves vão para uma tabela temporária e a contagem por solicitação
+    roda no SQLite, pelo índice da chave.
+    """
+    params = [(key,) for key in set(keys)]
+    if not params:
+        return None
+    conn = session.connection()
+    conn.exec_driver_sql("DROP TABLE IF EXISTS temp.incoming_keys")
+    conn.exec_driver_sql("CREATE TEMP TABLE incoming_keys (nro TEXT PRIMARY KEY) WITHOUT ROWID")
+    try:
+        conn.exec_driver_sql("INSERT INTO temp.incoming_keys (nro) VALUES (?)", params)
+        row = conn.exec_driver_sql(
+            'SELECT k.request_id FROM temp.incoming_keys AS i '
+            'JOIN order_request_keys AS k ON k."Nro Ordem" = i.nro '
+            'JOIN order_requests AS r ON r.id = k.request_id '
+            "WHERE r.status = 'pendente' AND r.origin = ? "
+            'GROUP BY k.request_id HAVING COUNT(*) = ? '
+            'ORDER BY k.request_id DESC LIMIT 1',
+            (origin, len(params)),
+        ).first()
+        return None if row is None else int(row[0])
+    finally:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS temp.incoming_keys")
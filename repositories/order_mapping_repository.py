@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from sqlmodel import Session, delete, func, select
+
+from db.order_models import OrderRegionMapping
+
+
+def mapping_version(session: Session) -> str:
+    """Assinatura barata da tabela: muda a cada carga ou edição de linha."""
+    count, last = session.exec(select(func.count(), func.max(OrderRegionMapping.updated_at))).one()
+    return f"{count}|{last or ''}"
+
+
+def list_mappings(session: Session) -> List[Tuple[str, str | None, str | None, str | None, str | None]]:
+    stmt = select(
+        OrderRegionMapping.filial_contabil,
+        OrderRegionMapping.cod_regiao,
+        OrderRegionMapping.regiao2,
+        OrderRegionMapping.gerencia,
+        OrderRegionMapping.email,
+    )
+    return list(session.exec(stmt).all())
+
+
+def replace_mappings(session: Session, rows: Iterable[dict]) -> int:
+    """Troca a tabela inteira pelas ``rows`` (chaves = atributos do modelo)."""
+    now = datetime.utcnow()
+    session.exec(delete(OrderRegionMapping))
+    total = 0
+    for data in rows:
+        session.add(OrderRegionMapping(**data, updated_at=now))
+        total += 1
+    session.commit()
+    return total
@@ -1,27 +1,23 @@
 from __future__ import annotations
 
-from typing import Iterable, List
-
-from sqlmodel import Session, select
-
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect as sa_inspect
+from sqlmodel import Session, delete, select
 
 from db.order_models import Order167Pending, Order171Pending
 
 
 def _to_datetime(val: Any) -> datetime | None:
-    try:
-        import pandas as pd
-
-        if isinstance(val, pd.Timestamp):
-            return val.to_pydatetime()
-    except Exception:
-        pass
+    if val is None or val is pd.NaT:
+        return None
+    if isinstance(val, pd.Timestamp):
+        return val.to_pydatetime()
     if isinstance(val, datetime):
         return val
-    if val is None:
-        return None
     try:
         return datetime.fromisoformat(str(val))
     except Exception:
@@ -34,59 +30,6 @@ def _pending_model(origin: str):
     return Order171Pending
 
 
-def _normalize_167(rec: Dict, request_id: int) -> Dict:
-    return {
-        "nro_ordem": str(rec.get("Nro Ordem", "")).strip(),
-        "status": rec.get("STATUS"),
-        "tratativa": rec.get("TRATATIVA"),
-        "responsavel": rec.get("Responsável"),
-        "data_fechamento_div": _to_datetime(rec.get("Data Fechamento Divergência")),
-        "conferente": rec.get("Conferente"),
-        "obs": rec.get("OBS"),
-        "obs2": rec.get("OBS - 2"),
-        "regiao": rec.get("Região"),
-        "filial_contabil": rec.get("Filial Contábil"),
-        "tipo_devolucao": rec.get("Tipo Devol."),
-        "carga": rec.get("Carga"),
-        "valor": _to_float(rec.get("Valor")),
-        "falta": _to_float(rec.get("Falta")),
-        "mes": _to_int(rec.get("MÊS")),
-        "semana": _to_int(rec.get("Semana")),
-        "data_ordem": _to_datetime(rec.get("Data Ordem")),
-        "data_limite": _to_datetime(rec.get("DATA LIMITE")),
-        "mes_fech": _to_int(rec.get("MÊS DE FECH")),
-        "ano": _to_int(rec.get("ANO")),
-        "semana_limit": rec.get("Semana-Limit"),
-        "cod_regiao": rec.get("Cód. Região"),
-        "regiao2": rec.get("Região - 2"),
-        "gerencia": rec.get("Gerencia"),
-        "stt": rec.get("STT"),
-        "email": rec.get("Email"),
-        "dias_vencer": _to_int(rec.get("Dias a Vencer")),
-        "request_id": request_id,
-    }
-
-
-def _normalize_171(rec: Dict, request_id: int) -> Dict:
-    return {
-        "nro_ordem": str(rec.get("Nro Ordem", "")).strip(),
-        "status": rec.get("Status"),
-        "tratativa": rec.get("Tratativa"),
-        "nome": rec.get("Nome"),
-        "data_tratativa": _to_datetime(rec.get("Data Tratativa")),
-        "cliente": rec.get("Cliente"),
-        "cod_cli": rec.get("Cód. Cli"),
-        "tipo_devolucao": rec.get("Tipo Devol."),
-        "carga": rec.get("Carga"),
-        "valor": _to_float(rec.get("Valor")),
-        "mes": _to_int(rec.get("MÊS")),
-        "ano": _to_int(rec.get("ANO")),
-        "semana": _to_int(rec.get("Semana")),
-        "data_ordem": _to_datetime(rec.get("Data Ordem")),
-        "request_id": request_id,
-    }
-
-
 def _to_int(val: Any) -> int | None:
     try:
         if val is None:
@@ -105,17 +48,136 @@ def _to_float(val: Any) -> float | None:
         return None
 
 
-def save_pending(session: Session, origin: str, request_id: int, df) -> None:
+# Conversões por coluna inteira. Colunas object (tipos misturados) caem no
+# conversor escalar equivalente, para o resultado ser o mesmo de antes.
+def _col_text(s: pd.Series) -> List:
+    return s.tolist()
+
+
+def _col_datetime(s: pd.Series) -> List:
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        values = pd.DatetimeIndex(s)
+        return [None if missing else v for v, missing in zip(values.to_pydatetime(), values.isna())]
+    return [_to_datetime(v) for v in s.tolist()]
+
+
+def _col_float(s: pd.Series) -> List:
+    if pd.api.types.is_float_dtype(s.dtype) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+        return s.tolist()
+    if pd.api.types.is_integer_dtype(s.dtype) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+        return s.astype("float64").tolist()
+    return [_to_float(v) for v in s.tolist()]
+
+
+def _col_int(s: pd.Series) -> List:
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        values = s.astype("float64").to_numpy()
+        ok = np.isfinite(values)
+        out = np.trunc(np.where(ok, values, 0)).astype("int64").tolist()
+        return [v if keep else None for v, keep in zip(out, ok.tolist())]
+    return [_to_int(v) for v in s.tolist()]
+
+
+_Field = Tuple[str, str, Callable[[pd.Series], List]]
+
+_FIELDS_167: Tuple[_Field, ...] = (
+    ("status", "STATUS", _col_text),
+    ("tratativa", "TRATATIVA", _col_text),
+    ("responsavel", "Responsável", _col_text),
+    ("data_fechamento_div", "Data Fechamento Divergência", _col_datetime),
+    ("conferente", "Conferente", _col_text),
+    ("obs", "OBS", _col_text),
+    ("obs2", "OBS - 2", _col_text),
+    ("regiao", "Região", _col_text),
+    ("filial_contabil", "Filial Contábil", _col_text),
+    ("tipo_devolucao", "Tipo Devol.", _col_text),
+    ("carga", "Carga", _col_text),
+    ("valor", "Valor", _col_float),
+    ("falta", "Falta", _col_float),
+    ("mes", "MÊS", _col_int),
+    ("semana", "Semana", _col_int),
+    ("data_ordem", "Data Ordem", _col_datetime),
+    ("data_limite", "DATA LIMITE", _col_datetime),
+    ("mes_fech", "MÊS DE FECH", _col_int),
+    ("ano", "ANO", _col_int),
+    ("semana_limit", "Semana-Limit", _col_text),
+    ("cod_regiao", "Cód. Região", _col_text),
+    ("regiao2", "Região - 2", _col_text),
+    ("gerencia", "Gerencia", _col_text),
+    ("stt", "STT", _col_text),
+    ("email", "Email", _col_text),
+    ("dias_vencer", "Dias a Vencer", _col_int),
+    ("row_hash", "Hash Linha", _col_text),
+)
+
+_FIELDS_171: Tuple[_Field, ...] = (
+    ("status", "Status", _col_text),
+    ("tratativa", "Tratativa", _col_text),
+    ("nome", "Nome", _col_text),
+    ("data_tratativa", "Data Tratativa", _col_datetime),
+    ("cliente", "Cliente", _col_text),
+    ("cod_cli", "Cód. Cli", _col_text),
+    ("tipo_devolucao", "Tipo Devol.", _col_text),
+    ("carga", "Carga", _col_text),
+    ("valor", "Valor", _col_float),
+    ("mes", "MÊS", _col_int),
+    ("ano", "ANO", _col_int),
+    ("semana", "Semana", _col_int),
+    ("data_ordem", "Data Ordem", _col_datetime),
+    ("row_hash", "Hash Linha", _col_text),
+)
+
+
+def _skip_nro(raw: pd.Series) -> np.ndarray:
+    """Mesma regra do ``if not nro``: vazio, None e zero ficam de fora (NaN não)."""
+    if pd.api.types.is_numeric_dtype(raw.dtype) and not isinstance(raw.dtype, pd.api.extensions.ExtensionDtype):
+        return (raw == 0).to_numpy()
+    if raw.dtype == object:
+        return np.fromiter((not v for v in raw.tolist()), dtype=bool, count=len(raw))
+    return np.zeros(len(raw), dtype=bool)
+
+
+def normalize_columns(origin: str, request_id: int, df) -> Dict[str, List]:
+    """Converte o DataFrame em colunas já tipadas (atributo -> lista), prontas para executemany/Arrow.
+
+    Ordens repetidas na mesma planilha mantêm a última ocorrência.
+    """
+    fields = _FIELDS_167 if _pending_model(origin) is Order167Pending else _FIELDS_171
+    if not hasattr(df, "columns") or "Nro Ordem" not in df.columns or df.empty:
+        return {}
+    df = df.iloc[~_skip_nro(df["Nro Ordem"])]
+    nro = df["Nro Ordem"].map(str).str.strip()
+    keep = ~nro.duplicated(keep="last").to_numpy()
+    df = df.iloc[keep]
+    nro = nro.iloc[keep]
+
+    n = len(df.index)
+    columns: Dict[str, List] = {"nro_ordem": nro.tolist()}
+    for attr, col, convert in fields:
+        columns[attr] = convert(df[col]) if col in df.columns else [None] * n
+    columns["request_id"] = [request_id] * n
+    return columns
+
+
+def normalize_frame(origin: str, request_id: int, df) -> List[Dict]:
+    columns = normalize_columns(origin, request_id, df)
+    if not columns:
+        return []
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def save_pending(session: Session, origin: str, request_id: int, df, *, commit: bool = True) -> None:
     Model = _pending_model(origin)
-    records = df.to_dict(orient="records") if hasattr(df, "to_dict") else []
-    for rec in records:
-        nro = rec.get("Nro Ordem")
-        if not nro:
-            continue
-        data = _normalize_167(rec, request_id) if Model is Order167Pending else _normalize_171(rec, request_id)
-        obj = Model(**data)
-        session.merge(obj)
-    session.commit()
+    rows = normalize_frame(origin, request_id, df)
+    now = datetime.utcnow()
+    for data in rows:
+        data["created_at"] = now
+    # Staging é só append: a chave (request_id, Nro Ordem) isola cada solicitação.
+    if rows:
+        session.bulk_insert_mappings(Model, rows)
+    if commit:
+        session.commit()
 
 
 def list_by_request(session: Session, origin: str, request_id: int) -> List:
@@ -124,10 +186,14 @@ def list_by_request(session: Session, origin: str, request_id: int) -> List:
     return list(session.exec(stmt).all())
 
 
+def rows_to_records(origin: str, rows) -> List[Dict]:
+    """Converte linhas de staging em registros com os nomes de coluna da planilha."""
+    Model = _pending_model(origin)
+    attrs = [(prop.key, prop.columns[0].name) for prop in sa_inspect(Model).column_attrs]
+    return [{name: getattr(row, key) for key, name in attrs} for row in rows]
+
+
 def delete_by_request(session: Session, origin: str, request_id: int) -> None:
     Model = _pending_model(origin)
-    stmt = select(Model).where(Model.request_id == request_id)
-    rows: Iterable[Model] = session.exec(stmt)
-    for row in rows:
-        session.delete(row)
+    session.exec(delete(Model).where(Model.request_id == request_id))
     session.commit()
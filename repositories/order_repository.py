@@ -1,39 +1,108 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from typing import Iterable, List
 
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect as sa_inspect, insert
 from sqlmodel import Session, select
 
 from db.order_models import Order167, Order171
 
 
+ROW_NEW = "nova"
+ROW_CHANGED = "alterada"
+ROW_UNCHANGED = "igual"
+ROW_UNKNOWN = "sem hash"  # aprovada antes de existir a coluna de hash
+
+
 def _model(origin: str):
     if "167" in origin:
         return Order167
     return Order171
 
 
-def upsert_orders(session: Session, origin: str, rows: Iterable) -> None:
+def upsert_orders(session: Session, origin: str, rows: Iterable) -> int:
+    """Grava as ordens que ainda não existem; as já aprovadas ficam como estão.
+
+    Um único ``INSERT OR IGNORE`` em executemany: a chave primária decide o que é
+    novo, sem um ``session.get`` por linha. Devolve quantas ordens entraram.
+    """
     Model = _model(origin)
+    columns = [(prop.key, prop.columns[0].key) for prop in sa_inspect(Model).column_attrs]
+    key_col = Model.__table__.primary_key.columns.values()[0].key
+    now = datetime.utcnow()
+    params = []
     seen = set()
     for row in rows:
-        data = row if isinstance(row, dict) else row.dict()
-        data.pop("request_id", None)
+        data = row if isinstance(row, dict) else row.model_dump()
         nro_ordem = str(data.get("nro_ordem") or "").strip()
-        if not nro_ordem:
-            continue
-        if nro_ordem in seen:
+        if not nro_ordem or nro_ordem in seen:
             continue
         seen.add(nro_ordem)
-        if session.get(Model, nro_ordem) is not None:
-            continue  # preserve existing in DB
-        obj = Model(**data)
-        session.add(obj)
+        record = {col: data.get(attr) for attr, col in columns}
+        record[key_col] = nro_ordem
+        if record.get("created_at") is None:
+            record["created_at"] = now
+        params.append(record)
+    if not params:
+        return 0
+    result = session.execute(insert(Model.__table__).prefix_with("OR IGNORE"), params)
     session.commit()
+    return result.rowcount
 
 
 def list_all(session: Session, origin: str) -> List:
     Model = _model(origin)
     stmt = select(Model)
     return list(session.exec(stmt).all())
+
+
+def approved_row_hashes(session: Session, origin: str, keys: Iterable[str]) -> pd.Series:
+    """Hash das ordens aprovadas entre ``keys``, indexado pela chave; ``None`` nas aprovadas sem hash.
+
+    As chaves recebidas vão para uma tabela temporária e o join com a tabela de
+    ordens roda no SQLite, pela chave primária: o custo acompanha o tamanho do
+    arquivo importado, não o histórico de aprovadas. Chave ausente do resultado é nova.
+    """
+    params = [(key,) for key in dict.fromkeys(keys)]
+    if not params:
+        return pd.Series([], index=pd.Index([], dtype=object), dtype=object)
+    Model = _model(origin)
+    table = Model.__table__.name
+    key_col = Model.__table__.primary_key.columns.values()[0].name
+    hash_col = Model.row_hash.property.columns[0].name
+    conn = session.connection()
+    conn.exec_driver_sql("DROP TABLE IF EXISTS temp.incoming_keys")
+    conn.exec_driver_sql("CREATE TEMP TABLE incoming_keys (nro TEXT PRIMARY KEY) WITHOUT ROWID")
+    try:
+        conn.exec_driver_sql("INSERT OR IGNORE INTO temp.incoming_keys (nro) VALUES (?)", params)
+        rows = conn.exec_driver_sql(
+            f'SELECT k.nro, o."{hash_col}" FROM temp.incoming_keys AS k '
+            f'JOIN "{table}" AS o ON o."{key_col}" = k.nro'
+        ).all()
+    finally:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS temp.incoming_keys")
+    keys_found = [row[0] for row in rows]
+    hashes = [row[1] for row in rows]
+    return pd.Series(hashes, index=pd.Index(keys_found, dtype=object), dtype=object)
+
+
+def classify_rows(approved: pd.Series, keys: pd.Series, hashes: pd.Series) -> np.ndarray:
+    """Classifica cada linha (chave, hash) contra o resultado de ``approved_row_hashes``.
+
+    Devolve, por linha, ``ROW_NEW``, ``ROW_CHANGED``, ``ROW_UNCHANGED`` ou ``ROW_UNKNOWN``.
+    """
+    pos = approved.index.get_indexer(keys)
+    found = pos >= 0
+    stored = np.full(len(pos), None, dtype=object)
+    stored[found] = approved.to_numpy(dtype=object)[pos[found]]
+    no_hash = found & pd.isna(stored)
+    same = found & ~no_hash & (stored == hashes.to_numpy(dtype=object))
+    status = np.full(len(pos), ROW_CHANGED, dtype=object)
+    status[~found] = ROW_NEW
+    status[no_hash] = ROW_UNKNOWN
+    status[same] = ROW_UNCHANGED
+    return status
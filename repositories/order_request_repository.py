@@ -7,13 +7,19 @@ from sqlmodel import Session, select
 from db.order_models import OrderRequest
 
 
-def create_request(session: Session, origin: str, description: str, total_orders: int | None = None) -> OrderRequest:
+def create_request(
+    session: Session, origin: str, description: str, total_orders: int | None = None, *, commit: bool = True
+) -> OrderRequest:
     request = OrderRequest(
         origin=origin.strip(),
         description=description.strip(),
         total_orders=total_orders,
     )
     session.add(request)
+    if not commit:
+        # Só o flush: o id já sai, e o commit fica com quem abriu a transação.
+        session.flush()
+        return request
     session.commit()
     session.refresh(request)
     return request
@@ -5,6 +5,7 @@ from typing import List, Optional
 from sqlmodel import Session, select
 
 from db.models import PopRequest
+from db.replica import pop_requests_replica
 
 
 def create_request(session: Session, title: str, description: str, file_name: str, file_path: str) -> PopRequest:
@@ -30,6 +31,11 @@ def list_approved(session: Session) -> List[PopRequest]:
     return list(session.exec(statement).all())
 
 
+def list_approved_cached() -> List[PopRequest]:
+    approved = pop_requests_replica.filter_by("status", "aprovado")
+    return sorted(approved, key=lambda req: req.created_at, reverse=True)
+
+
 def get_by_id(session: Session, request_id: int) -> Optional[PopRequest]:
     return session.get(PopRequest, request_id)
 
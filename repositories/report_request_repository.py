@@ -5,6 +5,7 @@ from typing import List, Optional
 from sqlmodel import Session, select
 
 from db.report_models import ReportRequest
+from db.replica import report_requests_replica
 
 
 def create_request(session: Session, title: str, description: str, file_name: str, file_path: str) -> ReportRequest:
@@ -30,6 +31,11 @@ def list_approved(session: Session) -> List[ReportRequest]:
     return list(session.exec(statement).all())
 
 
+def list_approved_cached() -> List[ReportRequest]:
+    approved = report_requests_replica.filter_by("status", "aprovado")
+    return sorted(approved, key=lambda req: req.created_at, reverse=True)
+
+
 def get_by_id(session: Session, request_id: int) -> Optional[ReportRequest]:
     return session.get(ReportRequest, request_id)
 
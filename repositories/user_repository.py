@@ -5,6 +5,7 @@ from typing import Optional, List
 from sqlmodel import Session, select
 
 from db.models import User
+from db.replica import users_replica
 
 
 def get_by_email(session: Session, email: str) -> Optional[User]:
@@ -27,6 +28,14 @@ def list_all(session: Session) -> List[User]:
     return session.exec(select(User).order_by(User.name)).all()
 
 
+def list_all_cached() -> List[User]:
+    return sorted(users_replica.all(), key=lambda user: user.name)
+
+
+def get_by_email_cached(email: str) -> Optional[User]:
+    return users_replica.get_by("email", email)
+
+
 def set_role(session: Session, user_id: int, role: str) -> Optional[User]:
     user = session.get(User, user_id)
     if user is None:
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (mês, dia) dos feriados que caem sempre na mesma data.
+FERIADOS_FIXOS_MD: Tuple[Tuple[int, int], ...] = (
+    (1, 1),
+    (4, 15),
+    (4, 21),
+    (5, 1),
+    (9, 7),
+    (10, 12),
+    (11, 2),
+    (11, 15),
+    (12, 25),
+    (12, 31),
+)
+
+# Deslocamento em dias a partir do domingo de Páscoa.
+FERIADOS_MOVEIS = {
+    "Carnaval (segunda)": -48,
+    "Carnaval (terça)": -47,
+    "Sexta-feira Santa": -2,
+    "Corpus Christi": 60,
+}
+
+
+def pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados(ano: int) -> List[date]:
+    fixos = [date(ano, m, d) for m, d in FERIADOS_FIXOS_MD]
+    base = pascoa(ano)
+    moveis = [base + timedelta(days=delta) for delta in FERIADOS_MOVEIS.values()]
+    return sorted(set(fixos + moveis))
+
+
+@lru_cache(maxsize=32)
+def business_calendar(first_year: int, last_year: int) -> np.busdaycalendar:
+    """Calendário seg–sex com os feriados de ``first_year`` a ``last_year``, reaproveitado entre chamadas."""
+    dias = [d for ano in range(first_year, last_year + 1) for d in feriados(ano)]
+    return np.busdaycalendar(weekmask="1111100", holidays=np.array(dias, dtype="datetime64[D]"))
+
+
+def add_business_days(dates: pd.Series, n: int) -> pd.Series:
+    """Soma ``n`` dias úteis a cada data, com o mesmo resultado de ``dates + n * CustomBusinessDay``.
+
+    Como no pandas, uma data que cai em fim de semana/feriado conta o primeiro
+    avanço até o dia útil seguinte (ou anterior, se ``n`` < 0) como um dos ``n``.
+    A hora do dia é preservada e NaT continua NaT.
+    """
+    dt = pd.to_datetime(dates)
+    valid = dt.notna().to_numpy()
+    out = np.full(len(dt), np.datetime64("NaT"), dtype="datetime64[ns]")
+    if not valid.any():
+        return pd.Series(out, index=dates.index, name=dates.name)
+
+    values = dt.to_numpy(dtype="datetime64[ns]")[valid]
+    days = values.astype("datetime64[D]")
+    time_of_day = values - days.astype("datetime64[ns]")
+
+    years = days.astype("datetime64[Y]").astype(int) + 1970
+    first, last = int(years.min()), int(years.max())
+    # Folga de um ano para o prazo que atravessa a virada.
+    span = abs(n) // 250 + 1
+    cal = business_calendar(first - span, last + span)
+
+    if n == 0:
+        shifted = np.busday_offset(days, 0, roll="forward", busdaycal=cal)
+    else:
+        off_day = ~np.is_busday(days, busdaycal=cal)
+        step = np.where(off_day, n - np.sign(n), n)
+        shifted = np.busday_offset(days, step, roll="forward" if n > 0 else "backward", busdaycal=cal)
+
+    out[valid] = shifted.astype("datetime64[ns]") + time_of_day
+    return pd.Series(out, index=dates.index, name=dates.name)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Formatos tentados nos textos. Datas com barra são sempre dia antes do mês,
+# como o ``dayfirst=True`` usado antes.
+TEXT_FORMATS: Tuple[str, ...] = (
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%d/%m/%y",
+)
+FORMAT_DATETIME = "data"
+FORMAT_SERIAL = "serial do Excel"
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+# Número (célula numérica ou texto) só é lido como serial nesta faixa (1954 a 2119);
+# fora dela, 2025, 15 ou "15042025" não são datas e contam como não convertidos.
+SERIAL_MIN = 20000
+SERIAL_MAX = 80000
+# Textos distintos usados para escolher o próximo formato.
+SAMPLE_SIZE = 200
+
+_NUMBER_TEXT = r"^\d+(?:[.,]\d+)?$"
+_KIND_OTHER, _KIND_DATE, _KIND_NUMBER, _KIND_TEXT = 0, 1, 2, 3
+
+_formats: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class ParsedDates:
+    values: pd.Series
+    # Células preenchidas que não viraram data (ficaram NaT).
+    coerced: int
+    # Formatos que reconheceram alguma célula, na ordem em que foram usados.
+    formats: Tuple[str, ...]
+
+
+def cached_formats(source: str, column: str) -> Tuple[str, ...]:
+    with _lock:
+        return _formats.get((source, column), ())
+
+
+def _remember(source: str, column: str, used: List[str]) -> None:
+    text = [fmt for fmt in used if fmt in TEXT_FORMATS]
+    if not text:
+        return
+    with _lock:
+        previous = _formats.get((source, column), ())
+        _formats[(source, column)] = tuple(dict.fromkeys(text + list(previous)))
+
+
+def _nat(n: int) -> np.ndarray:
+    return np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+
+
+def _from_serial(days: np.ndarray) -> np.ndarray:
+    """Serial do Excel (dias desde 30/12/1899, fração = hora) -> datetime64; fora da faixa vira NaT."""
+    out = _nat(len(days))
+    ok = np.isfinite(days) & (days >= SERIAL_MIN) & (days <= SERIAL_MAX)
+    if ok.any():
+        out[ok] = (EXCEL_EPOCH + pd.to_timedelta(days[ok], unit="D")).to_numpy(dtype="datetime64[ns]")
+    return out
+
+
+def _naive(v):
+    """Data com fuso vira a mesma hora de relógio sem fuso (sem converter para UTC)."""
+    if getattr(v, "tzinfo", None) is not None:
+        return pd.Timestamp(v).tz_localize(None)
+    return v
+
+
+def _kinds(values: np.ndarray) -> np.ndarray:
+    kinds = np.zeros(len(values), dtype=np.int8)
+    for i, v in enumerate(values):
+        if isinstance(v, str):
+            kinds[i] = _KIND_TEXT
+        elif isinstance(v, (date, np.datetime64)):
+            kinds[i] = _KIND_DATE if not pd.isna(v) else _KIND_OTHER
+        elif isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) and v == v:
+            kinds[i] = _KIND_NUMBER
+    return kinds
+
+
+def _infer_format(texts: pd.Series, tried: set) -> str | None:
+    """Formato que mais reconhece uma amostra dos textos ainda sem data."""
+    sample = texts.drop_duplicates()
+    if len(sample) > SAMPLE_SIZE:
+        sample = sample.sample(SAMPLE_SIZE, random_state=0)
+    best, best_hits = None, 0
+    for fmt in TEXT_FORMATS:
+        if fmt in tried:
+            continue
+        hits = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def _parse_text(texts: pd.Series, preferred: Tuple[str, ...], used: List[str]) -> np.ndarray:
+    """Cada passada aplica um formato exato (vetorizado) ao que ainda não virou data."""
+    out = _nat(len(texts))
+    todo = np.ones(len(texts), dtype=bool)
+    queue = list(preferred)
+    tried: set = set()
+    while todo.any():
+        remaining = texts[todo]
+        fmt = queue.pop(0) if queue else _infer_format(remaining, tried)
+        if fmt is None:
+            break
+        tried.add(fmt)
+        parsed = pd.to_datetime(remaining, format=fmt, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        hit = ~np.isnat(parsed)
+        if hit.any():
+            pos = np.flatnonzero(todo)[hit]
+            out[pos] = parsed[hit]
+            todo[pos] = False
+            used.append(fmt)
+    return out
+
+
+def _parse_objects(values: np.ndarray, source: str, column: str, used: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte valores soltos (object) separando datas, números e textos; devolve (datas, preenchidos)."""
+    n = len(values)
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    missing = pd.isna(values)
+    if kind == "string":
+        kinds = np.where(missing, _KIND_OTHER, _KIND_TEXT).astype(np.int8)
+    elif kind in ("datetime", "date"):
+        kinds = np.where(missing, _KIND_OTHER, _KIND_DATE).astype(np.int8)
+    else:
+        kinds = _kinds(values)
+    out = _nat(n)
+    filled = kinds != _KIND_OTHER
+    serial = False
+
+    is_date = kinds == _KIND_DATE
+    if is_date.any():
+        dates = pd.Series([_naive(v) for v in values[is_date]], dtype=object)
+        out[is_date] = pd.to_datetime(dates, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        used.append(FORMAT_DATETIME)
+
+    is_text = kinds == _KIND_TEXT
+    if is_text.any():
+        # "15//04/2025" é erro de digitação comum; o parser antigo aceitava.
+        texts = pd.Series(values[is_text], dtype=object).str.strip().str.replace(r"/{2,}", "/", regex=True)
+        pos = np.flatnonzero(is_text)
+        blank = texts.eq("").to_numpy(dtype=bool)
+        filled[pos[blank]] = False
+        # Serial exportado como texto (CSV): "45736" ou "45736,5".
+        numeric = texts.str.match(_NUMBER_TEXT).to_numpy(dtype=bool) & ~blank
+        if numeric.any():
+            days = pd.to_numeric(texts[numeric].str.replace(",", ".", regex=False), errors="coerce")
+            # Fora da faixa fica NaT e conta como não convertido.
+            converted = _from_serial(days.to_numpy(dtype="float64"))
+            out[pos[numeric]] = converted
+            serial = not np.isnat(converted).all()
+        rest = ~numeric & ~blank
+        if rest.any():
+            out[pos[rest]] = _parse_text(texts[rest].reset_index(drop=True), cached_formats(source, column), used)
+
+    is_number = kinds == _KIND_NUMBER
+    if is_number.any():
+        converted = _from_serial(values[is_number].astype("float64"))
+        out[is_number] = converted
+        serial = serial or not np.isnat(converted).all()
+    if serial:
+        used.append(FORMAT_SERIAL)
+    return out, filled
+
+
+def parse_dates(s: pd.Series, source: str = "", column: str | None = None) -> ParsedDates:
+    """Converte a coluna para datetime64 reconhecendo datas, seriais do Excel e textos.
+
+    Cada grupo homogêneo é convertido de uma vez. Os formatos de texto que deram
+    certo ficam guardados por ``(source, column)`` e são tentados primeiro nos
+    próximos blocos da mesma coluna.
+    """
+    column = str(column if column is not None else s.name)
+    n = len(s.index)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        if isinstance(s.dtype, pd.DatetimeTZDtype):
+            s = s.dt.tz_localize(None)
+        values = pd.Series(s.to_numpy(dtype="datetime64[ns]"), index=s.index, name=s.name)
+        return ParsedDates(values, 0, (FORMAT_DATETIME,))
+
+    used: List[str] = []
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        days = s.to_numpy(dtype="float64", na_value=np.nan)
+        out = _from_serial(days)
+        filled = ~np.isnan(days)
+        if not np.isnat(out).all():
+            used.append(FORMAT_SERIAL)
+    else:
+        # Datas se repetem muito: cada valor distinto é convertido uma vez só (como o cache do to_datetime).
+        codes, uniques = pd.factorize(s.to_numpy(dtype=object))
+        unique_out, unique_filled = _parse_objects(np.asarray(uniques, dtype=object), source, column, used)
+        present = codes >= 0
+        out = _nat(n)
+        filled = np.zeros(n, dtype=bool)
+        out[present] = unique_out[codes[present]]
+        filled[present] = unique_filled[codes[present]]
+
+    _remember(source, column, used)
+    coerced = filled & np.isnat(out)
+    return ParsedDates(pd.Series(out, index=s.index, name=s.name), int(coerced.sum()), tuple(used))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import io
+from typing import Dict
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow é opcional
+    pa = None
+
+HAS_PYARROW = pa is not None
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte para texto as colunas object com tipos misturados, que o Arrow rejeita."""
+    out = df
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if out is df:
+                out = df.copy()
+            out[col] = df[col].map(lambda v: None if pd.isna(v) else str(v))
+    return out
+
+
+def compact_text_columns(df: pd.DataFrame, columns, max_ratio: float = 0.5) -> pd.DataFrame:
+    """Converte para ``category`` as colunas de texto com poucos valores distintos (altera ``df``)."""
+    rows = len(df.index)
+    if not rows:
+        return df
+    for col in columns:
+        if col not in df.columns or df[col].dtype != object:
+            continue
+        s = df[col]
+        # Só texto puro: categorias com tipos misturados não passam pelo Parquet.
+        if pd.api.types.infer_dtype(s, skipna=True) != "string":
+            continue
+        if s.nunique(dropna=True) <= rows * max_ratio:
+            df[col] = s.astype("category")
+    return df
+
+
+def frame_to_parquet(df: pd.DataFrame, metadata: Dict[str, str] | None = None) -> bytes:
+    """Parquet (zstd) de ``df``; ``metadata`` vai junto no esquema e volta por ``parquet_metadata``."""
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow não está instalado.")
+    buf = io.BytesIO()
+    if not metadata:
+        _arrow_safe(df).to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+        return buf.getvalue()
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    extra = {key.encode(): value.encode() for key, value in metadata.items()}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **extra})
+    pq.write_table(table, buf, compression="zstd")
+    return buf.getvalue()
+
+
+def parquet_metadata(payload: bytes) -> Dict[str, str]:
+    """Metadados gravados com ``frame_to_parquet(..., metadata=...)``, sem ler os dados."""
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow não está instalado.")
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(io.BytesIO(payload)).metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()}
+
+
+def frame_from_parquet(payload: bytes) -> pd.DataFrame:
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow não está instalado.")
+    return pd.read_parquet(io.BytesIO(payload), engine="pyarrow")
+
+
+def frame_to_arrow_file(df: pd.DataFrame, path) -> None:
+    """Grava ``df`` em Arrow IPC sem compressão, no formato que ``frame_from_arrow_file`` mapeia."""
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow não está instalado.")
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def frame_from_arrow_file(path) -> pd.DataFrame:
+    """Lê o arquivo por memory map: os buffers do Arrow apontam para o arquivo, sem desserializar nada.
+
+    A única cópia é a conversão para pandas; depois dela o arquivo pode ser apagado.
+    """
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow não está instalado.")
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(self_destruct=True)
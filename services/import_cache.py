@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from db.config import BASE_DIR
+from services.frame_io import HAS_PYARROW, frame_from_parquet, frame_to_parquet, parquet_metadata
+from services.order_rules import load_rules
+
+CACHE_DIR = BASE_DIR / "data" / "import_cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Suba quando o formato do DataFrame gerado mudar sem mudança nos módulos abaixo.
+CACHE_SCHEMA_VERSION = 1
+
+# Módulos cujo código define o resultado da importação; editar qualquer um invalida o cache.
+_PIPELINE_MODULES = (
+    "services.order_readers",
+    "services.business_calendar",
+    "services.date_parsing",
+    "services.senha167_service",
+    "services.senha171_service",
+    "services.order_import_service",
+    "services.row_hash",
+    "services.order_rules",
+    "services.order_enrichment",
+)
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    digest = hashlib.sha256()
+    for name in _PIPELINE_MODULES:
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if path and os.path.exists(path):
+            digest.update(Path(path).read_bytes())
+        else:
+            digest.update(name.encode())
+    return digest.hexdigest()[:16]
+
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(origin: str, file_path: str, sheet: str | None = None, data_version: str = "") -> str:
+    """``data_version`` identifica dados do banco usados na transformação (ex.: tabela de filiais)."""
+    parts = (
+        origin,
+        file_digest(file_path),
+        sheet or "",
+        str(CACHE_SCHEMA_VERSION),
+        code_version(),
+        load_rules(origin).digest,
+        data_version,
+    )
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _entry(key: str) -> Path:
+    return CACHE_DIR / f"{key}.parquet"
+
+
+def load(key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, str]]]:
+    """(DataFrame, metadados gravados por ``store``) ou None quando não há entrada."""
+    if not HAS_PYARROW:
+        return None
+    path = _entry(key)
+    try:
+        payload = path.read_bytes()
+        df = frame_from_parquet(payload)
+        meta = parquet_metadata(payload)
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001 - entrada corrompida vira cache miss
+        path.unlink(missing_ok=True)
+        return None
+    # mtime marca o último uso para a expulsão por LRU.
+    os.utime(path)
+    return df, meta
+
+
+def store(key: str, df: pd.DataFrame, meta: Dict[str, str] | None = None) -> None:
+    """Grava ``df`` e, no esquema do Parquet, ``meta`` (texto; ex.: o relatório de validação)."""
+    if not HAS_PYARROW or df is None:
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry(key)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(frame_to_parquet(df, meta))
+    os.replace(tmp, path)
+    evict()
+
+
+def evict(max_bytes: int = CACHE_MAX_BYTES) -> int:
+    """Remove as entradas usadas há mais tempo até o cache caber em ``max_bytes``."""
+    if not CACHE_DIR.exists():
+        return 0
+    entries = []
+    for path in CACHE_DIR.glob("*.parquet"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear() -> int:
+    if not CACHE_DIR.exists():
+        return 0
+    removed = 0
+    for path in CACHE_DIR.glob("*.parquet"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def main() -> None:
+    print(f"{CACHE_DIR}: {clear()} entrada(s) removida(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlmodel import Session
+
+from db.order_config import order_data_engine
+from repositories import order_mapping_repository
+from services.order_readers import CHUNK_SIZE, ColumnContract, iter_chunks
+
+MAPPING_KEY = "Filial Contábil"
+# Colunas das ordens 167 completadas pela tabela order_region_mappings (na ordem do modelo).
+ENRICHED_COLUMNS = ("Cód. Região", "Região - 2", "Gerencia", "Email")
+_ATTRS = ("cod_regiao", "regiao2", "gerencia", "email")
+
+MAPPING_CONTRACT = ColumnContract(
+    columns=(MAPPING_KEY,) + ENRICHED_COLUMNS,
+    text_columns=("Região - 2", "Gerencia", "Email"),
+    required=(MAPPING_KEY,),
+)
+
+
+def key_text(s: pd.Series) -> pd.Series:
+    # 379, 379.0 e " 379" são a mesma filial.
+    return s.astype("string").str.strip().str.replace(r"\.0$", "", regex=True)
+
+
+def _blank(s: pd.Series) -> np.ndarray:
+    return (s.isna() | s.astype("string").str.strip().eq("")).to_numpy(dtype=bool)
+
+
+@dataclass(frozen=True)
+class RegionMapping:
+    """Tabela de filiais em memória; ``keys`` é um índice hash, consultado com ``get_indexer``."""
+
+    version: str
+    keys: pd.Index
+    values: Dict[str, np.ndarray]
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Preenche as ``ENRICHED_COLUMNS`` vazias pela filial (altera ``df``); valor da planilha prevalece."""
+        if not len(self.keys) or df.empty or MAPPING_KEY not in df.columns:
+            return df
+        pos = self.keys.get_indexer(key_text(df[MAPPING_KEY]))
+        hit = pos >= 0
+        if not hit.any():
+            return df
+        for col, values in self.values.items():
+            if col not in df.columns:
+                continue
+            take = hit & _blank(df[col])
+            if not take.any():
+                continue
+            filled = df[col].to_numpy(dtype=object, copy=True)
+            filled[take] = values[pos[take]]
+            df[col] = filled
+        return df
+
+
+_EMPTY = RegionMapping("", pd.Index([], dtype=object), {col: np.array([], dtype=object) for col in ENRICHED_COLUMNS})
+_lock = threading.Lock()
+_cached = _EMPTY
+
+
+def load_mapping() -> RegionMapping:
+    """Tabela de filiais, relida do banco só quando a assinatura dela muda."""
+    global _cached
+    with Session(order_data_engine) as session:
+        version = order_mapping_repository.mapping_version(session)
+        with _lock:
+            if _cached.version == version:
+                return _cached
+        rows = order_mapping_repository.list_mappings(session)
+    mapping = _build(version, rows)
+    with _lock:
+        _cached = mapping
+    return mapping
+
+
+def _build(version: str, rows: List[tuple]) -> RegionMapping:
+    if not rows:
+        return RegionMapping(version, _EMPTY.keys, _EMPTY.values)
+    columns = list(zip(*rows))
+    values = {col: np.array(columns[i + 1], dtype=object) for i, col in enumerate(ENRICHED_COLUMNS)}
+    return RegionMapping(version, pd.Index(columns[0], dtype=object), values)
+
+
+def import_mapping_file(file_path: str) -> int:
+    """Substitui a tabela de filiais pelo conteúdo da planilha; devolve quantas filiais entraram."""
+    chunks = list(iter_chunks(file_path, CHUNK_SIZE, MAPPING_CONTRACT))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if MAPPING_KEY not in df.columns:
+        raise ValueError(f"A planilha precisa da coluna '{MAPPING_KEY}'.")
+    df = df.reindex(columns=MAPPING_CONTRACT.columns)
+    df[MAPPING_KEY] = key_text(df[MAPPING_KEY])
+    df["Cód. Região"] = key_text(df["Cód. Região"])
+    df = df.loc[~_blank(df[MAPPING_KEY])].drop_duplicates(MAPPING_KEY, keep="last")
+    records = []
+    for row in df.itertuples(index=False, name=None):
+        key, *rest = row
+        data = {"filial_contabil": key}
+        for attr, value in zip(_ATTRS, rest):
+            data[attr] = None if pd.isna(value) or not str(value).strip() else str(value).strip()
+        records.append(data)
+    with Session(order_data_engine) as session:
+        return order_mapping_repository.replace_mappings(session, records)
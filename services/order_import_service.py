@@ -0,0 +1,659 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from sqlmodel import Session
+
+from db.order_config import order_data_engine, order_request_engine
+from repositories import order_fingerprint_repository, order_repository
+from services import import_cache
+from services.frame_io import HAS_PYARROW, compact_text_columns, frame_from_arrow_file, frame_to_arrow_file
+from services.order_enrichment import RegionMapping, load_mapping
+from services.order_readers import CHUNK_SIZE, SHEET_COLUMN, row_estimate, tag_sheet
+from services.row_hash import ROW_HASH_COLUMN, add_row_hash, current_hashes
+from services.order_validation import DATE_COLUMNS, ImportValidationError, ImportValidator, ValidationReport
+from services.senha167_service import AdicionarOrdensNovas2
+from services.senha171_service import AdicionarOrdensNovas
+
+STAGE_READING = "Lendo planilha"
+STAGE_VALIDATING = "Validando dados"
+STAGE_NORMALIZING = "Normalizando dados"
+STAGE_DEADLINES = "Calculando prazos"
+STAGE_ENRICHING = "Completando região e gerência"
+STAGE_PREVIEW = "Montando prévia"
+STAGE_CACHE = "Carregando do cache"
+STAGE_FILES = "Processando arquivos"
+STAGE_SHEETS = "Procurando abas"
+
+# Tamanho do primeiro bloco quando há prévia parcial: poucas linhas, para aparecerem logo.
+PREVIEW_ROWS = 500
+STAGE_MERGING = "Consolidando arquivos"
+STAGE_DELTA = "Comparando com ordens já cadastradas"
+STAGE_TRANSFER = "Transferindo resultado"
+# Chaves, nos metadados da entrada do cache, do relatório de validação e das repetidas descartadas.
+_CACHE_VALIDATION = "validacao"
+_CACHE_DUPLICATES = "repetidas"
+
+# A partir destas linhas (estimadas, somando os arquivos) a importação manual também
+# roda no pool: a interface segue fluida enquanto outro processo faz o trabalho pesado.
+ISOLATED_MIN_ROWS = 100_000
+# Marca gravada na pasta de transferência para os processos do pool pararem no próximo estágio.
+_CANCEL_MARKER = "cancelado"
+
+ProgressCallback = Callable[[str, int], None]
+CancelCheck = Callable[[], bool]
+# Recebe cada bloco já normalizado, para a prévia ir aparecendo antes do fim.
+ChunkCallback = Callable[[pd.DataFrame], None]
+# (arquivo, aba): unidade de trabalho da importação; aba ``None`` é a leitura padrão.
+Source = Tuple[str, Optional[str]]
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+@dataclass
+class FileReport:
+    file_path: str
+    rows: int
+    seconds: float
+    from_cache: bool = False
+    sheet: str | None = None
+    content_hash: str = ""
+    key_digest: str = ""
+
+
+@dataclass
+class KnownFile:
+    """Arquivo idêntico a um já enviado em outra solicitação."""
+
+    file_path: str
+    request_id: int
+    status: str
+
+
+@dataclass
+class ImportResult:
+    origin: str
+    file_path: str
+    df: pd.DataFrame | None
+    timings: Dict[str, float] = field(default_factory=dict)
+    from_cache: bool = False
+    files: List[FileReport] = field(default_factory=list)
+    duplicates: int = 0
+    skipped_existing: int = 0
+    validation: ValidationReport | None = None
+    sheet: str | None = None
+    known_files: List[KnownFile] = field(default_factory=list)
+    # Solicitação pendente que já contém todas as ordens da prévia.
+    covering_request: int | None = None
+    # Linhas por situação frente à tabela de ordens (order_repository.ROW_*).
+    diff: Dict[str, int] = field(default_factory=dict)
+    # Arquivo Arrow IPC com o ``df`` gravado pelo processo do pool (``df`` vem vazio).
+    transfer_path: str | None = None
+
+
+def _chunk_writer(chunk_dir: str) -> ChunkCallback:
+    """Grava cada bloco em ``chunk_dir`` como ``00000.arrow``, ``00001.arrow``...
+
+    O arquivo só aparece com o nome final depois de completo (``os.replace``),
+    então o processo principal nunca lê um bloco pela metade.
+    """
+    count = [0]
+
+    def write(df: pd.DataFrame) -> None:
+        path = os.path.join(chunk_dir, f"{count[0]:05d}.arrow")
+        frame_to_arrow_file(df, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        count[0] += 1
+
+    return write
+
+
+def _import_file(
+    origin: str,
+    file_path: str,
+    use_cache: bool,
+    sheet: str | None = None,
+    transfer_dir: str | None = None,
+    chunk_dir: str | None = None,
+) -> ImportResult:
+    # Executado nos processos do pool; precisa ser função de módulo para o pickle.
+    cancel_marker = os.path.join(transfer_dir, _CANCEL_MARKER) if transfer_dir is not None else None
+    result = OrderImportService(origin, use_cache=use_cache).run(
+        file_path,
+        sheet=sheet,
+        is_cancelled=(lambda: os.path.exists(cancel_marker)) if cancel_marker is not None else None,
+        on_chunk=_chunk_writer(chunk_dir) if chunk_dir is not None else None,
+    )
+    if transfer_dir is not None and result.df is not None:
+        # A prévia volta por arquivo mapeado em memória em vez de ir inteira no pickle do resultado.
+        started = time.perf_counter()
+        path = os.path.join(transfer_dir, f"{os.getpid()}-{time.perf_counter_ns()}.arrow")
+        frame_to_arrow_file(result.df, path)
+        result.df, result.transfer_path = None, path
+        result.timings[STAGE_TRANSFER] = time.perf_counter() - started
+    return result
+
+
+def _receive(result: ImportResult) -> ImportResult:
+    """Carrega no processo atual o ``df`` que ``_import_file`` deixou em arquivo."""
+    if result.transfer_path is None:
+        return result
+    started = time.perf_counter()
+    result.df = frame_from_arrow_file(result.transfer_path)
+    try:
+        os.remove(result.transfer_path)
+    except OSError:
+        pass  # a pasta temporária inteira é removida no fim do pool
+    result.transfer_path = None
+    result.timings[STAGE_TRANSFER] = result.timings.get(STAGE_TRANSFER, 0.0) + time.perf_counter() - started
+    return result
+
+
+def _receive_chunks(chunk_dir: str, start: int) -> Tuple[List[pd.DataFrame], int]:
+    """Blocos que o processo do pool já terminou de gravar, em ordem, a partir do número ``start``."""
+    frames = []
+    while True:
+        path = os.path.join(chunk_dir, f"{start:05d}.arrow")
+        if not os.path.exists(path):
+            return frames, start
+        frames.append(frame_from_arrow_file(path))
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        start += 1
+
+
+def prefers_isolation(file_paths: Iterable[str]) -> bool:
+    """Se a importação manual de ``file_paths`` deve rodar no pool (ver ``ISOLATED_MIN_ROWS``)."""
+    total = 0
+    for path in file_paths:
+        try:
+            total += row_estimate(path) or 0
+        except Exception:  # noqa: BLE001 - o erro de leitura aparece na importação, com o nome do arquivo
+            continue
+        if total >= ISOLATED_MIN_ROWS:
+            return True
+    return False
+
+
+def _file_report(result: ImportResult) -> FileReport:
+    df = result.df
+    rows = 0 if df is None else len(df.index)
+    digest = key_digest(order_keys(df)) if rows else ""
+    return FileReport(
+        result.file_path, rows, sum(result.timings.values()), result.from_cache, result.sheet, key_digest=digest
+    )
+
+
+def source_name(file_path: str, sheet: str | None) -> str:
+    name = Path(file_path).name
+    return f"{name} [{sheet}]" if sheet is not None else name
+
+
+def _named_error(exc: ImportValidationError, name: str) -> ImportValidationError:
+    # Com vários arquivos/abas, o erro fatal precisa dizer de onde veio.
+    for issue in exc.report.issues:
+        issue.file = issue.file or name
+    return ImportValidationError(exc.report)
+
+
+def order_keys(df: pd.DataFrame) -> pd.Series:
+    # Mesma chave do staging/aprovação: texto sem espaços nas pontas.
+    return df["Nro Ordem"].map(str).str.strip()
+
+
+def key_digest(keys: Iterable[str]) -> str:
+    """Hash do conjunto de chaves: não depende da ordem nem de repetições."""
+    digest = hashlib.sha256()
+    for key in sorted(set(keys)):
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def merge_frames(frames: Iterable[pd.DataFrame]) -> tuple[pd.DataFrame | None, int]:
+    """Concatena na ordem recebida; "Nro Ordem" repetido fica com a última ocorrência."""
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return None, 0
+    df = pd.concat(frames, ignore_index=True)
+    dup = order_keys(df).duplicated(keep="last").to_numpy()
+    return df.loc[~dup], int(dup.sum())
+
+
+class OrderImportService:
+    """Pipeline de importação das planilhas de ordens (Senha 167 / Senha 171).
+
+    Pensado para rodar fora da thread da interface: informa o estágio atual por
+    ``progress`` e verifica ``is_cancelled`` entre um estágio e outro. Com
+    ``isolated``, ``run_many`` transforma até um arquivo só num processo do pool,
+    para o pandas não disputar o GIL com a interface; ``prefers_isolation`` diz
+    quando vale a pena numa importação manual. Os blocos da prévia voltam do pool
+    em arquivos Arrow, à medida que ficam prontos.
+    """
+
+    def __init__(self, origin: str, use_cache: bool = True, isolated: bool = False) -> None:
+        self.origin = origin
+        self.is_167 = "167" in origin
+        self.use_cache = use_cache and import_cache.HAS_PYARROW
+        self.isolated = isolated
+        # Chaves do arquivo já consultadas nesta importação e, das aprovadas, o hash; ver ``_approved_hashes``.
+        self._checked: set = set()
+        self._approved: Dict[str, str | None] = {}
+
+    @property
+    def category_columns(self) -> tuple:
+        return (AdicionarOrdensNovas2 if self.is_167 else AdicionarOrdensNovas).CATEGORY_COLUMNS + (SHEET_COLUMN,)
+
+    def _helper(self, file_path: str):
+        return AdicionarOrdensNovas2(file_path) if self.is_167 else AdicionarOrdensNovas(file_path)
+
+    def _relevant_rows(self, helper, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Só as linhas que a normalização mantém; as descartadas não entram na validação."""
+        return helper.rules.filter(chunk)
+
+    def _process_chunk(
+        self, helper, chunk: pd.DataFrame, stage, mapping: RegionMapping | None = None
+    ) -> pd.DataFrame | None:
+        stage(STAGE_NORMALIZING)
+        if not self.is_167:
+            out = helper.Manipular_Dados(df=chunk)
+            return out if isinstance(out, pd.DataFrame) else None
+        out = helper.normalizar(chunk)
+        if out.empty:
+            return out
+        stage(STAGE_DEADLINES)
+        out = helper.calcular_prazos(out)
+        if mapping is not None:
+            stage(STAGE_ENRICHING)
+            mapping.enrich(out)
+        return out
+
+    def run(
+        self,
+        file_path: str,
+        progress: ProgressCallback | None = None,
+        is_cancelled: CancelCheck | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        sheet: str | None = None,
+        on_chunk: ChunkCallback | None = None,
+    ) -> ImportResult:
+        """Lê e transforma a planilha (ou a aba ``sheet``) bloco a bloco, com a memória limitada ao bloco atual.
+
+        ``on_chunk`` recebe cada bloco normalizado assim que fica pronto; com ele,
+        o primeiro bloco tem só ``PREVIEW_ROWS`` linhas.
+        "Nro Ordem" repetido fica com a última ocorrência (``result.duplicates`` conta as descartadas).
+        """
+        result = ImportResult(origin=self.origin, file_path=str(file_path), df=None, sheet=sheet)
+        helper = self._helper(file_path)
+        state = {"stage": None, "started": time.perf_counter(), "percent": 0}
+
+        def stage(name: str | None, percent: int | None = None) -> None:
+            now = time.perf_counter()
+            if state["stage"] is not None:
+                result.timings[state["stage"]] = result.timings.get(state["stage"], 0.0) + now - state["started"]
+            state["stage"], state["started"] = name, now
+            if is_cancelled is not None and is_cancelled():
+                raise ImportCancelled()
+            if percent is not None:
+                state["percent"] = percent
+            if progress is not None and name is not None:
+                progress(name, state["percent"])
+
+        # Lida uma vez por arquivo; a versão entra na chave do cache, que vence quando a tabela muda.
+        mapping = load_mapping() if self.is_167 else None
+        key = None
+        if self.use_cache:
+            stage(STAGE_CACHE, 0)
+            try:
+                key = import_cache.cache_key(self.origin, file_path, sheet, mapping.version if mapping else "")
+                cached = import_cache.load(key)
+            except OSError:
+                cached = None
+            if cached is not None:
+                cached, meta = cached
+                if self.is_167 and not cached.empty:
+                    # "Dias a Vencer" depende da data de hoje, não do arquivo.
+                    helper.atualizar_dias_a_vencer(cached)
+                result.df = cached if not cached.empty else None
+                result.from_cache = True
+                # Os avisos da primeira leitura (linhas inválidas, datas) valem para o mesmo arquivo.
+                if _CACHE_VALIDATION in meta:
+                    result.validation = ValidationReport.from_json(meta[_CACHE_VALIDATION])
+                result.duplicates = int(meta.get(_CACHE_DUPLICATES, 0))
+                stage(None)
+                return result
+
+        try:
+            total = row_estimate(file_path, sheet)
+        except Exception:
+            total = None
+
+        stage(STAGE_READING, 0)
+        validator = ImportValidator(self.origin)
+        parts = []
+        rows_read = 0
+        first_chunk = PREVIEW_ROWS if on_chunk is not None else None
+        for chunk in helper.iter_frames(chunk_size, sheet, first_chunk):
+            rows_read += len(chunk.index)
+            if total:
+                stage(STAGE_READING, min(90, int(rows_read * 90 / total)))
+            # Cabeçalho errado interrompe já no primeiro bloco, antes de normalizar qualquer coisa.
+            stage(STAGE_VALIDATING)
+            # O bloco validado já traz as datas convertidas; a normalização reaproveita.
+            chunk = validator.check_chunk(self._relevant_rows(helper, chunk))
+            out = self._process_chunk(helper, chunk, stage, mapping)
+            if out is not None and not out.empty:
+                add_row_hash(out, helper.HASH_COLUMNS, DATE_COLUMNS["167" if self.is_167 else "171"])
+                parts.append(out)
+                if on_chunk is not None:
+                    on_chunk(out)
+            stage(STAGE_READING)
+
+        stage(STAGE_VALIDATING)
+        report = validator.report()
+        report.seconds = result.timings.get(STAGE_VALIDATING, 0.0)
+        if report.fatal:
+            raise ImportValidationError(report)
+        result.validation = report
+
+        stage(STAGE_PREVIEW, 90)
+        # "Nro Ordem" repetido no arquivo: vale a última ocorrência, como entre arquivos e no staging.
+        df, result.duplicates = merge_frames(parts)
+        # category só depois de juntar os blocos: concat de categorias diferentes volta a ser object.
+        result.df = compact_text_columns(df, self.category_columns) if df is not None else None
+        if key is not None:
+            try:
+                import_cache.store(
+                    key,
+                    result.df if result.df is not None else pd.DataFrame(),
+                    {_CACHE_VALIDATION: report.to_json(), _CACHE_DUPLICATES: str(result.duplicates)},
+                )
+            except Exception:  # noqa: BLE001 - cache é só atalho, a importação segue
+                pass
+        stage(None)
+        return result
+
+    def run_many(
+        self,
+        file_paths: Iterable[str],
+        progress: ProgressCallback | None = None,
+        is_cancelled: CancelCheck | None = None,
+        max_workers: int | None = None,
+        on_chunk: ChunkCallback | None = None,
+    ) -> ImportResult:
+        """Importa vários arquivos em paralelo (um processo por núcleo) e junta tudo numa prévia só.
+
+        Os arquivos são ordenados pelo caminho antes de juntar, então a regra de
+        "última ocorrência vence" para ordens repetidas não depende de qual
+        processo terminou primeiro. Arquivos idênticos a um já enviado são
+        reconhecidos pelo hash, antes de qualquer leitura, e ficam de fora.
+
+        ``on_chunk`` recebe as ordens novas de cada bloco (ou de cada arquivo, no
+        pool) à medida que saem; a prévia definitiva é o ``df`` do resultado.
+        """
+        paths = sorted({str(Path(p)) for p in file_paths}, key=str.casefold)
+        hashes = self._content_hashes(paths)
+        known = self._known_files(hashes)
+        todo = [path for path in paths if path not in known]
+        if todo:
+            result = self._run_paths(todo, progress, is_cancelled, max_workers, on_chunk)
+        else:
+            result = ImportResult(origin=self.origin, file_path=paths[-1], df=None)
+            if progress is not None:
+                progress(STAGE_PREVIEW, 100)
+        result.known_files = [known[path] for path in paths if path in known]
+        for report in result.files:
+            report.content_hash = hashes.get(report.file_path, "")
+        if result.df is not None and not result.df.empty:
+            result.covering_request = self._covering_request(result)
+        return result
+
+    def _covering_request(self, result: ImportResult) -> int | None:
+        """Solicitação pendente que já tem todas as ordens da prévia.
+
+        Atalho pelo índice de ``key_digest``: se cada arquivo tem o mesmo conjunto de
+        chaves de um arquivo já enviado na mesma solicitação pendente, é ela. Senão,
+        a contagem por solicitação no SQLite decide (cobre subconjuntos).
+        """
+        digests = [report.key_digest for report in result.files]
+        with Session(order_request_engine) as session:
+            if digests and all(digests):
+                found = order_fingerprint_repository.find_by_key_digests(session, self.origin, digests)
+                requests = {found.get(digest) for digest in digests}
+                if len(requests) == 1 and None not in requests:
+                    return requests.pop()
+            return order_fingerprint_repository.find_covering_request(
+                session, self.origin, order_keys(result.df).unique().tolist()
+            )
+
+    @staticmethod
+    def _content_hashes(paths: List[str]) -> Dict[str, str]:
+        hashes = {}
+        for path in paths:
+            try:
+                hashes[path] = import_cache.file_digest(path)
+            except OSError:
+                hashes[path] = ""  # o erro de leitura aparece na importação, com o nome do arquivo
+        return hashes
+
+    def _known_files(self, hashes: Dict[str, str]) -> Dict[str, KnownFile]:
+        with Session(order_request_engine) as session:
+            found = order_fingerprint_repository.find_by_hashes(session, self.origin, hashes.values())
+        return {
+            path: KnownFile(path, *found[digest]) for path, digest in hashes.items() if digest in found
+        }
+
+    def _sources(self, paths: List[str], progress: ProgressCallback | None) -> List[Source]:
+        """Uma parte por aba compatível de cada planilha; ``None`` na aba lê a primeira."""
+        if progress is not None:
+            progress(STAGE_SHEETS, 0)
+        sources: List[Source] = []
+        for path in paths:
+            try:
+                sheets = self._helper(path).sheets()
+            except Exception:  # noqa: BLE001 - o erro de leitura aparece na importação, com o nome do arquivo
+                sheets = []
+            sources.extend((path, sheet) for sheet in sheets or [None])
+        return sources
+
+    def _publisher(self, on_chunk: ChunkCallback | None, sheet: str | None) -> ChunkCallback | None:
+        """Repassa a ``on_chunk`` só as ordens ainda não cadastradas, já marcadas com a aba."""
+        if on_chunk is None:
+            return None
+
+        def publish(df: pd.DataFrame) -> None:
+            if df is None or df.empty:
+                return
+            keys = order_keys(df)
+            fresh = df.loc[self._approved_hashes(keys).index.get_indexer(keys) < 0]
+            if fresh.empty:
+                return
+            on_chunk(tag_sheet(fresh, sheet) if sheet is not None else fresh)
+
+        return publish
+
+    def _approved_hashes(self, keys: pd.Series) -> pd.Series:
+        """Das ``keys``, as já aprovadas (chave -> hash); só as chaves ainda não vistas vão ao banco.
+
+        Cada chave do arquivo é consultada uma vez por importação: os blocos da prévia
+        e ``drop_existing`` reaproveitam o que já foi lido.
+        """
+        unique = keys.unique().tolist()
+        missing = [key for key in unique if key not in self._checked]
+        if missing:
+            with Session(order_data_engine) as session:
+                found = order_repository.approved_row_hashes(session, self.origin, missing)
+            # Hash de versão anterior do algoritmo não é comparável: a ordem conta como "sem hash".
+            self._approved.update(current_hashes(found).items())
+            self._checked.update(missing)
+        approved = [key for key in unique if key in self._approved]
+        return pd.Series(
+            [self._approved[key] for key in approved], index=pd.Index(approved, dtype=object), dtype=object
+        )
+
+    def _run_paths(self, paths, progress, is_cancelled, max_workers, on_chunk=None) -> ImportResult:
+        # Consulta às aprovadas por importação: serve aos blocos da prévia e a ``drop_existing``.
+        self._checked = set()
+        self._approved = {}
+        sources = self._sources(paths, progress)
+        if len(sources) == 1 and not self.isolated:
+            path, sheet = sources[0]
+            result = self.run(
+                path, progress=progress, is_cancelled=is_cancelled, sheet=sheet, on_chunk=self._publisher(on_chunk, sheet)
+            )
+            # Aba única que não é a primeira: a prévia mostra de onde as ordens vieram.
+            if sheet is not None and result.df is not None:
+                tag_sheet(result.df, sheet)
+            result.files = [_file_report(result)]
+            return self.drop_existing(result, progress)
+
+        started = time.perf_counter()
+        results: Dict[Source, ImportResult] = {}
+        workers = max(1, min(len(sources), max_workers or os.cpu_count() or 1))
+        if workers == 1 and not self.isolated:
+            self._run_sequential(sources, results, progress, is_cancelled, on_chunk)
+        else:
+            self._run_pool(sources, results, workers, progress, is_cancelled, on_chunk)
+
+        if progress is not None:
+            progress(STAGE_MERGING, 90)
+        ordered = [results[source] for source in sources]
+        for res in ordered:
+            if res.sheet is not None and res.df is not None:
+                tag_sheet(res.df, res.sheet)
+        df, duplicates = merge_frames(res.df for res in ordered)
+        if df is not None:
+            df = compact_text_columns(df, self.category_columns)
+        result = ImportResult(
+            origin=self.origin,
+            file_path=paths[-1],
+            df=df,
+            files=[_file_report(res) for res in ordered],
+            duplicates=duplicates + sum(res.duplicates for res in ordered),
+            validation=ValidationReport.merge(
+                (source_name(res.file_path, res.sheet), res.validation) for res in ordered if res.validation is not None
+            ),
+        )
+        result.timings[STAGE_FILES] = time.perf_counter() - started
+        transfer = sum(res.timings.get(STAGE_TRANSFER, 0.0) for res in ordered)
+        if transfer:
+            result.timings[STAGE_TRANSFER] = transfer
+        return self.drop_existing(result, progress)
+
+    def drop_existing(self, result: ImportResult, progress: ProgressCallback | None = None) -> ImportResult:
+        """Deixa na prévia só as ordens que ainda não estão em orders_167/orders_171.
+
+        As demais são contadas como alteradas ou iguais pelo hash da linha
+        (``result.diff``), contra as mesmas consultas às aprovadas usadas nos
+        blocos da prévia. Fica fora de ``run`` (e do cache) porque depende do que já foi aprovado.
+        """
+        df = result.df
+        if df is not None and not df.empty:
+            if progress is not None:
+                progress(STAGE_DELTA, 95)
+            started = time.perf_counter()
+            keys = order_keys(df)
+            row_status = pd.Series(
+                order_repository.classify_rows(self._approved_hashes(keys), keys, df[ROW_HASH_COLUMN])
+            )
+            result.diff = {name: int(count) for name, count in row_status.value_counts().items()}
+            is_new = row_status.eq(order_repository.ROW_NEW).to_numpy()
+            result.skipped_existing = int((~is_new).sum())
+            result.df = df.loc[is_new] if result.skipped_existing else df
+            result.timings[STAGE_DELTA] = time.perf_counter() - started
+        if progress is not None:
+            progress(STAGE_PREVIEW, 100)
+        return result
+
+    def _run_sequential(self, sources, results, progress, is_cancelled, on_chunk=None) -> None:
+        for path, sheet in sources:
+            if is_cancelled is not None and is_cancelled():
+                raise ImportCancelled()
+            try:
+                results[(path, sheet)] = self.run(
+                    path, is_cancelled=is_cancelled, sheet=sheet, on_chunk=self._publisher(on_chunk, sheet)
+                )
+            except ImportCancelled:
+                raise
+            except ImportValidationError as exc:
+                raise _named_error(exc, source_name(path, sheet)) from None
+            except Exception as exc:
+                raise RuntimeError(f"{source_name(path, sheet)}: {exc}") from exc
+            if progress is not None:
+                progress(f"{STAGE_FILES} ({len(results)}/{len(sources)})", int(len(results) * 90 / len(sources)))
+
+    def _run_pool(self, sources, results, workers, progress, is_cancelled, on_chunk=None) -> None:
+        # spawn em todas as plataformas: fork de um processo com Qt e threads não é seguro.
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        transfer_dir = tempfile.mkdtemp(prefix="importacao-") if HAS_PYARROW else None
+        # Blocos da prévia vêm por arquivo, um diretório por parte; sem pyarrow, só o resultado final.
+        stream = on_chunk is not None and transfer_dir is not None
+        chunk_dirs: Dict[Source, str] = {}
+        received: Dict[Source, int] = {}
+        try:
+            futures = {}
+            for index, (path, sheet) in enumerate(sources):
+                chunk_dir = None
+                if stream:
+                    chunk_dir = chunk_dirs[(path, sheet)] = os.path.join(transfer_dir, str(index))
+                    os.mkdir(chunk_dir)
+                    received[(path, sheet)] = 0
+                future = pool.submit(_import_file, self.origin, path, self.use_cache, sheet, transfer_dir, chunk_dir)
+                futures[future] = (path, sheet)
+            pending = set(futures)
+            if progress is not None:
+                progress(f"{STAGE_FILES} (0/{len(sources)})", 0)
+            while pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if is_cancelled is not None and is_cancelled():
+                    raise ImportCancelled()
+                for source in chunk_dirs:
+                    if source not in results:
+                        self._publish_chunks(on_chunk, source, chunk_dirs, received)
+                for future in done:
+                    source = futures[future]
+                    try:
+                        results[source] = _receive(future.result())
+                    except ImportValidationError as exc:
+                        raise _named_error(exc, source_name(*source)) from None
+                    except Exception as exc:
+                        raise RuntimeError(f"{source_name(*source)}: {exc}") from exc
+                    if source in chunk_dirs:
+                        self._publish_chunks(on_chunk, source, chunk_dirs, received)
+                    if not received.get(source):
+                        # Veio do cache (ou sem pyarrow): a parte chega inteira, de uma vez.
+                        publish = self._publisher(on_chunk, source[1])
+                        if publish is not None:
+                            publish(results[source].df)
+                if done and progress is not None:
+                    progress(f"{STAGE_FILES} ({len(results)}/{len(sources)})", int(len(results) * 90 / len(sources)))
+        except BaseException:
+            if transfer_dir is not None:
+                # Os processos ainda rodando param no próximo estágio, antes de a pasta sumir.
+                Path(transfer_dir, _CANCEL_MARKER).touch()
+            raise
+        finally:
+            # Espera os processos terminarem: nenhum grava mais na pasta quando ela é removida.
+            pool.shutdown(wait=True, cancel_futures=True)
+            if transfer_dir is not None:
+                shutil.rmtree(transfer_dir, ignore_errors=True)
+
+    def _publish_chunks(self, on_chunk, source: Source, chunk_dirs, received) -> None:
+        frames, received[source] = _receive_chunks(chunk_dirs[source], received[source])
+        publish = self._publisher(on_chunk, source[1])
+        for frame in frames:
+            publish(frame)
@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import codecs
+import zipfile
+from operator import itemgetter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.frame_io import HAS_PYARROW
+
+CHUNK_SIZE = 5000
+# Coluna acrescentada à prévia quando a planilha tem várias abas do mesmo fluxo.
+SHEET_COLUMN = "Aba de Origem"
+
+
+@dataclass(frozen=True)
+class ColumnContract:
+    """Colunas que um fluxo consome; as demais colunas do arquivo nem viram DataFrame.
+
+    ``text_columns`` são montadas direto como object, sem inferência de tipo;
+    ``required`` decide quais abas de uma planilha pertencem ao fluxo.
+    """
+
+    columns: Tuple[str, ...]
+    text_columns: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+
+    def select(self, header: Sequence[str]) -> List[str]:
+        wanted = set(self.columns)
+        return [name for name in header if name in wanted]
+
+    def matches(self, header: Sequence[str]) -> bool:
+        present = set(header)
+        if self.required:
+            return all(name in present for name in self.required)
+        return any(name in present for name in self.columns)
+
+
+def _header_names(row) -> List[str]:
+    """Nomeia as colunas como o ``pd.read_excel``: vazias viram "Unnamed: n", repetidas ganham ".1"."""
+    names: List[str] = []
+    seen: dict = {}
+    for idx, val in enumerate(row):
+        name = f"Unnamed: {idx}" if val is None else str(val)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _cell_text(v):
+    if v is None or isinstance(v, str):
+        return v
+    if v is pd.NA or v is pd.NaT:
+        return None  # coluna anulável (Int64, datas) do Parquet
+    if isinstance(v, float):
+        if v != v:
+            return None
+        if v.is_integer():
+            return str(int(v))  # 90066.0 de uma coluna numérica com vazios
+    return str(v)
+
+
+def _text(values) -> np.ndarray:
+    # Como o CSV lido com dtype=str: número 90066 vira "90066", e nada de int num bloco e float no outro.
+    return np.array([_cell_text(v) for v in values], dtype=object)
+
+
+def _as_text(df: pd.DataFrame, text_columns: Sequence[str]) -> pd.DataFrame:
+    """Colunas de texto do contrato que o leitor entregou tipadas (Parquet, ODS) viram texto (altera ``df``).
+
+    Vazio vira NaN, como no XLSX e no CSV, também nas colunas que já eram texto (o pyarrow entrega None).
+    """
+    for name in text_columns:
+        if name not in df.columns:
+            continue
+        text = df[name]
+        if text.dtype != object:
+            text = pd.Series(_text(text.astype(object).tolist()), index=df.index)
+        df[name] = text.where(text.notna(), np.nan)
+    return df
+
+
+def _frame(buffer: list, columns: List[str], start: int, text_columns: Sequence[str] = ()) -> pd.DataFrame:
+    index = pd.RangeIndex(start, start + len(buffer))
+    if text_columns:
+        text = set(text_columns)
+        data = {
+            name: _text(values) if name in text else list(values)
+            for name, values in zip(columns, zip(*buffer))
+        }
+        df = pd.DataFrame(data, columns=columns, index=index)
+    else:
+        df = pd.DataFrame(buffer, columns=columns, index=index)
+    obj = df.select_dtypes(include="object").columns
+    if len(obj):
+        # Células vazias chegam como None; o read_excel as entrega como NaN.
+        df[obj] = df[obj].where(df[obj].notna(), np.nan)
+    return df
+
+
+def _worksheet(wb, sheet: str | None):
+    return wb.worksheets[0] if sheet is None else wb[sheet]
+
+
+def xlsx_row_estimate(file_path: str, sheet: str | None = None) -> int | None:
+    """Total de linhas segundo as dimensões gravadas na planilha (pode faltar ou estar errado)."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        max_row = _worksheet(wb, sheet).max_row
+        return max_row - 1 if max_row else None
+    finally:
+        wb.close()
+
+
+def xlsx_sheets(file_path: str, contract: ColumnContract | None = None) -> List[str]:
+    """Abas cujo cabeçalho atende ao ``contract``, na ordem da pasta de trabalho.
+
+    Planilha de uma aba só, ou sem nenhuma aba compatível, devolve lista vazia:
+    a leitura segue pela primeira aba, como antes, e a validação aponta o que faltar.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if len(wb.sheetnames) < 2:
+            return []
+        found = []
+        for ws in wb.worksheets:
+            header = next(ws.iter_rows(max_row=1, values_only=True), None)
+            if header and (contract is None or contract.matches(_header_names(header))):
+                found.append(ws.title)
+        return found if len(found) > 1 or (found and found[0] != wb.sheetnames[0]) else []
+    finally:
+        wb.close()
+
+
+def tag_sheet(df: pd.DataFrame, sheet: str) -> pd.DataFrame:
+    """Marca as linhas com a aba de origem, como primeira coluna (altera ``df``)."""
+    if SHEET_COLUMN in df.columns:
+        df[SHEET_COLUMN] = sheet
+    else:
+        df.insert(0, SHEET_COLUMN, sheet)
+    return df
+
+
+def iter_xlsx_chunks(
+    file_path: str,
+    chunk_size: int = CHUNK_SIZE,
+    contract: ColumnContract | None = None,
+    sheet: str | None = None,
+    first_chunk: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Lê uma aba (a primeira, sem ``sheet``) em modo streaming, em DataFrames de até ``chunk_size`` linhas.
+
+    Só um bloco de linhas fica em memória por vez. Linhas totalmente vazias são
+    ignoradas e o índice segue numerando as demais em sequência entre os blocos.
+    Com ``contract``, só as colunas pedidas são copiadas de cada linha; com
+    ``first_chunk``, o primeiro bloco é menor, para a prévia aparecer logo.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = _worksheet(wb, sheet)
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = _header_names(header)
+        width = len(names)
+        columns = contract.select(names) if contract is not None else names
+        positions = [names.index(name) for name in columns]
+        pick = itemgetter(*positions) if len(positions) > 1 else (lambda r: tuple(r[i] for i in positions))
+        text_columns = contract.text_columns if contract is not None else ()
+        buffer: list = []
+        start = 0
+        limit = first_chunk or chunk_size
+        for row in rows:
+            if all(val is None for val in row):
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            buffer.append(pick(row))
+            if len(buffer) >= limit:
+                yield _frame(buffer, columns, start, text_columns)
+                start += len(buffer)
+                buffer = []
+                limit = chunk_size
+        if buffer:
+            yield _frame(buffer, columns, start, text_columns)
+    finally:
+        wb.close()
+
+
+def _slices(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df.index), chunk_size):
+        yield df.iloc[start : start + chunk_size]
+
+
+def _csv_encoding(file_path: str) -> str:
+    with open(file_path, "rb") as fh:
+        head = fh.read(64 * 1024)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8-sig" if head.startswith(codecs.BOM_UTF8) else "utf-8"
+
+
+def _csv_separator(file_path: str, encoding: str) -> str:
+    """Escolhe o separador mais frequente no cabeçalho (exportações em pt-BR usam ";")."""
+    with open(file_path, "r", encoding=encoding, errors="replace") as fh:
+        header = fh.readline()
+    return max((";", ",", "\t", "|"), key=header.count)
+
+
+def iter_csv_chunks(
+    file_path: str,
+    chunk_size: int = CHUNK_SIZE,
+    contract: ColumnContract | None = None,
+    first_chunk: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Lê o CSV em blocos de ``chunk_size`` linhas, sem carregar o arquivo inteiro.
+
+    O engine pyarrow não lê em pedaços; o engine C lê, e mantém o índice contínuo entre os blocos.
+    """
+    encoding = _csv_encoding(file_path)
+    sep = _csv_separator(file_path, encoding)
+    usecols = None
+    dtype = None
+    if contract is not None:
+        header = pd.read_csv(file_path, sep=sep, encoding=encoding, nrows=0).columns
+        usecols = contract.select(list(header))
+        # Texto como está no arquivo: "00123" mantém os zeros e um bloco com vazios não vira "123.0".
+        dtype = {name: str for name in contract.text_columns if name in usecols}
+    with pd.read_csv(
+        file_path, sep=sep, encoding=encoding, engine="c", usecols=usecols, dtype=dtype, chunksize=chunk_size
+    ) as reader:
+        if first_chunk:
+            try:
+                yield reader.get_chunk(first_chunk)
+            except StopIteration:
+                return
+        yield from reader
+
+
+def _require_pyarrow(fmt: str) -> None:
+    if not HAS_PYARROW:
+        raise RuntimeError(f"Leitura de {fmt} requer o pacote pyarrow.")
+
+
+def iter_parquet_chunks(
+    file_path: str, chunk_size: int = CHUNK_SIZE, contract: ColumnContract | None = None
+) -> Iterator[pd.DataFrame]:
+    _require_pyarrow("Parquet")
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file_path)
+    columns = contract.select(pf.schema_arrow.names) if contract is not None else None
+    start = 0
+    for batch in pf.iter_batches(batch_size=chunk_size, columns=columns):
+        df = batch.to_pandas()
+        if contract is not None:
+            _as_text(df, contract.text_columns)
+        df.index = pd.RangeIndex(start, start + len(df.index))
+        start += len(df.index)
+        yield df
+
+
+def parquet_row_estimate(file_path: str) -> int | None:
+    _require_pyarrow("Parquet")
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(file_path).metadata.num_rows
+
+
+def iter_ods_chunks(
+    file_path: str, chunk_size: int = CHUNK_SIZE, contract: ColumnContract | None = None
+) -> Iterator[pd.DataFrame]:
+    usecols = (lambda name: name in contract.columns) if contract is not None else None
+    try:
+        df = pd.read_excel(file_path, engine="odf", usecols=usecols)
+    except ImportError as exc:
+        raise RuntimeError("Leitura de ODS requer o pacote odfpy.") from exc
+    if contract is not None:
+        _as_text(df, contract.text_columns)
+    yield from _slices(df, chunk_size)
+
+
+@dataclass(frozen=True)
+class InputFormat:
+    name: str
+    label: str
+    extensions: Tuple[str, ...]
+    iter_chunks: Callable[..., Iterator[pd.DataFrame]]
+    row_estimate: Callable[..., int | None] | None = None
+    # Formatos com várias abas: lista as abas do fluxo; leitura e estimativa recebem ``sheet``.
+    sheets: Callable[[str, ColumnContract | None], List[str]] | None = None
+    # Aceita ``first_chunk`` (primeiro bloco menor, para a prévia aparecer logo).
+    streams: bool = False
+
+
+FORMATS: Dict[str, InputFormat] = {}
+
+
+def register_format(fmt: InputFormat) -> None:
+    FORMATS[fmt.name] = fmt
+
+
+register_format(
+    InputFormat("xlsx", "Excel", (".xlsx", ".xlsm"), iter_xlsx_chunks, xlsx_row_estimate, xlsx_sheets, streams=True)
+)
+register_format(InputFormat("csv", "CSV", (".csv", ".txt"), iter_csv_chunks, streams=True))
+register_format(InputFormat("parquet", "Parquet", (".parquet", ".pq"), iter_parquet_chunks, parquet_row_estimate))
+register_format(InputFormat("ods", "OpenDocument", (".ods",), iter_ods_chunks))
+
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+# Excel 97-2003 (.xls) e demais arquivos OLE2; o pandas só lê com xlrd, que não é dependência.
+_OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_RESAVE_HINT = "Salve a planilha como .xlsx ou .csv e importe de novo."
+
+
+def _sniff(file_path: str) -> str | None:
+    """Identifica o formato pelo conteúdo; ``None`` quando os bytes iniciais não são conclusivos."""
+    with open(file_path, "rb") as fh:
+        magic = fh.read(8)
+    if magic.startswith(b"PAR1"):
+        return "parquet"
+    if magic == _OLE2_MAGIC:
+        raise UnsupportedFormatError(f"Formato não suportado: Excel 97-2003 (.xls). {_RESAVE_HINT}")
+    if magic.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(file_path) as zf:
+                names = set(zf.namelist())
+                if "mimetype" in names and b"opendocument.spreadsheet" in zf.read("mimetype"):
+                    return "ods"
+                if "xl/workbook.bin" in names:
+                    raise UnsupportedFormatError(f"Formato não suportado: Excel binário (.xlsb). {_RESAVE_HINT}")
+        except zipfile.BadZipFile:
+            return None
+        return "xlsx"
+    return None
+
+
+def detect_format(file_path: str) -> InputFormat:
+    """Assinatura binária primeiro (extensão errada acontece); depois a extensão.
+
+    Sem assinatura conhecida e com extensão fora de ``FORMATS``, levanta
+    ``UnsupportedFormatError`` em vez de tentar ler como CSV.
+    """
+    name = _sniff(file_path)
+    if name is None:
+        ext = Path(file_path).suffix.lower()
+        name = next((fmt.name for fmt in FORMATS.values() if ext in fmt.extensions), None)
+        if name is None:
+            supported = ", ".join(ext for fmt in FORMATS.values() for ext in fmt.extensions)
+            raise UnsupportedFormatError(
+                f"Formato não suportado: '{ext or 'sem extensão'}'. Formatos aceitos: {supported}."
+            )
+    return FORMATS[name]
+
+
+def iter_chunks(
+    file_path: str,
+    chunk_size: int = CHUNK_SIZE,
+    contract: ColumnContract | None = None,
+    sheet: str | None = None,
+    first_chunk: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    fmt = detect_format(file_path)
+    options = {}
+    if sheet is not None:
+        options["sheet"] = sheet
+    if first_chunk and fmt.streams:
+        options["first_chunk"] = first_chunk
+    return fmt.iter_chunks(file_path, chunk_size, contract, **options)
+
+
+def row_estimate(file_path: str, sheet: str | None = None) -> int | None:
+    fmt = detect_format(file_path)
+    if not fmt.row_estimate:
+        return None
+    return fmt.row_estimate(file_path) if sheet is None else fmt.row_estimate(file_path, sheet=sheet)
+
+
+def list_sheets(file_path: str, contract: ColumnContract | None = None) -> List[str]:
+    """Abas do fluxo quando o arquivo tem mais de uma; vazio quando basta a leitura padrão."""
+    fmt = detect_format(file_path)
+    return fmt.sheets(file_path, contract) if fmt.sheets else []
+
+
+def list_supported_files(folder: str) -> List[str]:
+    """Arquivos da pasta (sem subpastas) com extensão de algum formato registrado."""
+    exts = {ext for fmt in FORMATS.values() for ext in fmt.extensions}
+    return sorted(
+        str(path)
+        for path in Path(folder).iterdir()
+        if path.is_file() and path.suffix.lower() in exts and not path.name.startswith("~$")
+    )
+
+
+def file_dialog_filter() -> str:
+    """Filtro do QFileDialog com todos os formatos registrados."""
+    patterns = [f"*{ext}" for fmt in FORMATS.values() for ext in fmt.extensions]
+    parts = [f"Planilhas ({' '.join(patterns)})"]
+    parts += [f"{fmt.label} ({' '.join('*' + ext for ext in fmt.extensions)})" for fmt in FORMATS.values()]
+    return ";;".join(parts)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from db.config import BASE_DIR
+
+# Regras de negócio da importação, editáveis sem nova versão do programa.
+RULES_PATH = BASE_DIR / "data" / "regras_importacao.json"
+
+# Usadas quando o arquivo não existe; mesmo conteúdo do arquivo distribuído.
+DEFAULT_RULES: Dict[str, dict] = {
+    "Senha 167": {
+        "filtros": [{"coluna": "Falta", "op": "preenchido"}],
+        "classificacoes": [
+            {
+                "coluna": "STT",
+                "casos": [{"se": {"coluna": "Valor", "op": "<", "valor": 50}, "valor": "SEM EVIDENCIA"}],
+                "senao": "COM EVIDENCIA",
+            }
+        ],
+    },
+    "Senha 171": {
+        "filtros": [{"coluna": "Tipo Devol.", "op": "em", "valor": ["Devolução CORTE", "Bonificação CORTE"]}],
+        "classificacoes": [],
+    },
+}
+
+_COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+Condition = Callable[[pd.DataFrame], np.ndarray]
+
+
+class RuleError(ValueError):
+    pass
+
+
+def _filled(s: pd.Series) -> pd.Series:
+    return s.notna() & s.astype("string").str.strip().ne("")
+
+
+def _compile_condition(spec: dict) -> Tuple[str, Condition]:
+    """Transforma ``{"coluna", "op", "valor"}`` numa função vetorizada DataFrame -> máscara."""
+    try:
+        column, op = spec["coluna"], spec["op"]
+    except (KeyError, TypeError):
+        raise RuleError(f"Condição sem 'coluna' ou 'op': {spec!r}") from None
+    value = spec.get("valor")
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return column, lambda df: compare(pd.to_numeric(df[column], errors="coerce"), value).to_numpy(dtype=bool)
+        return column, lambda df: compare(df[column].astype("string"), str(value)).fillna(False).to_numpy(dtype=bool)
+    if op in ("em", "fora de"):
+        if not isinstance(value, list):
+            raise RuleError(f"'{op}' precisa de uma lista em 'valor': {spec!r}")
+        allowed = frozenset(value)
+        if op == "em":
+            return column, lambda df: df[column].isin(allowed).to_numpy()
+        return column, lambda df: ~df[column].isin(allowed).to_numpy()
+    if op == "preenchido":
+        return column, lambda df: _filled(df[column]).to_numpy(dtype=bool)
+    if op == "vazio":
+        return column, lambda df: ~_filled(df[column]).to_numpy(dtype=bool)
+    raise RuleError(f"Operador desconhecido '{op}' na coluna '{column}'.")
+
+
+@dataclass(frozen=True)
+class Classification:
+    column: str
+    conditions: Tuple[Condition, ...]
+    choices: Tuple[str, ...]
+    default: str
+
+    def evaluate(self, df: pd.DataFrame) -> np.ndarray:
+        # np.select: vale o primeiro caso verdadeiro, como um if/elif.
+        return np.select([cond(df) for cond in self.conditions], self.choices, default=self.default)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Regras já compiladas de um fluxo; ``digest`` identifica o conteúdo (entra na chave do cache)."""
+
+    filters: Tuple[Tuple[str, Condition], ...]
+    classifications: Tuple[Classification, ...]
+    digest: str
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Linhas que passam em todos os filtros; filtro de coluna ausente não barra nada."""
+        keep = np.ones(len(df.index), dtype=bool)
+        for column, cond in self.filters:
+            if column in df.columns:
+                keep &= cond(df)
+        return keep
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        keep = self.mask(df)
+        return df if keep.all() else df.loc[keep]
+
+    def classify(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Preenche as colunas de classificação (altera ``df``)."""
+        for rule in self.classifications:
+            df[rule.column] = rule.evaluate(df)
+        return df
+
+
+def _compile(origin: str, spec: dict) -> RuleSet:
+    filters = tuple(_compile_condition(cond) for cond in spec.get("filtros", []))
+    classifications = []
+    for rule in spec.get("classificacoes", []):
+        try:
+            cases = rule["casos"]
+            compiled = tuple(_compile_condition(case["se"])[1] for case in cases)
+            classifications.append(
+                Classification(rule["coluna"], compiled, tuple(str(case["valor"]) for case in cases), str(rule["senao"]))
+            )
+        except (KeyError, TypeError):
+            raise RuleError(f"Classificação incompleta em {origin}: {rule!r}") from None
+    payload = json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return RuleSet(filters, tuple(classifications), hashlib.sha256(payload).hexdigest()[:16])
+
+
+@lru_cache(maxsize=8)
+def _compiled(origin: str, path: str, mtime_ns: int, size: int) -> RuleSet:
+    # mtime/tamanho na chave: arquivo editado é lido e compilado de novo.
+    if not path:
+        spec = DEFAULT_RULES.get(origin, {})
+    else:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise RuleError(f"Não foi possível ler as regras de importação ({path}): {exc}") from exc
+        spec = data.get(origin, DEFAULT_RULES.get(origin, {}))
+    return _compile(origin, spec)
+
+
+def load_rules(origin: str) -> RuleSet:
+    """Regras do fluxo ``origin`` (arquivo em ``RULES_PATH`` ou ``DEFAULT_RULES``), compiladas uma vez por versão."""
+    try:
+        st = RULES_PATH.stat()
+    except OSError:
+        return _compiled(origin, "", 0, 0)
+    return _compiled(origin, str(RULES_PATH), st.st_mtime_ns, st.st_size)
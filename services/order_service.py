@@ -1,30 +1,79 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Sequence
 import json
 
+import pandas as pd
 from sqlmodel import Session
 
 from db.order_config import order_request_engine, order_data_engine
 from db.order_models import OrderRequest
-from repositories import order_request_repository, order_pending_repository, order_repository
+from repositories import (
+    order_request_repository,
+    order_pending_repository,
+    order_blob_repository,
+    order_fingerprint_repository,
+    order_repository,
+)
+from services.frame_io import HAS_PYARROW, frame_from_parquet, frame_to_parquet
+from services.order_import_service import order_keys
+
+STAGING_ROWS = "rows"
+STAGING_BLOB = "blob"
 
 
 class OrderService:
-    def submit_request(self, origin: str, df) -> OrderRequest:
+    def __init__(self, staging_mode: str | None = None) -> None:
+        # Por padrão a prévia é guardada como um único blob Parquet por solicitação;
+        # sem pyarrow, cai para o staging linha a linha nas tabelas *_pending.
+        if staging_mode is None:
+            staging_mode = STAGING_BLOB if HAS_PYARROW else STAGING_ROWS
+        if staging_mode == STAGING_BLOB and not HAS_PYARROW:
+            staging_mode = STAGING_ROWS
+        self.staging_mode = staging_mode
+
+    def submit_request(self, origin: str, df, files: Sequence = ()) -> OrderRequest:
+        """Cria a solicitação com a prévia e registra hash e chaves dos ``files`` que a geraram.
+
+        Tudo entra numa única transação: se qualquer passo falhar, nada fica gravado
+        (nem solicitação pendente sem prévia ou sem impressões digitais).
+        """
         total = len(df.index) if hasattr(df, "index") else 0
         desc = f"{total} ordens processadas aguardando confirmação."
+        # Serializa antes de abrir a transação, para não segurar o banco durante a compressão.
+        payload = frame_to_parquet(df) if self.staging_mode == STAGING_BLOB else None
+        keys = order_keys(df).unique().tolist() if total else []
         with Session(order_request_engine) as req_session:
             req = order_request_repository.create_request(
                 req_session,
                 origin=origin,
                 description=desc,
                 total_orders=total,
+                commit=False,
             )
-            order_pending_repository.save_pending(req_session, origin, req.id, df)
+            if payload is not None:
+                order_blob_repository.save_blob(req_session, req.id, payload, total, commit=False)
+            else:
+                order_pending_repository.save_pending(req_session, origin, req.id, df, commit=False)
+            order_fingerprint_repository.save_fingerprints(req_session, req.id, req.origin, files, commit=False)
+            if keys:
+                order_fingerprint_repository.save_keys(req_session, req.id, keys, commit=False)
+            req_session.commit()
             req_session.refresh(req)
             return req
 
+    def load_request_frame(self, request_id: int) -> pd.DataFrame | None:
+        """Devolve a prévia guardada de uma solicitação, seja qual for o modo de staging."""
+        with Session(order_request_engine) as req_session:
+            req = order_request_repository.get_by_id(req_session, request_id)
+            if req is None:
+                return None
+            blob = order_blob_repository.get_by_request(req_session, request_id)
+            if blob is not None:
+                return frame_from_parquet(blob.payload)
+            rows = order_pending_repository.list_by_request(req_session, req.origin, request_id)
+            return pd.DataFrame.from_records(order_pending_repository.rows_to_records(req.origin, rows))
+
     def approve(self, request_id: int, approve: bool) -> None:
         with Session(order_request_engine) as req_session:
             req = order_request_repository.get_by_id(req_session, request_id)
@@ -32,12 +81,18 @@ class OrderService:
                 raise ValueError("Solicitação não encontrada.")
             origin = req.origin
             if not approve:
+                order_blob_repository.delete_by_request(req_session, request_id)
                 order_pending_repository.delete_by_request(req_session, origin, request_id)
+                order_fingerprint_repository.delete_keys(req_session, request_id)
                 order_request_repository.update_status(req_session, req, "recusado")
                 return
 
-            pending_rows = order_pending_repository.list_by_request(req_session, origin, request_id)
-            rows_data = [row.dict() for row in pending_rows]
+            blob = order_blob_repository.get_by_request(req_session, request_id)
+            if blob is not None:
+                rows_data = order_pending_repository.normalize_frame(origin, request_id, frame_from_parquet(blob.payload))
+            else:
+                pending_rows = order_pending_repository.list_by_request(req_session, origin, request_id)
+                rows_data = [row.model_dump() for row in pending_rows]
             order_request_repository.update_status(req_session, req, "aprovado")
 
         if approve:
@@ -45,4 +100,6 @@ class OrderService:
                 order_repository.upsert_orders(data_session, origin, rows_data)
 
             with Session(order_request_engine) as cleanup_session:
+                order_blob_repository.delete_by_request(cleanup_session, request_id)
                 order_pending_repository.delete_by_request(cleanup_session, origin, request_id)
+                order_fingerprint_repository.delete_keys(cleanup_session, request_id)
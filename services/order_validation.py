@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from services.date_parsing import parse_dates
+
+# Colunas sem as quais a importação não faz sentido (nomes da planilha de entrada).
+REQUIRED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "167": ("Nro Ordem", "Data Ordem", "Valor", "Falta"),
+    "171": ("Nro Ordem", "Data Ordem", "Valor"),
+}
+DATE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "167": ("Data Ordem", "Data Fechamento Divergência"),
+    "171": ("Data Ordem", "Data Tratativa"),
+}
+NUMBER_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "167": ("Valor", "Falta"),
+    "171": ("Valor",),
+}
+MIN_YEAR = 2000
+SAMPLE_SIZE = 5
+
+MISSING_COLUMN = "coluna ausente"
+EMPTY_KEY = "Nro Ordem vazio"
+DUPLICATE_KEY = "Nro Ordem repetido"
+BAD_DATE = "data inválida"
+BAD_NUMBER = "número inválido"
+OUT_OF_RANGE = "fora do intervalo"
+
+
+@dataclass
+class ColumnIssue:
+    column: str
+    kind: str
+    count: int
+    rows: List[int] = field(default_factory=list)
+    fatal: bool = False
+    file: str | None = None
+
+    def describe(self) -> str:
+        where = f"{self.file}: " if self.file else ""
+        sample = f" (linhas {', '.join(map(str, self.rows))})" if self.rows else ""
+        return f"{where}{self.column}: {self.kind} - {self.count}{sample}"
+
+
+@dataclass
+class ValidationReport:
+    rows: int = 0
+    issues: List[ColumnIssue] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def fatal(self) -> bool:
+        return any(issue.fatal for issue in self.issues)
+
+    def summary(self, limit: int = 15) -> str:
+        lines = [issue.describe() for issue in self.issues[:limit]]
+        if len(self.issues) > limit:
+            lines.append(f"... e mais {len(self.issues) - limit} problema(s).")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "ValidationReport":
+        data = json.loads(text)
+        issues = [ColumnIssue(**issue) for issue in data.get("issues", [])]
+        return cls(rows=data.get("rows", 0), issues=issues, seconds=data.get("seconds", 0.0))
+
+    @classmethod
+    def merge(cls, reports: Iterable[Tuple[str, "ValidationReport"]]) -> "ValidationReport":
+        merged = cls()
+        for name, report in reports:
+            merged.rows += report.rows
+            merged.seconds += report.seconds
+            for issue in report.issues:
+                issue.file = issue.file or name
+                merged.issues.append(issue)
+        return merged
+
+
+class ImportValidationError(ValueError):
+    def __init__(self, report: ValidationReport) -> None:
+        super().__init__(f"Planilha inválida:\n{report.summary()}")
+        self.report = report
+
+    def __reduce__(self):
+        # Mantém o relatório ao atravessar o pool de processos.
+        return (type(self), (self.report,))
+
+
+def _line_numbers(index: pd.Index) -> List[int]:
+    # Índice 0 é a primeira linha de dados; na planilha ela é a linha 2.
+    return [int(i) + 2 for i in index[:SAMPLE_SIZE]]
+
+
+def _blank(s: pd.Series) -> pd.Series:
+    return s.isna() | s.astype("string").str.strip().eq("")
+
+
+class ImportValidator:
+    """Checagens vetorizadas sobre os blocos crus, antes de normalizar.
+
+    Cabeçalho faltando é fatal e interrompe no primeiro bloco; o resto é acumulado
+    e vira um resumo por coluna com algumas linhas de exemplo.
+    """
+
+    def __init__(self, origin: str) -> None:
+        self.flow = "167" if "167" in origin else "171"
+        self.rows = 0
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._samples: Dict[Tuple[str, str], List[int]] = {}
+        self._keys: List[pd.Series] = []
+        self._max_year = date.today().year + 1
+
+    def check_columns(self, columns: Iterable[str]) -> None:
+        present = set(columns)
+        missing = [col for col in REQUIRED_COLUMNS[self.flow] if col not in present]
+        if missing:
+            report = ValidationReport(
+                issues=[ColumnIssue(col, MISSING_COLUMN, 1, fatal=True) for col in missing]
+            )
+            raise ImportValidationError(report)
+
+    def _add(self, column: str, kind: str, mask: pd.Series) -> None:
+        mask = mask.fillna(False).astype(bool)
+        count = int(mask.sum())
+        if not count:
+            return
+        key = (column, kind)
+        self._counts[key] = self._counts.get(key, 0) + count
+        sample = self._samples.setdefault(key, [])
+        if len(sample) < SAMPLE_SIZE:
+            sample.extend(_line_numbers(mask.index[mask.to_numpy()])[: SAMPLE_SIZE - len(sample)])
+
+    def check_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Checa o bloco e o devolve com as colunas de data já convertidas (datetime64).
+
+        A normalização e o hash da linha recebem esse bloco: a conversão de datas,
+        a etapa mais cara, roda uma vez só por bloco.
+        """
+        if self.rows == 0:
+            self.check_columns(chunk.columns)
+        if chunk.empty:
+            return chunk
+        self.rows += len(chunk.index)
+
+        nro = chunk["Nro Ordem"]
+        empty = _blank(nro)
+        self._add("Nro Ordem", EMPTY_KEY, empty)
+        self._keys.append(nro[~empty].map(str).str.strip())
+
+        dates = {}
+        for col in DATE_COLUMNS[self.flow]:
+            if col not in chunk.columns:
+                continue
+            raw = chunk[col]
+            parsed = parse_dates(raw, source=self.flow)
+            if parsed.coerced:
+                self._add(col, BAD_DATE, ~_blank(raw) & parsed.values.isna())
+            years = parsed.values.dt.year
+            self._add(col, OUT_OF_RANGE, (years < MIN_YEAR) | (years > self._max_year))
+            dates[col] = parsed.values
+
+        for col in NUMBER_COLUMNS[self.flow]:
+            if col not in chunk.columns:
+                continue
+            raw = chunk[col]
+            parsed = pd.to_numeric(raw.astype("string").str.replace(",", ".", regex=False), errors="coerce")
+            self._add(col, BAD_NUMBER, ~_blank(raw) & parsed.isna())
+            if col == "Valor":
+                self._add(col, OUT_OF_RANGE, parsed < 0)
+        return chunk.assign(**dates) if dates else chunk
+
+    def report(self) -> ValidationReport:
+        if self._keys:
+            keys = pd.concat(self._keys)
+            self._add("Nro Ordem", DUPLICATE_KEY, keys.duplicated(keep=False))
+        report = ValidationReport(rows=self.rows)
+        if self.rows and self._counts.get(("Nro Ordem", EMPTY_KEY), 0) == self.rows:
+            report.issues.append(ColumnIssue("Nro Ordem", EMPTY_KEY, self.rows, fatal=True))
+        for (column, kind), count in self._counts.items():
+            if report.fatal and kind == EMPTY_KEY:
+                continue
+            report.issues.append(ColumnIssue(column, kind, count, self._samples.get((column, kind), [])))
+        return report
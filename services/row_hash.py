@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services.date_parsing import parse_dates
+
+ROW_HASH_COLUMN = "Hash Linha"
+# Identifica o algoritmo; hash gravado com outro prefixo (ou sem) conta como "sem hash".
+HASH_PREFIX = "v2:"
+_ISO = "%Y-%m-%dT%H:%M:%S"
+_SEPARATOR = "\x1f"
+# Número escrito como texto (CSV, célula formatada como texto): "10", "10.0", "1,5".
+_NUMBER_TEXT = re.compile(r"^-?\d+(?:[.,]\d+)?$")
+
+
+def _number_text(v: float) -> str:
+    if not math.isfinite(v):
+        return ""
+    if v.is_integer() and abs(v) < 1e15:
+        return str(int(v))
+    return format(v, ".15g")
+
+
+def _str_text(v: str) -> str:
+    v = v.strip()
+    if not _NUMBER_TEXT.match(v):
+        return v
+    number = Decimal(v.replace(",", "."))
+    # Inteiro exato mesmo com muitos dígitos; fração segue a mesma regra das colunas float.
+    return str(int(number)) if number == number.to_integral_value() else _number_text(float(number))
+
+
+def _value_text(v) -> str:
+    """Texto canônico de um valor solto (coluna object), igual ao das colunas tipadas."""
+    if v is None or v is pd.NaT or v is pd.NA:
+        return ""
+    if isinstance(v, str):
+        return _str_text(v)
+    if isinstance(v, (bool, np.bool_)):
+        return "1" if v else "0"
+    if isinstance(v, (int, np.integer)):
+        return str(int(v))
+    if isinstance(v, (float, np.floating, Decimal)):
+        return _number_text(float(v))
+    if isinstance(v, (datetime, np.datetime64)):
+        ts = pd.Timestamp(v)
+        return "" if pd.isna(ts) else ts.strftime(_ISO)
+    if isinstance(v, date):
+        return v.strftime(_ISO)
+    return str(v).strip()
+
+
+def _canonical(s: pd.Series) -> pd.Series:
+    """Texto de cada valor, o mesmo qualquer que seja o dtype que a leitura (XLSX, CSV...) produziu.
+
+    Vazio, None, NaN e NaT viram ""; números, digitados ou como texto, têm uma forma só
+    (10, 10.0, "10" e "10,0" coincidem); datas viram ISO com hora.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s.dt.strftime(_ISO).fillna("")
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return pd.Series([_value_text(v) for v in s.tolist()], index=s.index, dtype=object)
+    if pd.api.types.is_integer_dtype(s.dtype):
+        return s.astype("string").fillna("")
+    if pd.api.types.is_float_dtype(s.dtype):
+        values = s.to_numpy(dtype="float64", na_value=np.nan)
+        return pd.Series([_number_text(v) for v in values.tolist()], index=s.index, dtype=object)
+    return pd.Series([_value_text(v) for v in s.tolist()], index=s.index, dtype=object)
+
+
+def _canonical_dates(s: pd.Series) -> pd.Series:
+    """Coluna de data: "26/03/2025", o serial 45742 e a data do Excel dão o mesmo texto."""
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return _canonical(s)  # já convertida na validação
+    parsed = parse_dates(s, source="hash").values
+    text = parsed.dt.strftime(_ISO)
+    # O que não vira data entra como texto, para uma correção na célula ainda mudar o hash.
+    return text.where(parsed.notna(), _canonical(s))
+
+
+def row_hashes(df: pd.DataFrame, columns: Sequence[str], date_columns: Iterable[str] = ()) -> pd.Series:
+    """Hash de cada linha sobre ``columns`` (só as colunas de origem, na ordem dada).
+
+    Algoritmo fixo (BLAKE2b de 8 bytes sobre o texto canônico das colunas, separadas
+    por \\x1f), sem depender da versão do pandas; coluna ausente conta como vazia.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    dates = set(date_columns)
+    parts = []
+    for col in columns:
+        if col not in df.columns:
+            parts.append(pd.Series("", index=df.index, dtype=object))
+        elif col in dates:
+            parts.append(_canonical_dates(df[col]))
+        else:
+            parts.append(_canonical(df[col]))
+    rows = parts[0].astype(object).str.cat([p.astype(object) for p in parts[1:]], sep=_SEPARATOR)
+    hashed = [
+        HASH_PREFIX + hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest() for text in rows.tolist()
+    ]
+    return pd.Series(hashed, index=df.index, dtype=object)
+
+
+def add_row_hash(df: pd.DataFrame, columns: Sequence[str], date_columns: Iterable[str] = ()) -> pd.DataFrame:
+    """Acrescenta (ou recalcula) a coluna ``ROW_HASH_COLUMN`` no fim de ``df`` (altera ``df``)."""
+    df[ROW_HASH_COLUMN] = row_hashes(df, columns, date_columns)
+    return df
+
+
+def current_hashes(stored: pd.Series) -> pd.Series:
+    """Mantém só os hashes do algoritmo atual; os demais viram ``None`` (comparação impossível)."""
+    current = stored.astype("string").str.startswith(HASH_PREFIX).fillna(False).to_numpy(dtype=bool)
+    return stored.where(current, None)
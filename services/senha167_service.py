@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-import numpy as np
+from typing import Iterator, List
+
 import pandas as pd
-from pandas.tseries.offsets import CustomBusinessDay
+
+from services.business_calendar import add_business_days
+from services.date_parsing import parse_dates
+from services.order_readers import CHUNK_SIZE, ColumnContract, iter_chunks, list_sheets, tag_sheet
+from services.order_rules import load_rules
+from services.order_validation import REQUIRED_COLUMNS
 
 
 class AdicionarOrdensNovas2:
@@ -38,24 +44,87 @@ class AdicionarOrdensNovas2:
         "Dias a Vencer",
     ]
 
-    FERIADOS_FIXOS_MD = [
-        (1, 1),
-        (4, 15),
-        (4, 21),
-        (5, 1),
-        (9, 7),
-        (10, 12),
-        (11, 2),
-        (11, 15),
-        (12, 25),
-        (12, 31),
-    ]
+    # Texto com poucos valores distintos; vira category na prévia.
+    CATEGORY_COLUMNS = (
+        "STATUS",
+        "TRATATIVA",
+        "Responsável",
+        "Conferente",
+        "Região",
+        "Tipo Devol.",
+        "Semana-Limit",
+        "Região - 2",
+        "Gerencia",
+        "STT",
+        "Email",
+    )
+
+    # Entram no hash da linha: só o que vem da planilha. Prazos, mês/semana, STT (regras)
+    # e região/gerência/e-mail (tabela de filiais) são derivados e ficam de fora.
+    HASH_COLUMNS = (
+        "Nro Ordem",
+        "TRATATIVA",
+        "Responsável",
+        "Data Fechamento Divergência",
+        "Conferente",
+        "OBS",
+        "OBS - 2",
+        "Região",
+        "Filial Contábil",
+        "Tipo Devol.",
+        "Carga",
+        "Valor",
+        "Falta",
+        "Data Ordem",
+    )
+
+    # Colunas lidas da planilha: as de COLS mais as que ``normalizar`` renomeia.
+    CONTRACT = ColumnContract(
+        columns=tuple(COLS) + ("Cliente", "Cód. Cli"),
+        # Chaves e códigos entram como texto: zeros à esquerda e vazios não mudam a chave.
+        text_columns=(
+            "Nro Ordem",
+            "STATUS",
+            "TRATATIVA",
+            "Responsável",
+            "Conferente",
+            "OBS",
+            "OBS - 2",
+            "Região",
+            "Filial Contábil",
+            "Cliente",
+            "Cód. Cli",
+            "Tipo Devol.",
+            "Carga",
+            "Região - 2",
+            "Gerencia",
+            "Email",
+        ),
+        required=REQUIRED_COLUMNS["167"],
+    )
 
     def __init__(self, file_path: str) -> None:
         self.file_path = str(file_path)
+        # Filtro de "Falta" e classificação STT vêm de data/regras_importacao.json.
+        self.rules = load_rules("Senha 167")
 
     def load_xlsx(self) -> pd.DataFrame:
-        return pd.read_excel(self.file_path, engine="openpyxl")
+        sheets = self.sheets()
+        if not sheets:
+            chunks = list(self.iter_frames())
+            return pd.concat(chunks) if chunks else pd.DataFrame()
+        chunks = [tag_sheet(chunk, sheet) for sheet in sheets for chunk in self.iter_frames(sheet=sheet)]
+        return pd.concat(chunks, ignore_index=True)
+
+    def sheets(self) -> List[str]:
+        """Abas do arquivo com as colunas do fluxo (vazio quando basta ler a primeira)."""
+        return list_sheets(self.file_path, self.CONTRACT)
+
+    def iter_frames(
+        self, chunk_size: int = CHUNK_SIZE, sheet: str | None = None, first_chunk: int | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Lê o arquivo (XLSX, CSV, Parquet ou ODS) em blocos; o formato é detectado pelo conteúdo."""
+        return iter_chunks(self.file_path, chunk_size, self.CONTRACT, sheet, first_chunk)
 
     @staticmethod
     def _to_float_valor(s: pd.Series) -> pd.Series:
@@ -66,12 +135,14 @@ class AdicionarOrdensNovas2:
             df = self.load_xlsx()
         if df is None or df.empty:
             return df
+        return self.calcular_prazos(self.normalizar(df))
 
+    def normalizar(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.rename(columns={"Cliente": "Região", "Cód. Cli": "Filial Contábil"})
         df = df.reindex(columns=self.COLS, fill_value="")
         df["Responsável"] = df["Responsável"].fillna("")
 
-        dt = pd.to_datetime(df["Data Ordem"], dayfirst=True, errors="coerce")
+        dt = parse_dates(df["Data Ordem"], source="167").values
         df["Data Ordem"] = dt
         df["MÊS"] = dt.dt.month
         df["ANO"] = dt.dt.year
@@ -80,29 +151,22 @@ class AdicionarOrdensNovas2:
         df["Valor"] = self._to_float_valor(df["Valor"])
         df["STATUS"] = ""
 
-        falta = df["Falta"]
-        mask_falta = falta.notna() & falta.astype("string").str.strip().ne("")
-        df = df.loc[mask_falta].copy()
+        return df.loc[self.rules.mask(df)].copy()
 
-        dt2 = df["Data Ordem"]
-        if dt2.notna().any():
-            min_y = int(dt2.dt.year.min())
-            max_y = int(dt2.dt.year.max()) + 1
-            holidays = [pd.Timestamp(y, m, d) for y in range(min_y, max_y + 1) for (m, d) in self.FERIADOS_FIXOS_MD]
-        else:
-            holidays = []
+    @staticmethod
+    def atualizar_dias_a_vencer(df: pd.DataFrame) -> pd.DataFrame:
+        today = pd.Timestamp.today().normalize()
+        df["Dias a Vencer"] = (df["DATA LIMITE"] - today).dt.days.astype("Int64")
+        return df
 
-        cbd = CustomBusinessDay(holidays=holidays)
-        df["DATA LIMITE"] = df["Data Ordem"] + 7 * cbd
+    def calcular_prazos(self, df: pd.DataFrame) -> pd.DataFrame:
+        df["DATA LIMITE"] = add_business_days(df["Data Ordem"], 7)
 
         df["MÊS DE FECH"] = df["DATA LIMITE"].dt.month
 
         week_lim = df["DATA LIMITE"].dt.isocalendar().week.astype("Int64")
         df["Semana-Limit"] = ("Sem. " + week_lim.astype("string")).where(df["DATA LIMITE"].notna(), "")
 
-        today = pd.Timestamp.today().normalize()
-        df["Dias a Vencer"] = (df["DATA LIMITE"] - today).dt.days.astype("Int64")
+        self.atualizar_dias_a_vencer(df)
 
-        df["STT"] = np.where(df["Valor"] < 50, "SEM EVIDENCIA", "COM EVIDENCIA")
-
-        return df
+        return self.rules.classify(df)
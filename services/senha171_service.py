@@ -1,13 +1,35 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator, List
 
 import pandas as pd
 
+from services.date_parsing import parse_dates
+from services.order_readers import CHUNK_SIZE, ColumnContract, iter_chunks, list_sheets, tag_sheet
+from services.order_rules import load_rules
+from services.order_validation import REQUIRED_COLUMNS
+
 
 class AdicionarOrdensNovas:
     """Helper para importar e normalizar ordens do fluxo 171."""
 
+    # Texto com poucos valores distintos; vira category na prévia.
+    CATEGORY_COLUMNS = ("Status", "Tratativa", "Nome", "Cliente", "Tipo Devol.")
+    # Entram no hash da linha: só o que vem da planilha (MÊS, ANO, Semana e Status são derivados).
+    HASH_COLUMNS = (
+        "Nro Ordem",
+        "Tratativa",
+        "Nome",
+        "Data Tratativa",
+        "Cliente",
+        "Cód. Cli",
+        "Tipo Devol.",
+        "Carga",
+        "Valor",
+        "Data Ordem",
+    )
+
     def __init__(self, file_path: str) -> None:
         self.file_path = str(file_path)
         self.COLS = [
@@ -26,21 +48,42 @@ class AdicionarOrdensNovas:
             "Semana",
             "Data Ordem",
         ]
-        self.TIPOS_OK = {"Devolução CORTE", "Bonificação CORTE"}
+        # Filtro de "Tipo Devol." e demais regras vêm de data/regras_importacao.json.
+        self.rules = load_rules("Senha 171")
+        self.contract = ColumnContract(
+            columns=tuple(self.COLS),
+            # Chaves e códigos entram como texto: zeros à esquerda e vazios não mudam a chave.
+            text_columns=("Nro Ordem", "Status", "Tratativa", "Nome", "Cliente", "Cód. Cli", "Tipo Devol.", "Carga"),
+            required=REQUIRED_COLUMNS["171"],
+        )
 
     def load_xlsx(self) -> pd.DataFrame:
-        return pd.read_excel(self.file_path, engine="openpyxl")
+        sheets = self.sheets()
+        if not sheets:
+            chunks = list(self.iter_frames())
+            return pd.concat(chunks) if chunks else pd.DataFrame()
+        chunks = [tag_sheet(chunk, sheet) for sheet in sheets for chunk in self.iter_frames(sheet=sheet)]
+        return pd.concat(chunks, ignore_index=True)
+
+    def sheets(self) -> List[str]:
+        """Abas do arquivo com as colunas do fluxo (vazio quando basta ler a primeira)."""
+        return list_sheets(self.file_path, self.contract)
+
+    def iter_frames(
+        self, chunk_size: int = CHUNK_SIZE, sheet: str | None = None, first_chunk: int | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Lê o arquivo (XLSX, CSV, Parquet ou ODS) em blocos; o formato é detectado pelo conteúdo."""
+        return iter_chunks(self.file_path, chunk_size, self.contract, sheet, first_chunk)
 
     def Manipular_Dados(self, df: pd.DataFrame | None = None) -> pd.DataFrame | str | None:
         if df is None or df.empty:
             return df
 
-        if "Tipo Devol." in df.columns:
-            df = df[df["Tipo Devol."].isin(self.TIPOS_OK)]
+        df = self.rules.filter(df)
 
         df = df.reindex(columns=self.COLS, fill_value="")
 
-        dt = pd.to_datetime(df["Data Ordem"], dayfirst=True, errors="coerce")
+        dt = parse_dates(df["Data Ordem"], source="171").values
         df["Data Ordem"] = dt
         df["MÊS"] = dt.dt.month
         df["ANO"] = dt.dt.year
@@ -53,4 +96,4 @@ class AdicionarOrdensNovas:
         ).fillna(0.0)
 
         df["Status"] = ""
-        return df
+        return self.rules.classify(df)
@@ -1,21 +1,36 @@
 from __future__ import annotations
 
+import multiprocessing
 import sys
+import threading
 
 from PyQt6.QtWidgets import QApplication
 
-from db.config import init_db
-from db.report_config import init_report_db
-from db.order_config import init_order_request_db, init_order_data_db
+from db.config import engine, init_db
+from db.report_config import init_report_db, report_engine
+from db.order_config import init_order_request_db, init_order_data_db, order_data_engine, order_request_engine
+from db.replica import warm_replicas
 from ui.dashboard_window import DashboardWindow
 from ui.login_window import LoginWindow
 
 
+def _warm_up() -> None:
+	# Abre uma conexão por banco e carrega as réplicas enquanto a tela de login é desenhada.
+	try:
+		for eng in (engine, report_engine, order_request_engine, order_data_engine):
+			with eng.connect():
+				pass
+		warm_replicas()
+	except Exception:
+		pass  # as réplicas carregam sob demanda na primeira leitura
+
+
 def main() -> None:
 	init_db()
 	init_report_db()
 	init_order_request_db()
 	init_order_data_db()
+	threading.Thread(target=_warm_up, name="db-warmup", daemon=True).start()
 	app = QApplication(sys.argv)
 	login_window = LoginWindow()
 
@@ -36,4 +51,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+	multiprocessing.freeze_support()  # processos do pool de importação no executável
 	main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import warnings
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import legacy_calendar
+from services.business_calendar import FERIADOS_FIXOS_MD, add_business_days, feriados, pascoa
+
+YEARS = range(2023, 2028)
+
+
+def _legacy(dates: pd.Series, n: int, holidays) -> pd.Series:
+    # O CustomBusinessDay aplica o deslocamento elemento a elemento e avisa; aqui é esperado.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        return legacy_calendar.with_holidays(dates, n, holidays)
+
+
+def _legacy_fixed(dates: pd.Series) -> pd.Series:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        return legacy_calendar.data_limite(dates)
+
+
+def _all_days() -> pd.Series:
+    # Todo dia de 2024 a 2026, com hora em alguns, e NaT no meio.
+    days = pd.Series(pd.date_range("2024-01-01", "2026-12-31", freq="D"))
+    days.iloc[::7] += pd.Timedelta(hours=14, minutes=30)
+    days.iloc[5] = pd.NaT
+    return days
+
+
+@pytest.mark.parametrize("n", [7, 1, 0, -3])
+def test_same_as_custom_business_day_with_the_same_holidays(n):
+    dates = _all_days()
+    holidays = [d for year in YEARS for d in feriados(year)]
+    expected = _legacy(dates, n, holidays)
+    got = add_business_days(dates, n)
+    assert got.isna().tolist() == expected.isna().tolist()
+    assert (got.dropna() == expected.dropna()).all()
+
+
+def test_same_as_old_code_away_from_moveable_holidays():
+    dates = _all_days()
+    got = add_business_days(dates, 7)
+    old = _legacy_fixed(dates)
+    fixed = {date(year, m, d) for year in YEARS for m, d in FERIADOS_FIXOS_MD}
+    moveable = pd.to_datetime(sorted({d for year in YEARS for d in feriados(year)} - fixed))
+    # O prazo de 7 dias úteis cobre no máximo ~2 semanas de calendário depois da data.
+    day = dates.dt.normalize().to_numpy()[:, None]
+    gap = (moveable.to_numpy()[None, :] - day) / np.timedelta64(1, "D")
+    near = ((gap >= 0) & (gap <= 16)).any(axis=1)
+    valid = dates.notna().to_numpy()
+    assert (got[valid & ~near] == old[valid & ~near]).all()
+    # Perto de Carnaval, Sexta-feira Santa e Corpus Christi o prazo agora avança mais.
+    assert (got[valid & near] >= old[valid & near]).all() and (got[valid & near] > old[valid & near]).any()
+
+
+@pytest.mark.parametrize(
+    "start, expected",
+    [
+        ("2025-03-03", "2025-03-13"),  # segunda de Carnaval: conta a partir de quarta
+        ("2025-04-17", "2025-04-30"),  # antes de Sexta-feira Santa e Tiradentes
+        ("2025-06-18", "2025-06-30"),  # véspera de Corpus Christi
+        ("2025-12-24", "2026-01-07"),  # atravessa Natal, 31/12 e Ano-Novo
+        ("2025-11-15", "2025-11-25"),  # sábado e feriado: rola para segunda
+    ],
+)
+def test_holiday_edges(start, expected):
+    got = add_business_days(pd.Series(pd.to_datetime([start])), 7)
+    assert got.iloc[0] == pd.Timestamp(expected)
+
+
+def test_easter_and_empty_input():
+    assert [pascoa(y) for y in (2024, 2025, 2026)] == [date(2024, 3, 31), date(2025, 4, 20), date(2026, 4, 5)]
+    empty = add_business_days(pd.Series([pd.NaT, pd.NaT], dtype="datetime64[ns]"), 7)
+    assert empty.isna().all()
+    assert np.issubdtype(empty.dtype, np.datetime64)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from services.date_parsing import parse_dates
+
+
+def test_serial_text_only_in_plausible_range():
+    s = pd.Series(["45742", "45742,5", "2025", "15042025", "26/03/2025", ""], dtype=object)
+    parsed = parse_dates(s, source="teste")
+    assert parsed.values.tolist()[:2] == [pd.Timestamp("2025-03-26"), pd.Timestamp("2025-03-26 12:00")]
+    # Ano solto e data sem separador não são seriais: ficam NaT e contam como não convertidos.
+    assert parsed.values.iloc[2:4].isna().all()
+    assert parsed.values.iloc[4] == pd.Timestamp("2025-03-26")
+    assert parsed.coerced == 2
+
+
+def test_small_numbers_are_not_serials():
+    # 15 e 2025 seriam 1900 e 1905: números fora da faixa contam como não convertidos.
+    typed = parse_dates(pd.Series([15, 2025, 45742, None], dtype="float64"))
+    assert typed.values.iloc[:2].isna().all() and typed.values.iloc[2] == pd.Timestamp("2025-03-26")
+    assert typed.coerced == 2
+    loose = parse_dates(pd.Series([15, 2025, 45742.5, "26/03/2025"], dtype=object))
+    assert loose.values.iloc[:2].isna().all()
+    assert loose.values.iloc[2] == pd.Timestamp("2025-03-26 12:00")
+    assert loose.coerced == 2
+
+
+def test_tz_aware_keeps_wall_clock():
+    s = pd.Series(
+        [
+            pd.Timestamp("2025-03-26 23:30", tz="America/Sao_Paulo"),
+            datetime(2025, 3, 26, 1, 0, tzinfo=timezone(timedelta(hours=5))),
+            datetime(2025, 1, 2),
+        ],
+        dtype=object,
+    )
+    assert parse_dates(s).values.tolist() == [
+        pd.Timestamp("2025-03-26 23:30"),
+        pd.Timestamp("2025-03-26 01:00"),
+        pd.Timestamp("2025-01-02"),
+    ]
+    typed = pd.Series(pd.to_datetime(["2025-03-26 23:30"]).tz_localize("America/Sao_Paulo"))
+    assert parse_dates(typed).values.tolist() == [pd.Timestamp("2025-03-26 23:30")]
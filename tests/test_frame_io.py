@@ -0,0 +1,77 @@
+"""``compact_text_columns`` só troca o dtype: valores, staging e Parquet ficam iguais aos da versão object."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.pending_normalize import synthetic_167
+from repositories import order_pending_repository
+from services.frame_io import HAS_PYARROW, compact_text_columns, frame_from_parquet, frame_to_parquet
+from services.senha167_service import AdicionarOrdensNovas2
+
+# Mais duas que não podem virar category: chave (um valor por linha) e número.
+COLUMNS = AdicionarOrdensNovas2.CATEGORY_COLUMNS + ("Nro Ordem", "Valor")
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    return compact_text_columns(df.copy(), COLUMNS)
+
+
+def _assert_same_values(got: pd.DataFrame, expected: pd.DataFrame) -> None:
+    # category devolve NaN onde o object tinha None: ambos são vazio para o staging e para o Parquet.
+    got = got.astype({col: object for col in got.select_dtypes("category").columns})
+    assert got.columns.tolist() == expected.columns.tolist()
+    for col in expected.columns:
+        empty = expected[col].isna()
+        assert got[col].isna().equals(empty), col
+        pd.testing.assert_series_equal(got[col][~empty], expected[col][~empty])
+
+
+def test_only_low_cardinality_text_becomes_category():
+    df = pd.DataFrame(
+        {
+            "STATUS": ["ABERTO", "FINALIZADO", None, "ABERTO"],
+            "TRATATIVA": ["CANCELADO", 1, "CANCELADO", "CANCELADO"],  # tipos misturados
+            "Nro Ordem": ["1", "2", "3", "4"],  # um valor por linha
+            "Valor": [1.0, 1.0, 1.0, np.nan],  # não é texto
+            "STT": ["A", "A", "A", "A"],  # fora de ``columns``
+        }
+    )
+    out = compact_text_columns(df.copy(), ("STATUS", "TRATATIVA", "Nro Ordem", "Valor"))
+    assert {col: str(dtype) for col, dtype in out.dtypes.items()} == {
+        "STATUS": "category",
+        "TRATATIVA": "object",
+        "Nro Ordem": "object",
+        "Valor": "float64",
+        "STT": "object",
+    }
+    assert out["STATUS"].isna().tolist() == [False, False, True, False]
+    _assert_same_values(out, df)
+
+
+def test_empty_frame_is_left_alone():
+    df = pd.DataFrame({"STATUS": pd.Series([], dtype=object)})
+    assert compact_text_columns(df, ("STATUS",))["STATUS"].dtype == object
+
+
+def test_staging_rows_match_object_frame():
+    df = synthetic_167(2000)
+    compact = _compact(df)
+    assert compact.select_dtypes("category").columns.tolist() == ["STATUS", "TRATATIVA", "Tipo Devol.", "STT"]
+    old = order_pending_repository.normalize_frame("Senha 167", 7, df)
+    new = order_pending_repository.normalize_frame("Senha 167", 7, compact)
+    assert len(new) == len(old)
+    for old_row, new_row in zip(old, new):
+        for key, value in old_row.items():
+            other = new_row[key]
+            assert (pd.isna(value) and pd.isna(other)) or (type(value) is type(other) and value == other), key
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow ausente")
+def test_parquet_round_trip_matches_object_frame():
+    df = synthetic_167(2000)
+    compact = _compact(df)
+    back = frame_from_parquet(frame_to_parquet(compact))
+    assert back.select_dtypes("category").columns.tolist() == compact.select_dtypes("category").columns.tolist()
+    _assert_same_values(back, frame_from_parquet(frame_to_parquet(df)))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.order_readers import synthetic_171
+from services.order_readers import ColumnContract, UnsupportedFormatError, detect_format, iter_chunks
+from services.senha171_service import AdicionarOrdensNovas
+
+
+def _csv(tmp_path, rows: int):
+    df = pd.DataFrame({"Nro Ordem": range(rows), "Valor": [1.5] * rows, "Sobra": ["x"] * rows})
+    path = tmp_path / "ordens.csv"
+    df.to_csv(path, index=False, sep=";")
+    return path
+
+
+def test_csv_is_read_in_bounded_chunks(tmp_path):
+    path = _csv(tmp_path, 25)
+    contract = ColumnContract(columns=("Nro Ordem", "Valor"))
+    chunks = list(iter_chunks(str(path), 10, contract, first_chunk=3))
+    assert [len(chunk.index) for chunk in chunks] == [3, 10, 10, 2]
+    df = pd.concat(chunks)
+    assert list(df.columns) == ["Nro Ordem", "Valor"]
+    assert df.index.tolist() == list(range(25))
+    assert df["Nro Ordem"].tolist() == list(range(25))
+
+
+def test_csv_text_columns_keep_zeros_and_survive_blanks(tmp_path):
+    path = tmp_path / "ordens.csv"
+    path.write_text("Nro Ordem;Carga;Valor\n00123;0800;1,5\n124;;2\n;0801;3\n00125;0802;4\n", encoding="utf-8")
+    contract = ColumnContract(columns=("Nro Ordem", "Carga", "Valor"), text_columns=("Nro Ordem", "Carga"))
+    chunks = list(iter_chunks(str(path), 2, contract))
+    df = pd.concat(chunks)
+    # Igual em todos os blocos, com ou sem vazio: nada de "123" ou "124.0".
+    assert df["Nro Ordem"].tolist()[:2] == ["00123", "124"]
+    assert pd.isna(df["Nro Ordem"].iloc[2]) and df["Nro Ordem"].iloc[3] == "00125"
+    assert df["Carga"].tolist()[0] == "0800" and pd.isna(df["Carga"].iloc[1])
+    assert [chunk["Nro Ordem"].dtype for chunk in chunks] == [object, object]
+
+
+@pytest.mark.parametrize("ext", ["xlsx", "parquet"])
+def test_typed_formats_give_the_same_text_as_csv(tmp_path, ext):
+    df = pd.DataFrame({"Nro Ordem": [123, None, 125], "Carga": [800.0, None, 801.0], "Valor": [1.5, 2.0, 3.0]})
+    if ext == "parquet":
+        df["Nro Ordem"] = df["Nro Ordem"].astype("Int64")  # nulo chega como pd.NA
+        df["Cliente"] = ["A", None, "C"]  # texto do pyarrow: nulo chega como None
+    path = tmp_path / f"ordens.{ext}"
+    df.to_excel(path, index=False) if ext == "xlsx" else df.to_parquet(path, index=False)
+    contract = ColumnContract(
+        columns=("Nro Ordem", "Carga", "Valor", "Cliente"), text_columns=("Nro Ordem", "Carga", "Cliente")
+    )
+    out = pd.concat(iter_chunks(str(path), 2, contract))
+    assert out["Nro Ordem"].tolist()[::2] == ["123", "125"] and pd.isna(out["Nro Ordem"].iloc[1])
+    assert out["Carga"].tolist()[::2] == ["800", "801"] and pd.isna(out["Carga"].iloc[1])
+    if ext == "parquet":
+        assert isinstance(out["Cliente"].iloc[1], float) and pd.isna(out["Cliente"].iloc[1])
+
+
+def _wide_171(rows: int) -> pd.DataFrame:
+    df = synthetic_171(rows)
+    df.loc[::7, "Valor"] = np.nan
+    df.loc[::11, "Cliente"] = None
+    df["Carga"] = df["Carga"].astype("Int64")
+    df.loc[::13, "Carga"] = pd.NA
+    for i in range(50):
+        df[f"Extra {i}"] = np.arange(rows) * i
+    return df
+
+
+def _legacy_text(values: pd.Series) -> pd.Series:
+    # A leitura antiga inferia tipos; o texto que o fluxo usa é o número sem ".0".
+    def text(v):
+        if isinstance(v, str) or pd.isna(v):
+            return v
+        return str(int(v)) if float(v).is_integer() else str(v)
+
+    out = pd.Series([text(v) for v in values.astype(object)], index=values.index, dtype=object)
+    return out.where(out.notna(), np.nan)
+
+
+@pytest.mark.parametrize("ext", ["xlsx", "csv", "parquet"])
+def test_projected_read_matches_full_read(tmp_path, ext):
+    df = _wide_171(400)
+    path = tmp_path / f"ordens.{ext}"
+    if ext == "xlsx":
+        df.to_excel(path, index=False)
+        full = pd.read_excel(path)
+    elif ext == "csv":
+        df.to_csv(path, index=False, sep=";")
+        full = pd.read_csv(path, sep=";")
+    else:
+        df.to_parquet(path, index=False)
+        full = pd.read_parquet(path)
+    contract = AdicionarOrdensNovas("").contract
+    got = pd.concat(iter_chunks(str(path), 150, contract))
+    expected = full[contract.select(list(full.columns))].copy()
+    for name in contract.text_columns:
+        if name in expected.columns:
+            expected[name] = _legacy_text(expected[name])
+    assert not any(name.startswith("Extra") for name in got.columns)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_legacy_xls_is_rejected(tmp_path):
+    path = tmp_path / "ordens.xls"
+    path.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 512)
+    with pytest.raises(UnsupportedFormatError, match="não suportado"):
+        detect_format(str(path))
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    path = tmp_path / "ordens.dat"
+    path.write_text("Nro Ordem;Valor\n1;2\n", encoding="utf-8")
+    with pytest.raises(UnsupportedFormatError, match=r"\.dat"):
+        detect_format(str(path))
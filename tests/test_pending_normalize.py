@@ -0,0 +1,117 @@
+"""``normalize_columns`` (por coluna) tem de gravar o mesmo que a versão linha a linha antiga."""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from repositories import order_pending_repository
+from benchmarks import legacy_pending
+
+WORKBOOK_171 = Path(__file__).resolve().parents[1] / "Relatório 171 - 2025.xlsx"
+
+
+def _same(old, new) -> bool:
+    # A versão antiga devolvia NaT cru nas colunas datetime64; a nova grava None (o SQLite não aceita NaT).
+    if old is pd.NaT:
+        return new is None
+    if isinstance(old, float) and isinstance(new, float) and math.isnan(old):
+        return math.isnan(new)
+    return type(old) is type(new) and old == new
+
+
+def _assert_same(origin: str, df: pd.DataFrame) -> None:
+    old = legacy_pending.normalize_frame(origin, 7, df)
+    new = order_pending_repository.normalize_frame(origin, 7, df)
+    assert [row["nro_ordem"] for row in new] == [row["nro_ordem"] for row in old]
+    for old_row, new_row in zip(old, new):
+        for key, value in old_row.items():
+            assert _same(value, new_row[key]), (old_row["nro_ordem"], key, value, new_row[key])
+
+
+def _frame_167() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            # Chave: int, texto com espaços, float inteiro, vazios, zero, NaN e repetida.
+            "Nro Ordem": [101, " 102 ", 103.0, None, "", 0, "104", np.nan, "101"],
+            "STATUS": ["A", None, np.nan, "", "B", "C", "D", "E", "F"],
+            "TRATATIVA": pd.Categorical(["x", "y", None, "x", "y", "x", "y", "x", "z"]),
+            "Valor": [1.5, np.nan, 2, 3, 4, 5, 6, 7, 8.25],
+            "Falta": ["1,5", "", None, " ", "x", 2, 3.0, np.nan, "4"],
+            "MÊS": [1.0, np.nan, 3, 4, 5, 6, 7, 8, 9.9],
+            "Semana": ["1", None, 3.0, "x", np.nan, 6, 7, 8, 9],
+            "ANO": pd.array([2025, None, 2025, 2025, 2025, 2025, 2025, 2025, 2024], dtype="Int64"),
+            "Dias a Vencer": [-3, 0, 5, 1, 2, 3, 4, 5, 6],
+            "Data Ordem": pd.to_datetime(
+                ["2025-01-02", None, "2025-03-04"] + ["2025-01-01"] * 5 + ["2025-02-02 10:30"], format="mixed"
+            ),
+            "DATA LIMITE": [
+                datetime(2025, 1, 2),
+                "2025-01-03",
+                None,
+                np.nan,
+                pd.NaT,
+                "15/02/2025",
+                "",
+                pd.Timestamp("2025-01-05"),
+                "x",
+            ],
+            "Email": ["a@b", None, "", "c@d", np.nan, "e", "f", "g", "h"],
+        }
+    )
+
+
+def _frame_171() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Nro Ordem": ["9001", 9002, 9003.0, " ", 0, "9001"],
+            "Status": ["", "", "", "", "", ""],
+            "Nome": ["Ana", None, np.nan, "Bia", "Cid", "Duda"],
+            "Data Tratativa": ["2025-04-01", datetime(2025, 4, 2), "02/04/2025", None, "", pd.Timestamp("2025-04-03")],
+            "Cód. Cli": [1, 2, 3, 4, 5, 6],
+            "Valor": ["1,25", 2, "", None, "abc", 7.5],
+            "MÊS": pd.array([1, 2, None, 4, 5, 6], dtype="UInt32"),
+            "ANO": [2025.0, 2025.0, np.nan, 2025.0, 2025.0, 2025.0],
+            "Semana": ["1", "2", "3", "4", "5", "6"],
+            "Data Ordem": pd.to_datetime(["2025-01-02", "2025-01-03", None, "2025-01-05", "2025-01-06", "2025-01-07"]),
+        }
+    )
+
+
+def test_167_matches_row_wise():
+    _assert_same("Senha 167", _frame_167())
+
+
+def test_171_matches_row_wise():
+    _assert_same("Senha 171", _frame_171())
+
+
+def test_missing_columns_become_none():
+    df = pd.DataFrame({"Nro Ordem": ["1", "2"]})
+    _assert_same("Senha 167", df)
+    _assert_same("Senha 171", df)
+
+
+def test_empty_frame():
+    assert order_pending_repository.normalize_frame("Senha 167", 7, pd.DataFrame()) == []
+    assert legacy_pending.normalize_frame("Senha 167", 7, pd.DataFrame()) == []
+
+
+def test_float_keys_keep_their_text():
+    # "103.0" continua "103.0", como antes: a chave não é reinterpretada na normalização.
+    rows = order_pending_repository.normalize_frame("Senha 167", 7, pd.DataFrame({"Nro Ordem": [103.0, 104]}))
+    assert [row["nro_ordem"] for row in rows] == ["103.0", "104.0"]
+
+
+@pytest.mark.skipif(not WORKBOOK_171.exists(), reason="planilha de exemplo ausente")
+def test_171_workbook_matches_row_wise():
+    # Leitura crua da planilha: colunas object com datas, textos e números misturados.
+    df = pd.read_excel(WORKBOOK_171).rename(
+        columns=lambda c: {"Ordem": "Nro Ordem", "SEMANA": "Semana", "Carga 0800": "Carga"}.get(c.strip(), c.strip())
+    )
+    assert len(df.index) > 1000
+    _assert_same("Senha 171", df)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from services.row_hash import HASH_PREFIX, current_hashes, row_hashes
+from services.senha171_service import AdicionarOrdensNovas
+
+COLUMNS = AdicionarOrdensNovas.HASH_COLUMNS
+DATES = ("Data Ordem", "Data Tratativa")
+
+
+def _typed() -> pd.DataFrame:
+    # Como a leitura do XLSX entrega: números, datas do Excel e vazios como NaN.
+    return pd.DataFrame(
+        {
+            "Nro Ordem": [123, 124],
+            "Tratativa": ["FINALIZADO ", np.nan],
+            "Data Tratativa": [datetime(2025, 3, 26), np.nan],
+            "Cód. Cli": [6803776, 8817174],
+            "Carga": [800, 801],
+            "Valor": [208.98, 10.0],
+            "Data Ordem": pd.to_datetime(["2025-01-02", "2025-01-03"]),
+        }
+    )
+
+
+def _as_text() -> pd.DataFrame:
+    # Os mesmos dados como um CSV em pt-BR chegaria: tudo texto, vírgula decimal, data dd/mm/aaaa.
+    return pd.DataFrame(
+        {
+            "Nro Ordem": ["123", "124"],
+            "Tratativa": ["FINALIZADO", ""],
+            "Data Tratativa": ["26/03/2025", None],
+            "Cód. Cli": ["6803776", "8817174"],
+            "Carga": ["0800", "801"],
+            "Valor": ["208,98", "10"],
+            "Data Ordem": ["02/01/2025", "03/01/2025"],
+        },
+        dtype=object,
+    )
+
+
+def test_same_rows_hash_alike_whatever_the_reader():
+    assert row_hashes(_typed(), COLUMNS, DATES).tolist() == row_hashes(_as_text(), COLUMNS, DATES).tolist()
+
+
+def test_derived_columns_do_not_change_the_hash():
+    df = _typed()
+    before = row_hashes(df, COLUMNS, DATES)
+    df["Status"] = "x"
+    df["MÊS"] = 99
+    df["Aba de Origem"] = "Sem 2"
+    assert row_hashes(df, COLUMNS, DATES).tolist() == before.tolist()
+
+
+def test_source_edit_changes_the_hash():
+    df = _typed()
+    before = row_hashes(df, COLUMNS, DATES)
+    df.loc[1, "Tratativa"] = "CANCELADO"
+    after = row_hashes(df, COLUMNS, DATES)
+    assert after[0] == before[0] and after[1] != before[1]
+
+
+def test_algorithm_is_pinned():
+    # Valor gravado no banco: mudar o algoritmo exige trocar HASH_PREFIX.
+    df = pd.DataFrame({"Nro Ordem": ["1"], "Valor": [1.5]})
+    expected = hashlib.blake2b("1\x1f1.5".encode("utf-8"), digest_size=8).hexdigest()
+    assert expected == "ad8776076dc324ea"
+    assert row_hashes(df, ("Nro Ordem", "Valor")).tolist() == [HASH_PREFIX + expected]
+
+
+def test_hashes_of_other_versions_are_not_compared():
+    stored = pd.Series([HASH_PREFIX + "ab", "0123456789abcdef", None], dtype=object)
+    assert current_hashes(stored).tolist() == [HASH_PREFIX + "ab", None, None]
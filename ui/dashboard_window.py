@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List
 import html
 from datetime import datetime
 import shutil
@@ -8,9 +8,10 @@ from zoneinfo import ZoneInfo
 from pathlib import Path
 import platform
 import getpass
+import numpy as np
 import pandas as pd
 
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QUrl
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QThreadPool, QUrl
 from PyQt6.QtGui import QIcon, QPixmap, QDesktopServices, QColor
 from PyQt6.QtWidgets import (
     QDialog,
@@ -48,9 +49,22 @@ from db.report_config import report_engine
 from db.order_config import order_request_engine, order_data_engine
 from services.auth_service import AuthService, AuthError
 from services.report_service import ReportService
-from services.senha171_service import AdicionarOrdensNovas
-from services.senha167_service import AdicionarOrdensNovas2
 from services.order_service import OrderService
+from services import import_cache
+from services.order_enrichment import ENRICHED_COLUMNS, MAPPING_KEY, import_mapping_file, load_mapping
+from services.order_import_service import order_keys, source_name
+from services.order_readers import file_dialog_filter, list_supported_files
+from services.row_hash import ROW_HASH_COLUMN
+from ui.drop_folder import (
+    CLAIM_DIR,
+    DONE_DIR,
+    DROP_FOLDER_ORIGINS,
+    ERROR_DIR,
+    DropFolderWatcher,
+    load_drop_folder,
+    save_drop_folder,
+)
+from ui.import_worker import OrderImportWorker
 from repositories import (
     password_request_repository,
     registration_request_repository,
@@ -74,7 +88,17 @@ class DashboardWindow(QMainWindow):
         ]
         self._last_preview_df_171 = None
         self._last_preview_df_167 = None
+        self._last_import_files_171 = []
+        self._last_import_files_167 = []
         self._orders167_pending_confirm = False
+        self._import_worker = None
+        self._import_progress = None
+        self._import_origin = None
+        # Prévia parcial montada enquanto a importação roda (ver _on_order_import_rows).
+        self._preview_stream = None
+        # Pastas monitoradas por fluxo (ver ui/drop_folder.py).
+        self._drop_watchers: Dict[str, DropFolderWatcher] = {}
+        self._drop_folder_edits: Dict[str, QLineEdit] = {}
         self.order_service = OrderService()
         self.setWindowTitle("Controle de Estoque - Principal")
         self.setMinimumSize(1100, 640)
@@ -83,6 +107,8 @@ class DashboardWindow(QMainWindow):
         if app_icon is not None:
             self.setWindowIcon(app_icon)
         self._build_ui()
+        if self.is_admin:
+            self._start_drop_watchers()
         self._show_user_alert()
 
     def _build_ui(self) -> None:
@@ -405,18 +431,17 @@ class DashboardWindow(QMainWindow):
             for title, desc in self._static_pops
         ]
         try:
-            with Session(engine) as session:
-                approved = pop_request_repository.list_approved(session)
-                pops.extend(
-                    {
-                        "title": req.title,
-                        "desc": req.description,
-                        "file_path": req.file_path,
-                        "file_name": req.file_name,
-                        "id": req.id,
-                    }
-                    for req in approved
-                )
+            approved = pop_request_repository.list_approved_cached()
+            pops.extend(
+                {
+                    "title": req.title,
+                    "desc": req.description,
+                    "file_path": req.file_path,
+                    "file_name": req.file_name,
+                    "id": req.id,
+                }
+                for req in approved
+            )
         except Exception:
             pass
 
@@ -648,19 +673,18 @@ class DashboardWindow(QMainWindow):
 
         reports = []
         try:
-            with Session(report_engine) as report_session:
-                approved = report_request_repository.list_approved(report_session)
-                reports.extend(
-                    {
-                        "title": req.title,
-                        "desc": req.description,
-                        "file_path": req.file_path,
-                        "file_name": req.file_name,
-                        "id": req.id,
-                        "is_order": False,
-                    }
-                    for req in approved
-                )
+            approved = report_request_repository.list_approved_cached()
+            reports.extend(
+                {
+                    "title": req.title,
+                    "desc": req.description,
+                    "file_path": req.file_path,
+                    "file_name": req.file_name,
+                    "id": req.id,
+                    "is_order": False,
+                }
+                for req in approved
+            )
         except Exception:
             pass
 
@@ -1204,6 +1228,9 @@ class DashboardWindow(QMainWindow):
         preview_actions = QHBoxLayout()
         preview_actions.setContentsMargins(0, 0, 0, 0)
         preview_actions.setSpacing(8)
+        self.lbl_preview_status_167 = QLabel("")
+        self.lbl_preview_status_167.setObjectName("mutedText")
+        preview_actions.addWidget(self.lbl_preview_status_167, 0)
         preview_actions.addStretch(1)
         self.btn_download_preview_167 = QPushButton("Baixar Prévia")
         self.btn_download_preview_167.setObjectName("primaryButton")
@@ -1280,6 +1307,9 @@ class DashboardWindow(QMainWindow):
         preview_actions = QHBoxLayout()
         preview_actions.setContentsMargins(0, 0, 0, 0)
         preview_actions.setSpacing(8)
+        self.lbl_preview_status_171 = QLabel("")
+        self.lbl_preview_status_171.setObjectName("mutedText")
+        preview_actions.addWidget(self.lbl_preview_status_171, 0)
 
         preview_actions.addStretch(1)
         self.btn_download_preview_171 = QPushButton("Baixar Prévia")
@@ -1315,7 +1345,9 @@ class DashboardWindow(QMainWindow):
 
     def _on_add_orders_167_clicked(self) -> None:
         if getattr(self, "_orders167_pending_confirm", False):
-            self._submit_order_confirmation("Senha 167", "_last_preview_df_167", self._set_orders167_confirm_state)
+            self._submit_order_confirmation(
+                "Senha 167", "_last_preview_df_167", "_last_import_files_167", self._set_orders167_confirm_state
+            )
             return
         self._handle_add_orders_167()
 
@@ -1328,33 +1360,51 @@ class DashboardWindow(QMainWindow):
 
     def _handle_add_orders_167(self) -> None:
         dialog = QDialog(self)
-        dialog.setWindowTitle("Importar ordens (xlsx)")
+        dialog.setWindowTitle("Importar ordens")
         dialog.setModal(True)
         v = QVBoxLayout(dialog)
         v.setContentsMargins(16, 16, 16, 16)
         v.setSpacing(10)
 
-        label = QLabel("Selecione um arquivo XLSX com as ordens.")
+        label = QLabel("Selecione um ou mais arquivos com as ordens (XLSX, CSV, Parquet ou ODS) ou uma pasta.")
         v.addWidget(label)
 
         file_display = QLabel("Nenhum arquivo selecionado")
         file_display.setObjectName("mutedText")
-        pick_btn = QPushButton("Escolher arquivo")
+        pick_btn = QPushButton("Escolher arquivos")
         pick_btn.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        selected: Dict[str, str | None] = {"path": None}
+        folder_btn = QPushButton("Escolher pasta")
+        folder_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+
+        selected: Dict[str, List[str]] = {"paths": []}
+
+        def _set_selection(paths: List[str]) -> None:
+            selected["paths"] = paths
+            if len(paths) == 1:
+                file_display.setText(Path(paths[0]).name)
+            elif paths:
+                file_display.setText(f"{len(paths)} arquivos selecionados")
+            else:
+                file_display.setText("Nenhum arquivo selecionado")
 
         def _pick() -> None:
-            chosen, _ = QFileDialog.getOpenFileName(dialog, "Selecionar XLSX", "", "Planilhas (*.xlsx)")
+            chosen, _ = QFileDialog.getOpenFileNames(dialog, "Selecionar planilhas", "", file_dialog_filter())
             if chosen:
-                selected["path"] = chosen
-                file_display.setText(Path(chosen).name)
+                _set_selection(chosen)
+
+        def _pick_folder() -> None:
+            folder = QFileDialog.getExistingDirectory(dialog, "Selecionar pasta com as planilhas")
+            if folder:
+                _set_selection(list_supported_files(folder))
 
         pick_btn.clicked.connect(_pick)
+        folder_btn.clicked.connect(_pick_folder)
 
         row = QHBoxLayout()
         row.setSpacing(8)
         row.addWidget(pick_btn, 0)
+        row.addWidget(folder_btn, 0)
         row.addWidget(file_display, 1)
         v.addLayout(row)
 
@@ -1375,41 +1425,266 @@ class DashboardWindow(QMainWindow):
         if dialog.exec() != QDialog.DialogCode.Accepted:
             return
 
-        file_path = selected.get("path")
-        if not file_path:
-            QMessageBox.warning(self, "Senha 167", "Nenhum arquivo XLSX selecionado.")
+        file_paths = selected.get("paths") or []
+        if not file_paths:
+            QMessageBox.warning(self, "Senha 167", "Nenhum arquivo selecionado.")
             return
 
-        try:
-            helper = AdicionarOrdensNovas2(file_path)
-            df = helper.load_xlsx()
-            df_manip = helper.Manipular_Dados(df=df)
-            print("=== XLSX processado (Senha 167) ===")
-            if df_manip is None or isinstance(df_manip, str):
-                print(df_manip)
+        self._start_order_import("Senha 167", file_paths)
+
+    def _start_order_import(self, origin: str, file_paths: List[str]) -> None:
+        if self._import_worker is not None:
+            QMessageBox.information(self, origin, "Já existe uma importação em andamento.")
+            return
+        worker = OrderImportWorker(origin, file_paths)
+        progress = QProgressDialog("Preparando importação...", "Cancelar", 0, 100, self)
+        progress.setWindowTitle(origin)
+        # Sem modal: a prévia parcial pode ser rolada enquanto o resto é processado.
+        progress.setWindowModality(Qt.WindowModality.NonModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(worker.cancel)
+        worker.signals.progress.connect(self._on_order_import_progress)
+        worker.signals.rows.connect(lambda df: self._on_order_import_rows(origin, df))
+        worker.signals.finished.connect(lambda result: self._on_order_import_finished(origin, result))
+        worker.signals.failed.connect(lambda msg: self._on_order_import_failed(origin, msg))
+        worker.signals.cancelled.connect(lambda: self._on_order_import_cancelled(origin))
+        self._import_worker = worker
+        self._import_progress = progress
+        self._import_origin = origin
+        self._preview_stream = {"origin": origin, "columns": None, "keys": [], "rows": 0, "valor": 0.0}
+        # "Solicitar confirmação" só volta a existir quando a importação termina.
+        self._preview_add_button(origin).setEnabled(False)
+        progress.show()
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_order_import_progress(self, stage: str, percent: int) -> None:
+        if self._import_progress is None or self._import_progress.wasCanceled():
+            return
+        self._import_progress.setLabelText(f"{stage}...")
+        self._import_progress.setValue(percent)
+
+    def _finish_order_import(self) -> None:
+        if self._import_progress is not None:
+            self._import_progress.close()
+        if self._import_origin is not None:
+            self._preview_add_button(self._import_origin).setEnabled(True)
+        self._import_progress = None
+        self._import_worker = None
+        self._import_origin = None
+
+    def _preview_table(self, origin: str):
+        return self.table_preview_167 if "167" in origin else self.table_preview_171
+
+    def _preview_add_button(self, origin: str):
+        return self.btn_add_orders167 if "167" in origin else self.btn_add_orders171
+
+    def _on_order_import_rows(self, origin: str, df) -> None:
+        """Acrescenta à prévia um bloco recém-processado; a tabela fica sem ordenação até o fim."""
+        stream = self._preview_stream
+        if stream is None or stream["origin"] != origin or df is None or df.empty:
+            return
+        table = self._preview_table(origin)
+        if stream["columns"] is None:
+            stream["columns"] = self._preview_columns(df)
+            self._reset_preview_table(table, stream["columns"])
+            setattr(self, "_last_preview_df_167" if "167" in origin else "_last_preview_df_171", None)
+        self._append_preview_rows(table, df, stream["columns"])
+        stream["keys"].append(order_keys(df).to_numpy())
+        stream["rows"] += len(df.index)
+        stream["valor"] += self._valor_total(df)
+        self._set_preview_status(
+            origin, f"Carregando prévia... {stream['rows']} ordens até agora · Valor: {self._format_brl(stream['valor'])}"
+        )
+
+    def _end_preview_stream(self, origin: str, df) -> bool:
+        """Fecha a prévia parcial. Devolve True quando ela já é exatamente a prévia final ``df``."""
+        stream, self._preview_stream = self._preview_stream, None
+        if stream is None or stream["columns"] is None:
+            return False
+        table = self._preview_table(origin)
+        same = (
+            df is not None
+            and stream["columns"] == self._preview_columns(df)
+            and stream["rows"] == len(df.index)
+            and np.array_equal(np.concatenate(stream["keys"]), order_keys(df).to_numpy())
+        )
+        if same:
+            self._finish_preview_table(table)
+        else:
+            self._clear_preview_table(table)
+            self._set_preview_status(origin, "")
+        return same
+
+    def _set_preview_status(self, origin: str, text: str) -> None:
+        label = self.lbl_preview_status_167 if "167" in origin else self.lbl_preview_status_171
+        label.setText(text)
+
+    def _preview_summary(self, df) -> str:
+        return f"{len(df.index)} ordens na prévia · Valor total: {self._format_brl(self._valor_total(df))}"
+
+    @staticmethod
+    def _valor_total(df) -> float:
+        if "Valor" not in df.columns:
+            return 0.0
+        return float(pd.to_numeric(df["Valor"], errors="coerce").sum())
+
+    @staticmethod
+    def _format_brl(value: float) -> str:
+        text = f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+        return f"R$ {text}"
+
+    def _on_order_import_finished(self, origin: str, result) -> None:
+        self._finish_order_import()
+        df = result.df
+        known = self._known_files_text(result)
+        if df is None or df.empty or result.covering_request is not None:
+            self._end_preview_stream(origin, None)
+        if df is None or df.empty:
+            if result.skipped_existing:
+                msg = (
+                    f"Nenhuma ordem nova: as {result.skipped_existing} ordens do arquivo já estão cadastradas."
+                    f"\n{self._diff_text(result)}"
+                )
+            elif result.files or not known:
+                msg = "Nenhuma ordem encontrada no arquivo."
             else:
-                print(df_manip)
-                self._populate_preview_table_167(df_manip)
-                self._set_orders167_confirm_state(True)
-                self._last_preview_df_167 = df_manip.copy()
-            QMessageBox.information(self, "Senha 167", "Arquivo processado. Veja o console para prévia dos dados.")
-        except Exception as exc:  # noqa: BLE001
-            QMessageBox.critical(self, "Senha 167", f"Erro ao processar o XLSX: {exc}")
+                msg = ""
+            QMessageBox.information(self, origin, "\n\n".join(part for part in (known, msg) if part))
+            return
+        if result.covering_request is not None:
+            QMessageBox.information(
+                self,
+                origin,
+                f"As {len(df.index)} ordens da prévia já estão na solicitação #{result.covering_request}, "
+                "que aguarda confirmação. Nada foi carregado.",
+            )
+            return
+        # A prévia parcial só é refeita quando difere da final (arquivos repetidos, pool fora de ordem, cache).
+        streamed = self._end_preview_stream(origin, df)
+        if "167" in origin:
+            if streamed:
+                self._last_preview_df_167 = df
+            else:
+                self._populate_preview_table_167(df)
+            self._last_import_files_167 = list(result.files)
+            self._set_orders167_confirm_state(True)
+        else:
+            if streamed:
+                self._last_preview_df_171 = df
+            else:
+                self._populate_preview_table_171(df)
+            self._last_import_files_171 = list(result.files)
+            self._set_orders171_confirm_state(True)
+        self._set_preview_status(origin, self._preview_summary(df))
+        if len(result.files) > 1:
+            msg = self._import_report_text(result)
+        else:
+            msg = "Arquivo processado. Confira a prévia antes de solicitar a confirmação."
+            if result.duplicates:
+                msg = f"{result.duplicates} ordem(ns) repetida(s) descartada(s); vale a última ocorrência.\n\n{msg}"
+            if result.skipped_existing:
+                msg = f"{self._diff_text(result)}\n\n{msg}"
+        if known:
+            msg = f"{known}\n\n{msg}"
+        validation = result.validation
+        if validation is not None and validation.issues:
+            QMessageBox.warning(self, origin, f"{msg}\n\nPontos a revisar na planilha:\n{validation.summary()}")
+            return
+        QMessageBox.information(self, origin, msg)
+
+    @staticmethod
+    def _known_files_text(result) -> str:
+        if not result.known_files:
+            return ""
+        lines = ["Arquivo(s) já enviado(s) antes, não importado(s) de novo:"]
+        for known in result.known_files:
+            lines.append(f"{Path(known.file_path).name}: solicitação #{known.request_id} ({known.status})")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _diff_text(result) -> str:
+        """Resumo novas/alteradas/iguais frente às ordens já cadastradas."""
+        diff = result.diff
+        changed = diff.get(order_repository.ROW_CHANGED, 0)
+        parts = [
+            f"{diff.get(order_repository.ROW_NEW, 0)} novas",
+            f"{changed} alteradas",
+            f"{diff.get(order_repository.ROW_UNCHANGED, 0)} iguais",
+        ]
+        unknown = diff.get(order_repository.ROW_UNKNOWN, 0)
+        if unknown:
+            parts.append(f"{unknown} já cadastradas sem hash para comparar")
+        text = f"Frente às ordens cadastradas: {', '.join(parts)}."
+        if changed:
+            text += " As alteradas não entram na solicitação; vale a versão já cadastrada."
+        return text
+
+    @staticmethod
+    def _import_report_text(result, limit: int = 20) -> str:
+        parts = "abas/arquivos" if any(report.sheet for report in result.files) else "arquivos"
+        lines = [f"{len(result.files)} {parts} processados, {len(result.df.index)} ordens na prévia."]
+        if result.skipped_existing:
+            lines.append(DashboardWindow._diff_text(result))
+        if result.duplicates:
+            lines.append(
+                f"{result.duplicates} ordem(ns) repetida(s) descartada(s); vale a última ocorrência, "
+                "com os arquivos em ordem alfabética e as abas na ordem da planilha."
+            )
+        lines.append("")
+        for report in result.files[:limit]:
+            origem = " (cache)" if report.from_cache else ""
+            name = source_name(report.file_path, report.sheet)
+            lines.append(f"{name}: {report.rows} linhas em {report.seconds:.1f}s{origem}")
+        if len(result.files) > limit:
+            lines.append(f"... e mais {len(result.files) - limit} arquivo(s).")
+        lines.append("")
+        lines.append("Confira a prévia antes de solicitar a confirmação.")
+        return "\n".join(lines)
+
+    def _on_order_import_failed(self, origin: str, message: str) -> None:
+        self._finish_order_import()
+        self._end_preview_stream(origin, None)
+        QMessageBox.critical(self, origin, f"Erro ao processar o arquivo: {message}")
+
+    def _on_order_import_cancelled(self, origin: str) -> None:
+        self._finish_order_import()
+        self._end_preview_stream(origin, None)
+        QMessageBox.information(self, origin, "Importação cancelada.")
 
     def _populate_preview_table_167(self, df) -> None:
         if not hasattr(self, "table_preview_167"):
             return
         table = self.table_preview_167
-        table.setSortingEnabled(False)
-        table.clear()
-
         if df is None:
-            table.setRowCount(0)
-            table.setColumnCount(0)
-            table.setSortingEnabled(True)
+            self._clear_preview_table(table)
             return
 
-        columns = list(df.columns)
+        columns = self._preview_columns(df)
+        self._reset_preview_table(table, columns)
+        self._append_preview_rows(table, df, columns)
+        self._finish_preview_table(table)
+        self._last_preview_df_167 = df
+
+    @staticmethod
+    def _preview_columns(df) -> List[str]:
+        # O hash da linha só serve para comparar com as ordens cadastradas; não aparece na tela.
+        return [col for col in df.columns if col != ROW_HASH_COLUMN]
+
+    @staticmethod
+    def _clear_preview_table(table) -> None:
+        table.setSortingEnabled(False)
+        table.clear()
+        table.setRowCount(0)
+        table.setColumnCount(0)
+        table.setSortingEnabled(True)
+
+    @staticmethod
+    def _reset_preview_table(table, columns: List[str]) -> None:
+        table.setSortingEnabled(False)
+        table.clear()
+        table.setRowCount(0)
         table.setColumnCount(len(columns))
 
         header_items = []
@@ -1428,17 +1703,24 @@ class DashboardWindow(QMainWindow):
         for idx, item in enumerate(header_items):
             table.setHorizontalHeaderItem(idx, item)
 
+    @staticmethod
+    def _append_preview_rows(table, df, columns: List[str]) -> None:
+        """Acrescenta as linhas de ``df`` no fim da tabela; colunas que o bloco não tem ficam vazias."""
+        start = table.rowCount()
         rows = len(df.index)
-        table.setRowCount(rows)
+        table.setRowCount(start + rows)
+        present = [(col_idx, col_name) for col_idx, col_name in enumerate(columns) if col_name in df.columns]
 
         for row_idx in range(rows):
             row_series = df.iloc[row_idx]
-            for col_idx, col_name in enumerate(columns):
+            for col_idx, col_name in present:
                 val = row_series[col_name]
                 val_str = "" if val is None else str(val)
                 item = QTableWidgetItem(val_str)
-                table.setItem(row_idx, col_idx, item)
+                table.setItem(start + row_idx, col_idx, item)
 
+    @staticmethod
+    def _finish_preview_table(table) -> None:
         header_view = table.horizontalHeader()
         header_view.setStretchLastSection(False)
         header_view.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
@@ -1446,7 +1728,6 @@ class DashboardWindow(QMainWindow):
         table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         table.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
         table.setSortingEnabled(True)
-        self._last_preview_df_167 = df.copy()
 
     def _handle_download_preview_167(self) -> None:
         if self._last_preview_df_167 is None or getattr(self._last_preview_df_167, "empty", True):
@@ -1458,7 +1739,7 @@ class DashboardWindow(QMainWindow):
         if not dest_path:
             return
         try:
-            self._last_preview_df_167.to_excel(dest_path, index=False)
+            self._last_preview_df_167.drop(columns=ROW_HASH_COLUMN, errors="ignore").to_excel(dest_path, index=False)
             QMessageBox.information(self, "Senha 167", f"Prévia salva em:\n{dest_path}")
         except Exception as exc:  # noqa: BLE001
             QMessageBox.critical(self, "Senha 167", f"Erro ao salvar a prévia: {exc}")
@@ -1480,7 +1761,9 @@ class DashboardWindow(QMainWindow):
 
     def _on_add_orders_171_clicked(self) -> None:
         if getattr(self, "_orders171_pending_confirm", False):
-            self._submit_order_confirmation("Senha 171", "_last_preview_df_171", self._set_orders171_confirm_state)
+            self._submit_order_confirmation(
+                "Senha 171", "_last_preview_df_171", "_last_import_files_171", self._set_orders171_confirm_state
+            )
             return
         self._handle_add_orders_171()
 
@@ -1493,33 +1776,51 @@ class DashboardWindow(QMainWindow):
 
     def _handle_add_orders_171(self) -> None:
         dialog = QDialog(self)
-        dialog.setWindowTitle("Importar ordens (xlsx)")
+        dialog.setWindowTitle("Importar ordens")
         dialog.setModal(True)
         v = QVBoxLayout(dialog)
         v.setContentsMargins(16, 16, 16, 16)
         v.setSpacing(10)
 
-        label = QLabel("Selecione um arquivo XLSX com as ordens.")
+        label = QLabel("Selecione um ou mais arquivos com as ordens (XLSX, CSV, Parquet ou ODS) ou uma pasta.")
         v.addWidget(label)
 
         file_display = QLabel("Nenhum arquivo selecionado")
         file_display.setObjectName("mutedText")
-        pick_btn = QPushButton("Escolher arquivo")
+        pick_btn = QPushButton("Escolher arquivos")
         pick_btn.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        selected: Dict[str, str | None] = {"path": None}
+        folder_btn = QPushButton("Escolher pasta")
+        folder_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+
+        selected: Dict[str, List[str]] = {"paths": []}
+
+        def _set_selection(paths: List[str]) -> None:
+            selected["paths"] = paths
+            if len(paths) == 1:
+                file_display.setText(Path(paths[0]).name)
+            elif paths:
+                file_display.setText(f"{len(paths)} arquivos selecionados")
+            else:
+                file_display.setText("Nenhum arquivo selecionado")
 
         def _pick() -> None:
-            chosen, _ = QFileDialog.getOpenFileName(dialog, "Selecionar XLSX", "", "Planilhas (*.xlsx)")
+            chosen, _ = QFileDialog.getOpenFileNames(dialog, "Selecionar planilhas", "", file_dialog_filter())
             if chosen:
-                selected["path"] = chosen
-                file_display.setText(Path(chosen).name)
+                _set_selection(chosen)
+
+        def _pick_folder() -> None:
+            folder = QFileDialog.getExistingDirectory(dialog, "Selecionar pasta com as planilhas")
+            if folder:
+                _set_selection(list_supported_files(folder))
 
         pick_btn.clicked.connect(_pick)
+        folder_btn.clicked.connect(_pick_folder)
 
         row = QHBoxLayout()
         row.setSpacing(8)
         row.addWidget(pick_btn, 0)
+        row.addWidget(folder_btn, 0)
         row.addWidget(file_display, 1)
         v.addLayout(row)
 
@@ -1540,86 +1841,34 @@ class DashboardWindow(QMainWindow):
         if dialog.exec() != QDialog.DialogCode.Accepted:
             return
 
-        file_path = selected.get("path")
-        if not file_path:
-            QMessageBox.warning(self, "Senha 171", "Nenhum arquivo XLSX selecionado.")
+        file_paths = selected.get("paths") or []
+        if not file_paths:
+            QMessageBox.warning(self, "Senha 171", "Nenhum arquivo selecionado.")
             return
 
-        try:
-            helper = AdicionarOrdensNovas(file_path)
-            df = helper.load_xlsx()
-            df_manip = helper.Manipular_Dados(df=df)
-            print("=== XLSX processado (Senha 171) ===")
-            if df_manip is None or isinstance(df_manip, str):
-                print(df_manip)
-            else:
-                print(df_manip)
-                self._populate_preview_table_171(df_manip)
-                self._set_orders171_confirm_state(True)
-                self._last_preview_df_171 = df_manip.copy()
-            QMessageBox.information(self, "Senha 171", "Arquivo processado. Veja o console para prévia dos dados.")
-        except Exception as exc:  # noqa: BLE001
-            QMessageBox.critical(self, "Senha 171", f"Erro ao processar o XLSX: {exc}")
+        self._start_order_import("Senha 171", file_paths)
 
     def _populate_preview_table_171(self, df) -> None:
         if not hasattr(self, "table_preview_171"):
             return
         table = self.table_preview_171
-        table.setSortingEnabled(False)
-        table.clear()
-
         if df is None:
-            table.setRowCount(0)
-            table.setColumnCount(0)
-            table.setSortingEnabled(True)
+            self._clear_preview_table(table)
             return
 
-        columns = list(df.columns)
-        table.setColumnCount(len(columns))
+        columns = self._preview_columns(df)
+        self._reset_preview_table(table, columns)
+        self._append_preview_rows(table, df, columns)
+        self._finish_preview_table(table)
+        self._last_preview_df_171 = df
 
-        header_items = []
-        for col_name in columns:
-            item = QTableWidgetItem(col_name)
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            item.setForeground(Qt.GlobalColor.white)
-            item.setBackground(QColor("#0f265c"))
-            if col_name.strip().lower() == "valor":
-                item.setBackground(QColor("#ffeb00"))
-                item.setForeground(Qt.GlobalColor.black)
-            header_items.append(item)
-
-        for idx, item in enumerate(header_items):
-            table.setHorizontalHeaderItem(idx, item)
-
-        rows = len(df.index)
-        table.setRowCount(rows)
-
-        for row_idx in range(rows):
-            row_series = df.iloc[row_idx]
-            for col_idx, col_name in enumerate(columns):
-                val = row_series[col_name]
-                val_str = "" if val is None else str(val)
-                item = QTableWidgetItem(val_str)
-                table.setItem(row_idx, col_idx, item)
-
-        header_view = table.horizontalHeader()
-        header_view.setStretchLastSection(False)
-        header_view.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        header_view.setMinimumSectionSize(90)
-        table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        table.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
-        table.setSortingEnabled(True)
-        self._last_preview_df_171 = df.copy()
-
-    def _submit_order_confirmation(self, origin: str, df_attr: str, reset_state) -> None:
+    def _submit_order_confirmation(self, origin: str, df_attr: str, files_attr: str, reset_state) -> None:
         df = getattr(self, df_attr, None)
         if df is None or getattr(df, "empty", True):
             QMessageBox.warning(self, origin, "Nenhuma prévia carregada para solicitar confirmação.")
             return
         try:
-            self.order_service.submit_request(origin, df)
+            self.order_service.submit_request(origin, df, getattr(self, files_attr, []))
             QMessageBox.information(self, origin, "Solicitação enviada para 'Solicitações'.")
             reset_state(False)
         except Exception as exc:  # noqa: BLE001
@@ -1635,7 +1884,7 @@ class DashboardWindow(QMainWindow):
         if not dest_path:
             return
         try:
-            self._last_preview_df_171.to_excel(dest_path, index=False)
+            self._last_preview_df_171.drop(columns=ROW_HASH_COLUMN, errors="ignore").to_excel(dest_path, index=False)
             QMessageBox.information(self, "Senha 171", f"Prévia salva em:\n{dest_path}")
         except Exception as exc:  # noqa: BLE001
             QMessageBox.critical(self, "Senha 171", f"Erro ao salvar a prévia: {exc}")
@@ -1650,8 +1899,7 @@ class DashboardWindow(QMainWindow):
         table.clearContents()
         table.setRowCount(0)
         try:
-            with Session(engine) as session:
-                users = user_repository.list_all(session)
+            users = user_repository.list_all_cached()
         except Exception as exc:  # noqa: BLE001
             QMessageBox.critical(self, "Usuários", f"Erro ao carregar usuários: {exc}")
             table.setRowCount(0)
@@ -1989,9 +2237,169 @@ class DashboardWindow(QMainWindow):
 
         layout.addWidget(info_card)
         layout.addWidget(pw_card)
+
+        if self.is_admin:
+            cache_card = QFrame()
+            cache_card.setObjectName("infoCard")
+            cache_layout = QVBoxLayout(cache_card)
+            cache_layout.setContentsMargins(16, 16, 16, 16)
+            cache_layout.setSpacing(8)
+            cache_title = QLabel("Cache de importação")
+            cache_title.setObjectName("cardTitle")
+            cache_layout.addWidget(cache_title)
+            cache_layout.addWidget(QLabel("Planilhas já processadas são reaproveitadas ao serem importadas de novo."))
+            clear_cache_btn = QPushButton("Limpar cache")
+            clear_cache_btn.clicked.connect(self._handle_clear_import_cache)
+            cache_layout.addWidget(clear_cache_btn)
+            layout.addWidget(cache_card)
+            layout.addWidget(self._build_drop_folder_card())
+            layout.addWidget(self._build_region_mapping_card())
+
         layout.addStretch(1)
         return page
 
+    def _build_drop_folder_card(self) -> QWidget:
+        card = QFrame()
+        card.setObjectName("infoCard")
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(16, 16, 16, 16)
+        card_layout.setSpacing(8)
+        title = QLabel("Pastas monitoradas")
+        title.setObjectName("cardTitle")
+        card_layout.addWidget(title)
+        card_layout.addWidget(
+            QLabel("Planilhas gravadas nestas pastas são importadas e viram solicitações pendentes automaticamente.")
+        )
+        claim_hint = QLabel(
+            f"Cada arquivo é movido para '{CLAIM_DIR}' antes da importação e depois para "
+            f"'{DONE_DIR}' ou '{ERROR_DIR}'; assim duas estações na mesma pasta não importam o mesmo arquivo."
+        )
+        claim_hint.setWordWrap(True)
+        card_layout.addWidget(claim_hint)
+        grid = QGridLayout()
+        for row, origin in enumerate(DROP_FOLDER_ORIGINS):
+            folder_edit = QLineEdit(load_drop_folder(origin))
+            folder_edit.setReadOnly(True)
+            folder_edit.setPlaceholderText("Desativada")
+            choose_btn = QPushButton("Escolher pasta")
+            choose_btn.clicked.connect(lambda _=False, o=origin: self._handle_choose_drop_folder(o))
+            off_btn = QPushButton("Desativar")
+            off_btn.clicked.connect(lambda _=False, o=origin: self._set_drop_folder(o, ""))
+            grid.addWidget(QLabel(origin), row, 0)
+            grid.addWidget(folder_edit, row, 1)
+            grid.addWidget(choose_btn, row, 2)
+            grid.addWidget(off_btn, row, 3)
+            self._drop_folder_edits[origin] = folder_edit
+        grid.setColumnStretch(1, 1)
+        card_layout.addLayout(grid)
+        return card
+
+    def _build_region_mapping_card(self) -> QWidget:
+        card = QFrame()
+        card.setObjectName("infoCard")
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(16, 16, 16, 16)
+        card_layout.setSpacing(8)
+        title = QLabel("Filiais (Senha 167)")
+        title.setObjectName("cardTitle")
+        card_layout.addWidget(title)
+        hint = QLabel(
+            f"Planilha com '{MAPPING_KEY}' e {', '.join(ENRICHED_COLUMNS)}. "
+            "Na importação, essas colunas vazias são preenchidas pela filial."
+        )
+        hint.setWordWrap(True)
+        card_layout.addWidget(hint)
+        self.lbl_region_mapping = QLabel()
+        card_layout.addWidget(self.lbl_region_mapping)
+        import_btn = QPushButton("Importar planilha de filiais")
+        import_btn.clicked.connect(self._handle_import_region_mapping)
+        card_layout.addWidget(import_btn)
+        self._refresh_region_mapping_label()
+        return card
+
+    def _refresh_region_mapping_label(self) -> None:
+        try:
+            total = len(load_mapping().keys)
+        except Exception as exc:  # noqa: BLE001
+            self.lbl_region_mapping.setText(f"Não foi possível ler a tabela de filiais: {exc}")
+            return
+        self.lbl_region_mapping.setText(f"{total} filial(is) cadastrada(s).")
+
+    def _handle_import_region_mapping(self) -> None:
+        file_path, _ = QFileDialog.getOpenFileName(self, "Planilha de filiais", "", file_dialog_filter())
+        if not file_path:
+            return
+        try:
+            total = import_mapping_file(file_path)
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "Erro", f"Falha ao importar as filiais: {exc}")
+            return
+        self._refresh_region_mapping_label()
+        QMessageBox.information(self, "Filiais", f"{total} filial(is) carregada(s).")
+
+    def _handle_choose_drop_folder(self, origin: str) -> None:
+        folder = QFileDialog.getExistingDirectory(self, f"Pasta monitorada - {origin}", load_drop_folder(origin))
+        if folder:
+            self._set_drop_folder(origin, folder)
+
+    def _set_drop_folder(self, origin: str, folder: str) -> None:
+        try:
+            save_drop_folder(origin, folder)
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "Erro", f"Falha ao salvar a pasta monitorada: {exc}")
+            return
+        edit = self._drop_folder_edits.get(origin)
+        if edit is not None:
+            edit.setText(folder)
+        if self._watch_drop_folder(origin, folder) is False:
+            QMessageBox.warning(self, origin, f"Não foi possível monitorar a pasta:\n{folder}")
+
+    def _start_drop_watchers(self) -> None:
+        # A pasta é configurada (e monitorada) só na sessão de administrador.
+        if not self.is_admin:
+            return
+        for origin in DROP_FOLDER_ORIGINS:
+            folder = load_drop_folder(origin)
+            if folder and self._watch_drop_folder(origin, folder) is False:
+                self.statusBar().showMessage(f"{origin}: pasta monitorada indisponível ({folder}).", 15000)
+
+    def _watch_drop_folder(self, origin: str, folder: str) -> bool | None:
+        """(Re)inicia o monitoramento de ``origin``; None quando a pasta foi desativada."""
+        old = self._drop_watchers.pop(origin, None)
+        if old is not None:
+            old.stop()
+            old.deleteLater()
+        if not folder:
+            return None
+        watcher = DropFolderWatcher(origin, folder, self)
+        watcher.processed.connect(
+            lambda path, request_id, message, o=origin: self._on_drop_folder_processed(o, path, request_id, message)
+        )
+        if not watcher.start():
+            watcher.deleteLater()
+            return False
+        self._drop_watchers[origin] = watcher
+        return True
+
+    def _on_drop_folder_processed(self, origin: str, path: str, request_id, message: str) -> None:
+        self.statusBar().showMessage(f"{origin} - {Path(path).name}: {message}", 15000)
+        if request_id is not None:
+            self._load_requests()
+
+    def closeEvent(self, event) -> None:
+        for watcher in self._drop_watchers.values():
+            watcher.stop()
+        self._drop_watchers.clear()
+        super().closeEvent(event)
+
+    def _handle_clear_import_cache(self) -> None:
+        try:
+            removed = import_cache.clear()
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "Erro", f"Falha ao limpar o cache: {exc}")
+            return
+        QMessageBox.information(self, "Cache", f"{removed} planilha(s) removida(s) do cache.")
+
     def _switch_page(self, index: int) -> None:
         if not self.is_admin and index in (3, 7):
             QMessageBox.warning(self, "Acesso restrito", "Apenas administradores podem acessar esta área.")
@@ -2243,12 +2651,34 @@ class DashboardWindow(QMainWindow):
         reject_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         reject_btn.clicked.connect(lambda: self._handle_request_action(req.id, kind, approve=False))
 
+        if kind == "ordem":
+            preview_btn = QPushButton("Baixar prévia")
+            preview_btn.setObjectName("secondaryButton")
+            preview_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            preview_btn.clicked.connect(lambda: self._download_order_request_preview(req.id, req.origin))
+            btn_col.addWidget(preview_btn)
+
         btn_col.addWidget(accept_btn)
         btn_col.addWidget(reject_btn)
         layout.addLayout(btn_col)
 
         return card
 
+    def _download_order_request_preview(self, request_id: int, origin: str) -> None:
+        try:
+            df = self.order_service.load_request_frame(request_id)
+            if df is None or df.empty:
+                QMessageBox.information(self, "Solicitações", "Nenhuma ordem armazenada para esta solicitação.")
+                return
+            suggested = str(Path.home() / f"solicitacao_{request_id}.xlsx")
+            dest_path, _ = QFileDialog.getSaveFileName(self, "Salvar prévia", suggested, "Planilha Excel (*.xlsx)")
+            if not dest_path:
+                return
+            df.drop(columns=ROW_HASH_COLUMN, errors="ignore").to_excel(dest_path, index=False)
+            QMessageBox.information(self, origin, f"Prévia salva em:\n{dest_path}")
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "Solicitações", f"Erro ao exportar a prévia: {exc}")
+
     def _handle_request_action(self, request_id: int, kind: str, approve: bool) -> None:
         try:
             if kind in {"registro", "senha", "pop"}:
@@ -2309,8 +2739,7 @@ class DashboardWindow(QMainWindow):
 
     def _resolve_user_type(self, user_name: str, email: str) -> str:
         try:
-            with Session(engine) as session:
-                user = user_repository.get_by_email(session, email)
+            user = user_repository.get_by_email_cached(email)
             if user and "admin" in user.name.lower():
                 return "Administrador"
             if "admin" in f"{user_name} {email}".lower():
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QSettings, QThreadPool, QTimer, pyqtSignal
+
+from services.order_readers import list_supported_files
+from ui.import_worker import DropFolderImportWorker
+
+DROP_FOLDER_ORIGINS = ("Senha 167", "Senha 171")
+# Espera após o último evento da pasta antes de olhar os arquivos (cópias chegam em rajadas).
+DEBOUNCE_MS = 2000
+# Arquivos na fila de importação; o excedente fica na pasta para a próxima varredura.
+MAX_QUEUE = 20
+# Subpastas da pasta monitorada: o arquivo é movido para CLAIM_DIR antes de ser importado
+# (quem consegue mover fica com ele) e, ao terminar, para DONE_DIR ou ERROR_DIR.
+CLAIM_DIR = "processando"
+DONE_DIR = "importados"
+ERROR_DIR = "com_erro"
+
+_SETTINGS_ORG = "ControleEstoque"
+_SETTINGS_APP = "Dashboard"
+
+Signature = Tuple[int, int]
+
+
+def _settings() -> QSettings:
+    return QSettings(_SETTINGS_ORG, _SETTINGS_APP)
+
+
+def _settings_key(origin: str) -> str:
+    return f"pasta_monitorada/{origin.replace(' ', '_')}"
+
+
+def load_drop_folder(origin: str) -> str:
+    return str(_settings().value(_settings_key(origin), "") or "")
+
+
+def save_drop_folder(origin: str, folder: str) -> None:
+    settings = _settings()
+    if folder:
+        settings.setValue(_settings_key(origin), folder)
+    else:
+        settings.remove(_settings_key(origin))
+    settings.sync()
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _readable(path: str) -> bool:
+    # No Windows o arquivo ainda aberto para escrita (cópia, Excel salvando) não abre.
+    try:
+        with open(path, "rb"):
+            return True
+    except OSError:
+        return False
+
+
+def _free_path(folder: str, name: str) -> str:
+    stem, ext = os.path.splitext(name)
+    target = os.path.join(folder, name)
+    n = 1
+    while os.path.exists(target):
+        target = os.path.join(folder, f"{stem} ({n}){ext}")
+        n += 1
+    return target
+
+
+def _move_into(path: str, folder: str) -> Optional[str]:
+    """Move ``path`` para ``folder`` (criada se preciso), sem sobrescrever; None se não deu.
+
+    A troca de nome é atômica no mesmo volume: se outra estação moveu o arquivo antes,
+    a origem já não existe e a chamada falha aqui, em vez de importar duas vezes.
+    """
+    try:
+        os.makedirs(folder, exist_ok=True)
+        target = _free_path(folder, os.path.basename(path))
+        os.rename(path, target)
+    except OSError:
+        return None
+    return target
+
+
+def claim_file(path: str) -> Optional[str]:
+    """Reserva ``path`` movendo-o para ``CLAIM_DIR``; None quando outra estação ficou com ele."""
+    return _move_into(path, os.path.join(os.path.dirname(path), CLAIM_DIR))
+
+
+def release_file(claimed: str, failed: bool) -> Optional[str]:
+    """Tira o arquivo de ``CLAIM_DIR`` depois da importação, para ``DONE_DIR`` ou ``ERROR_DIR``."""
+    top = os.path.dirname(os.path.dirname(claimed))
+    return _move_into(claimed, os.path.join(top, ERROR_DIR if failed else DONE_DIR))
+
+
+class DropFolderWatcher(QObject):
+    """Importa sozinho os arquivos que chegam em ``folder`` e cria as solicitações pendentes.
+
+    Um arquivo só entra na fila quando tamanho e data de modificação se repetem em
+    duas varreduras seguidas e ele pode ser aberto, ou seja, terminou de ser gravado.
+    Antes de importar, o arquivo é movido para ``processando/``; com várias estações
+    na mesma pasta, só a que conseguiu mover importa. Os arquivos são importados um
+    por vez; arquivos já recebidos são barrados pelo hash de conteúdo da importação,
+    inclusive depois de reabrir o programa. O que ficar em ``processando/`` após uma
+    queda do programa não é retomado sozinho: basta devolvê-lo à pasta.
+    """
+
+    # (arquivo, id da solicitação criada ou None, mensagem)
+    processed = pyqtSignal(str, object, str)
+
+    def __init__(self, origin: str, folder: str, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.origin = origin
+        self.folder = folder
+        self._seen: Dict[str, Signature] = {}
+        self._done: Dict[str, Signature] = {}
+        self._queue: Deque[str] = deque()
+        self._running: Optional[str] = None
+        self._claimed: Optional[str] = None
+        self._worker: Optional[DropFolderImportWorker] = None
+        self._stopped = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._scan)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_scan)
+
+    def start(self) -> bool:
+        if not os.path.isdir(self.folder) or not self._watcher.addPath(self.folder):
+            return False
+        # Arquivos que já estavam na pasta também são considerados.
+        self._schedule_scan()
+        return True
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._timer.stop()
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+        self._queue.clear()
+
+    def _schedule_scan(self, *_args) -> None:
+        if not self._stopped:
+            self._timer.start()  # reinicia a espera a cada evento
+
+    def _scan(self) -> None:
+        if self._stopped:
+            return
+        try:
+            paths = list_supported_files(self.folder)
+        except OSError:
+            paths = []
+        waiting = False
+        present = set(paths)
+        for path in paths:
+            if path == self._running or path in self._queue:
+                continue
+            sig = _signature(path)
+            if sig is None or self._done.get(path) == sig:
+                continue
+            previous = self._seen.get(path)
+            self._seen[path] = sig
+            if previous != sig or sig[0] == 0 or not _readable(path):
+                waiting = True  # ainda sendo gravado: confere de novo na próxima varredura
+                continue
+            if len(self._queue) >= MAX_QUEUE:
+                waiting = True
+                continue
+            self._queue.append(path)
+        for path in list(self._seen):
+            if path not in present:
+                self._seen.pop(path, None)
+                self._done.pop(path, None)
+        if waiting:
+            self._timer.start()
+        self._start_next()
+
+    def _start_next(self) -> None:
+        if self._stopped or self._running is not None:
+            return
+        while self._queue:
+            path = self._queue.popleft()
+            claimed = claim_file(path)
+            if claimed is None:
+                # Outra estação já moveu o arquivo (ou ele está travado): não importa aqui.
+                sig = self._seen.get(path)
+                if sig is not None:
+                    self._done[path] = sig
+                continue
+            worker = DropFolderImportWorker(self.origin, claimed)
+            worker.signals.finished.connect(self._on_finished)
+            self._running = path
+            self._claimed = claimed
+            self._worker = worker
+            QThreadPool.globalInstance().start(worker)
+            return
+
+    def _on_finished(self, claimed: str, request_id, message: str) -> None:
+        path = self._running or claimed
+        failed = self._worker is not None and self._worker.failed
+        self._running = None
+        self._claimed = None
+        self._worker = None
+        if release_file(claimed, failed) is None:
+            message = f"{message} (arquivo ficou em '{CLAIM_DIR}')"
+        if self._stopped:
+            return
+        self.processed.emit(path, request_id, message)
+        self._start_next()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from typing import List, Sequence
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from services.order_import_service import ImportCancelled, OrderImportService, prefers_isolation
+from services.order_service import OrderService
+
+
+class ImportWorkerSignals(QObject):
+    progress = pyqtSignal(str, int)
+    rows = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class DropFolderWorkerSignals(QObject):
+    # (arquivo, id da solicitação criada ou None, mensagem)
+    finished = pyqtSignal(str, object, str)
+
+
+class OrderImportWorker(QRunnable):
+    """Roda o pipeline de importação no QThreadPool e devolve o resultado por sinais."""
+
+    def __init__(self, origin: str, file_paths: Sequence[str]) -> None:
+        super().__init__()
+        self.origin = origin
+        self.file_paths: List[str] = list(file_paths)
+        self.signals = ImportWorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        # Planilhas grandes vão para o pool, como na pasta monitorada; as pequenas ficam na thread.
+        service = OrderImportService(self.origin, isolated=prefers_isolation(self.file_paths))
+        try:
+            result = service.run_many(
+                self.file_paths,
+                progress=self.signals.progress.emit,
+                is_cancelled=self._cancel_event.is_set,
+                on_chunk=self.signals.rows.emit,
+            )
+        except ImportCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as exc:  # noqa: BLE001
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.finished.emit(result)
+
+
+class DropFolderImportWorker(QRunnable):
+    """Importa um arquivo da pasta monitorada e, havendo ordens novas, cria a solicitação pendente."""
+
+    def __init__(self, origin: str, file_path: str) -> None:
+        super().__init__()
+        self.origin = origin
+        self.file_path = file_path
+        self.signals = DropFolderWorkerSignals()
+        self.failed = False
+
+    def run(self) -> None:
+        try:
+            request_id, message = self._import_and_submit()
+        except Exception as exc:  # noqa: BLE001
+            self.failed = True
+            request_id, message = None, f"Erro: {exc}"
+        self.signals.finished.emit(self.file_path, request_id, message)
+
+    def _import_and_submit(self):
+        # Só arquivos grandes vão para um processo separado: subir o pool custa mais que ler um arquivo pequeno.
+        service = OrderImportService(self.origin, isolated=prefers_isolation([self.file_path]))
+        result = service.run_many([self.file_path])
+        if result.known_files:
+            known = result.known_files[0]
+            return None, f"já recebido na solicitação #{known.request_id} ({known.status})"
+        if result.covering_request is not None:
+            return None, f"ordens já estão na solicitação pendente #{result.covering_request}"
+        if result.df is None or result.df.empty:
+            return None, "nenhuma ordem nova"
+        req = OrderService().submit_request(self.origin, result.df, result.files)
+        return req.id, f"solicitação #{req.id} criada com {req.total_orders} ordens"